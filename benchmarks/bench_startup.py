@@ -0,0 +1,108 @@
+"""
+Benchmark de arranque de la GUI: cada corrida es un proceso nuevo (caché de imports en frío) que mide
+el import de src.app, la construcción de App y el tiempo hasta que la ventana se dibuja por primera vez.
+Informa además qué módulos pesados quedaron cargados antes de mostrar la ventana.
+
+    python -m benchmarks.bench_startup --runs 7
+    python -m benchmarks.bench_startup --runs 5 --cold-assets --json arranque.json
+
+Sin display (servidor) solo se mide el import.
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["PIL", "polars", "fastexcel", "openpyxl", "playwright"]
+
+
+def probe() -> dict:
+    """ Corre dentro del proceso hijo: mide e imprime un JSON """
+    t0 = perf_counter()
+    import src.app
+    result = {"import_s": perf_counter() - t0}
+
+    try:
+        t1 = perf_counter()
+        app = src.app.App()
+        result["build_s"] = perf_counter() - t1
+
+        # primer frame: la ventana mapeada y con todo el layout dibujado
+        while not app.root.winfo_viewable():
+            app.root.update()
+        app.root.update_idletasks()
+        result["first_frame_s"] = perf_counter() - t0
+        app.root.destroy()
+    except Exception as e:  # TclError sin display
+        result["gui_error"] = str(e).splitlines()[0]
+
+    result["heavy_modules"] = [name for name in HEAVY_MODULES if name in sys.modules]
+    return result
+
+
+def run_probe(python: str) -> dict:
+    t0 = perf_counter()
+    out = subprocess.run(
+        [python, "-m", "benchmarks.bench_startup", "--probe"],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["process_s"] = perf_counter() - t0
+    return result
+
+
+def summarize(runs: list[dict]) -> dict:
+    summary = {}
+    for key in ("import_s", "build_s", "first_frame_s", "process_s"):
+        values = [r[key] for r in runs if key in r]
+        if values:
+            summary[key] = {"median": statistics.median(values), "min": min(values), "max": max(values)}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque de la GUI (import + primer frame)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cold-assets", action="store_true", help="borra el caché de íconos antes de cada corrida")
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--json", type=Path, help="guarda las corridas y el resumen")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe()))
+        return
+
+    from src.config import ASSET_CACHE_DIR
+
+    runs = []
+    for i in range(args.runs):
+        if args.cold_assets:
+            shutil.rmtree(ASSET_CACHE_DIR, ignore_errors=True)
+        runs.append(run_probe(args.python))
+        print(f"🏁 corrida {i + 1}/{args.runs}: import {runs[-1]['import_s'] * 1000:.0f} ms")
+
+    summary = summarize(runs)
+    print()
+    for key, s in summary.items():
+        print(f"  {key:<15} mediana {s['median'] * 1000:7.0f} ms   min {s['min'] * 1000:7.0f} ms   max {s['max'] * 1000:7.0f} ms")
+
+    heavy = sorted({name for r in runs for name in r["heavy_modules"]})
+    print(f"  módulos pesados antes de la ventana: {', '.join(heavy) if heavy else 'ninguno'}")
+    if "gui_error" in runs[0]:
+        print(f"  ⚠️ Sin ventana ({runs[0]['gui_error']}): solo se midió el import")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs, "summary": summary}, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark end-to-end sin red: MainController contra el servidor mock de ProactivaNet.
+Genera planillas desde la plantilla, corre cada combinación backend × workers y reporta
+jobs por minuto y la latencia por paso (p50/p95/max) del colector de métricas.
+
+    python -m benchmarks.bench_throughput --jobs 40 --backend playwright async http --workers 1 2
+    python -m benchmarks.bench_throughput --jobs 20 --widget-latency-ms 120 --json resultados.json
+    python -m benchmarks.bench_throughput --jobs 10 --widget-api none   # cada job abre los árboles: usa el cache de rutas
+"""
+import argparse
+import json
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+from openpyxl import load_workbook
+
+from src.config import DOWNLOAD_DIR
+from src.controllers.main_controller import MainController
+from src.services.mock_proactiva_server import MockProactivaServer
+from src.services.submission_backends import PlaywrightBackend, AsyncPlaywrightBackend, HttpBackend
+from src.utils.metrics import METRICS
+from src.utils.tree_path_cache import use_tree_path_cache
+
+
+TEMPLATE_PATH = DOWNLOAD_DIR / "Planilla de Actividades - Nombre Tecnico.xlsx"
+FIRST_DATA_ROW = 10
+
+PROBLEMAS = [
+    "Equipo no enciende en sala {n}",
+    "Impresora atascada en oficina {n}",
+    "Proyector sin señal en sala {n}",
+    "Actualización de software solicitada por usuario {n}",
+]
+
+
+def generate_spreadsheet(path: Path, jobs: int, seed: int = 0) -> Path:
+    """ Copia la plantilla y completa `jobs` filas (FECHA, HORA, PROBLEMA, SOLUCION, TECNICO) """
+    rng = random.Random(seed)
+    shutil.copy(TEMPLATE_PATH, path)
+
+    wb = load_workbook(path)
+    ws = wb.worksheets[0]
+    start = datetime.now().replace(second=0, microsecond=0) - timedelta(days=30)
+
+    for i in range(jobs):
+        row = FIRST_DATA_ROW + i
+        created = start + timedelta(minutes=rng.randint(0, 30 * 24 * 60))
+        ws.cell(row=row, column=2, value=created.replace(hour=0, minute=0))
+        ws.cell(row=row, column=3, value=created.time())
+        ws.cell(row=row, column=6, value=rng.choice(PROBLEMAS).format(n=i + 1))
+        ws.cell(row=row, column=7, value="Revisión y solución en terreno")
+        ws.cell(row=row, column=9, value="Técnico Mock")
+
+    wb.save(path)
+    return path
+
+
+def make_bench_backend(name: str, server: MockProactivaServer, state_path: Path, batch: int, pages: int):
+    if name == "playwright":
+        return PlaywrightBackend(headless=True, url=server.site_url, state_path=state_path)
+    if name == "async":
+        return AsyncPlaywrightBackend(headless=True, pages=pages, url=server.site_url, state_path=state_path)
+    if name == "http":
+        return HttpBackend(base_url=server.url, state_path=state_path, batch_size=batch)
+
+    raise ValueError(f"Backend no soportado: {name}")
+
+
+def run_case(name: str, workers: int, jobs: int, server: MockProactivaServer, work_dir: Path, args) -> dict:
+    excel_path = generate_spreadsheet(work_dir / f"bench_{name}_{workers}w.xlsx", jobs, seed=args.seed)
+    state_path = server.write_storage_state(work_dir / "storage_state.json")
+    backend = make_bench_backend(name, server, state_path, batch=args.batch, pages=args.pages)
+    # cache de rutas de árboles propio del caso: el primer job recorre, el resto baja por los ids guardados
+    tree_cache = use_tree_path_cache(work_dir / f"tree_paths_{name}_{workers}w.json")
+
+    messages = []
+    # estado, métricas y caché de planillas en la carpeta temporal: la corrida no deja nada en storages/
+    controller = MainController(
+        excel_path, on_status=messages.append, workers=workers, backend=backend,
+        states_dir=work_dir / "states", metrics_dir=work_dir / "metrics", cache_dir=work_dir / "cache",
+    )
+
+    t0 = perf_counter()
+    try:
+        controller.start()
+    finally:
+        # backend inyectado: MainController no lo cierra
+        backend.close()
+    elapsed = perf_counter() - t0
+
+    created = sum(1 for job in controller.jobs if job.status == "CREATED")
+    summary = METRICS.summary()
+
+    return {
+        "backend": name,
+        "workers": workers,
+        "jobs": jobs,
+        "created": created,
+        "seconds": elapsed,
+        "jobs_per_min": created / elapsed * 60 if elapsed else 0.0,
+        "tree_cache": {"hits": tree_cache.hits, "misses": tree_cache.misses},
+        "steps": summary,
+    }
+
+
+def print_report(results: list[dict], top: int):
+    print()
+    print(f"{'backend':<11}{'workers':>8}{'jobs':>7}{'ok':>6}{'seg':>9}{'jobs/min':>10}{'árbol cache':>13}")
+    for r in results:
+        tree = f"{r['tree_cache']['hits']}/{r['tree_cache']['hits'] + r['tree_cache']['misses']}"
+        print(f"{r['backend']:<11}{r['workers']:>8}{r['jobs']:>7}{r['created']:>6}{r['seconds']:>9.1f}{r['jobs_per_min']:>10.1f}{tree:>13}")
+
+    for r in results:
+        print(f"\n{r['backend']} · {r['workers']} workers — pasos más lentos (total)")
+        steps = sorted(r["steps"].items(), key=lambda item: item[1]["sum"], reverse=True)[:top]
+        for step, s in steps:
+            print(f"  {step:<32} p50 {s['p50']:7.3f}s  p95 {s['p95']:7.3f}s  max {s['max']:7.3f}s  n={s['count']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput de MainController contra el mock de ProactivaNet")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--backend", nargs="+", default=["playwright"], choices=["playwright", "async", "http"])
+    parser.add_argument("--workers", nargs="+", type=int, default=[1])
+    parser.add_argument("--batch", type=int, default=1, help="batch_size del backend http")
+    parser.add_argument("--pages", type=int, default=3, help="pestañas del backend async")
+    parser.add_argument("--latency-ms", type=int, default=0, help="latencia de la API JSON")
+    parser.add_argument("--page-latency-ms", type=int, default=50)
+    parser.add_argument("--widget-latency-ms", type=int, default=40)
+    parser.add_argument("--no-direct-date", action="store_true", help="fuerza los popups del calendario")
+    parser.add_argument("--widget-api", choices=["model", "ignore", "none"], default="model", help="\"ignore\"/\"none\" fuerzan los popups de los campos constantes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--json", type=Path, help="guarda los resultados completos")
+    args = parser.parse_args()
+
+    server = MockProactivaServer(
+        port=0,
+        latency_ms=args.latency_ms,
+        page_latency_ms=args.page_latency_ms,
+        widget_latency_ms=args.widget_latency_ms,
+        direct_date=not args.no_direct_date,
+        widget_api=args.widget_api,
+    )
+    server.start_background()
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench_tickets_") as tmp:
+            for name in args.backend:
+                for workers in args.workers:
+                    print(f"🏁 {name} · {workers} workers · {args.jobs} jobs")
+                    results.append(run_case(name, workers, args.jobs, server, Path(tmp), args))
+    finally:
+        server.stop()
+
+    print_report(results, args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import tkinter as tk
+from tkinter import messagebox
 from src import config
 import ctypes
 
@@ -16,6 +17,8 @@ class App:
         self.main_view = MainView(self.root)
         self.main_view.pack(fill="both", expand=True)
 
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
     
     def _load_task_icon(self):
         try:
@@ -30,6 +33,14 @@ class App:
             pass
 
 
+    def _on_close(self):
+        if self.main_view.is_running:
+            if not messagebox.askyesno("Carga en curso", "Hay una carga de tickets en curso.\n¿Cancelar al terminar el ticket actual y salir?"):
+                return
+            self.main_view.cancel_run()
+
+        self.root.destroy()
+
     def run(self):
         self.root.mainloop()
 
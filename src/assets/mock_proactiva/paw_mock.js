@@ -0,0 +1,244 @@
+// Widgets paw mínimos (fecha, selectores, dropdown, árbol, radio) con los mismos selectores que el sitio real.
+// Cada popup pide sus datos a /mock/api/* para que la latencia configurada del servidor se note como en producción.
+(() => {
+    const CFG = window.PAW_MOCK || {};
+    const MONTHS = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"];
+    const EXP_IMG = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7";
+
+    const pad = (n) => String(n).padStart(2, "0");
+    const esc = (s) => String(s).replace(/&/g, "&amp;").replace(/"/g, "&quot;").replace(/</g, "&lt;");
+    const api = (path) => fetch(path, {credentials: "same-origin"}).then((r) => r.json());
+
+    const el = (html) => {
+        const t = document.createElement("template");
+        t.innerHTML = html.trim();
+        return t.content.firstElementChild;
+    };
+
+    const closePopups = () => document.querySelectorAll(".pawMockPopup").forEach((p) => p.remove());
+
+    const showPopup = (popup, anchor) => {
+        closePopups();
+        const r = anchor.getBoundingClientRect();
+        popup.style.left = `${r.left + window.scrollX}px`;
+        popup.style.top = `${r.bottom + window.scrollY}px`;
+        document.body.appendChild(popup);
+        return popup;
+    };
+
+    // el modelo del widget es lo que getValue entrega; el input hidden es lo que envía el formulario
+    const setField = (root, value, label) => {
+        root.pawModel = {value, label};
+        root.querySelector("input[type=hidden]").value = value;
+        root.querySelector("#pawTheTgt").textContent = label;
+    };
+
+    // API propia del widget (CFG.widgetApi): "model" la aplica, "ignore" la expone pero no hace nada
+    // (como un setter adivinado que no es el real), "none" no la expone
+    const exposeApi = (root, getValue, setValue) => {
+        if (CFG.widgetApi === "none") return;
+        root.getValue = getValue;
+        root.setValue = CFG.widgetApi === "ignore" ? () => {} : setValue;
+    };
+
+    // =========================
+    // FECHA (pawDataFieldDate)
+    // =========================
+    const dateRoot = document.getElementById("creationDate");
+    const now = new Date();
+    const dt = {y: now.getFullYear(), m: now.getMonth() + 1, d: now.getDate(), h: now.getHours(), mi: now.getMinutes()};
+
+    const renderDate = () => {
+        const text = `${pad(dt.d)}/${pad(dt.m)}/${dt.y} ${pad(dt.h)}:${pad(dt.mi)}`;
+        setField(dateRoot, text, text);
+    };
+    renderDate();
+
+    if (CFG.directDate) {
+        exposeApi(dateRoot, () => dateRoot.pawModel.value, (text) => {
+            const m = /^(\d{2})\/(\d{2})\/(\d{4}) (\d{2}):(\d{2})$/.exec(String(text).trim());
+            if (!m) return;
+            Object.assign(dt, {d: +m[1], m: +m[2], y: +m[3], h: +m[4], mi: +m[5]});
+            renderDate();
+        });
+    }
+
+    const renderCalendar = (popup, y, m) => {
+        popup.querySelector("td#pawTheLabelTgt").textContent = `${MONTHS[m - 1]} de ${y}`;
+        const days = popup.querySelector("tbody.pawCalDays");
+        days.innerHTML = "";
+        const total = new Date(y, m, 0).getDate();
+        let row = null;
+        for (let d = 1; d <= total; d++) {
+            if ((d - 1) % 7 === 0) row = days.appendChild(document.createElement("tr"));
+            const td = el(`<table><tr><td id="pawDay_${y}${pad(m)}${pad(d)}">${d}</td></tr></table>`).querySelector("td");
+            td.addEventListener("click", () => {
+                Object.assign(dt, {y, m, d});
+                renderDate();
+                closePopups();
+            });
+            row.appendChild(td);
+        }
+    };
+
+    const openCalendar = async (anchor) => {
+        let y = dt.y, m = dt.m;
+        await api(`/mock/api/calendar?y=${y}&m=${m}`);
+        const popup = showPopup(el(`
+            <span class="pawCalPopup pawMockPopup"><table>
+                <thead><tr><td paw:cmd="prm">&lt;</td><td id="pawTheLabelTgt" colspan="5"></td><td paw:cmd="nxm">&gt;</td></tr></thead>
+                <tbody class="pawCalDays"></tbody>
+            </table></span>`), anchor);
+        renderCalendar(popup, y, m);
+
+        const move = async (delta) => {
+            m += delta;
+            if (m === 0) { m = 12; y -= 1; }
+            if (m === 13) { m = 1; y += 1; }
+            await api(`/mock/api/calendar?y=${y}&m=${m}`);
+            renderCalendar(popup, y, m);
+        };
+        popup.querySelector("td[paw\\:cmd='prm']").addEventListener("click", () => move(-1));
+        popup.querySelector("td[paw\\:cmd='nxm']").addEventListener("click", () => move(1));
+    };
+
+    const openNumbers = async (anchor, count, apply) => {
+        await api(`/mock/api/ping`);
+        const cells = Array.from({length: count}, (_, i) => `<tr><td class="pawOptTdr" paw:value="${i}">${i}</td></tr>`).join("");
+        const popup = showPopup(el(`<span class="pawDFSelPopup pawMockPopup"><table>${cells}</table></span>`), anchor);
+        popup.querySelectorAll("td.pawOptTdr").forEach((td) => td.addEventListener("click", () => {
+            apply(+td.getAttribute("paw:value"));
+            renderDate();
+            closePopups();
+        }));
+    };
+
+    dateRoot.querySelector("button[paw\\:handler='pawDataFieldDate_btnShowPopCal']").addEventListener("click", (e) => openCalendar(e.currentTarget));
+    dateRoot.querySelector("button[paw\\:handler='pawDataFieldDate_btnShowPopHours']").addEventListener("click", (e) => openNumbers(e.currentTarget, 24, (v) => { dt.h = v; }));
+    dateRoot.querySelector("button[paw\\:handler='pawDataFieldDate_btnShowPopMinutes']").addEventListener("click", (e) => openNumbers(e.currentTarget, 60, (v) => { dt.mi = v; }));
+
+    // =========================
+    // SELECTORES CON FILTRO (pawDataFieldSelector)
+    // =========================
+    const renderOptions = (list, root, options) => {
+        list.innerHTML = `<div class="pawOpt" id="pawIdNull">(ninguno)</div>` + options.map((o) =>
+            `<div class="pawOpt" paw:value="${esc(o.id)}" paw:label="${esc(o.label)}" completeview="${esc(o.completeview || o.label)}">${esc(o.label)}</div>`
+        ).join("");
+        list.querySelectorAll(".pawOpt:not(#pawIdNull)").forEach((opt) => opt.addEventListener("click", () => {
+            setField(root, opt.getAttribute("paw:value"), opt.getAttribute("paw:label"));
+            closePopups();
+        }));
+    };
+
+    const openSelector = async (root, field, anchor) => {
+        await api(`/mock/api/ping`);
+        const popup = showPopup(el(`
+            <span paw:ctrl="pawDataFieldSelector" id="${field}" class="pawDFSelPopup pawMockPopup">
+                <input class="pawDFSelFilterTableInp" type="text">
+                <div class="pawOptList"></div>
+            </span>`), anchor);
+        const inp = popup.querySelector("input.pawDFSelFilterTableInp");
+        const list = popup.querySelector(".pawOptList");
+
+        let seq = 0;
+        const search = async () => {
+            const mine = ++seq;
+            const options = await api(`/mock/api/options?field=${encodeURIComponent(field)}&q=${encodeURIComponent(inp.value)}`);
+            if (mine === seq) renderOptions(list, root, options);
+        };
+        inp.addEventListener("keydown", (e) => { if (e.key === "Enter") search(); });
+        inp.addEventListener("input", search);
+    };
+
+    const notificado = document.querySelector("table[paw\\:name='panUsers_idSource']");
+    notificado.addEventListener("click", () => openSelector(notificado, "panUsers_idSource", notificado));
+
+    for (const field of ["pawSvcAuthGroups_id", "pawSvcAuthUsers_idResponsible"]) {
+        const root = document.getElementById(field);
+        const btn = root.querySelector("button[paw\\:handler='pawDataFieldDropDownBrowser_btnShowPopSel']");
+        btn.addEventListener("click", () => openSelector(root, field, btn));
+    }
+
+    // =========================
+    // DROPDOWN TIPO
+    // =========================
+    const tipo = document.getElementById("padTypes_id");
+    tipo.querySelector("button#pawTheBtn").addEventListener("click", async (e) => {
+        const anchor = e.currentTarget;
+        const options = await api(`/mock/api/options?field=padTypes_id&q=`);
+        const popup = showPopup(el(`<span class="pawDFSelPopup pawMockPopup" id="viewAllIncidents_padTypes_id_Selector"></span>`), anchor);
+        popup.innerHTML = options.map((o) => `<div class="pawOpt" paw:value="${esc(o.id)}">${esc(o.label)}</div>`).join("");
+        popup.querySelectorAll(".pawOpt").forEach((opt) => opt.addEventListener("click", () => {
+            setField(tipo, opt.getAttribute("paw:value"), opt.textContent);
+            closePopups();
+        }));
+    });
+
+    // =========================
+    // ÁRBOLES (pawTree, carga perezosa)
+    // =========================
+    const nodeHtml = (field, node) => `
+        <div class="pawTreeNode" id="${field}_node_${esc(node.id)}" paw:value="${esc(node.id)}">
+            <div class="pawTreeNodeHeader">${node.leaf ? "" : `<img id="pawExp" src="${EXP_IMG}">`}<span class="pawTreeNodeLabel">${esc(node.label)}</span></div>
+            <div class="pawTreeChildren"></div>
+        </div>`;
+
+    const loadChildren = async (root, field, nodeEl) => {
+        const container = nodeEl.querySelector(":scope > .pawTreeChildren");
+        if (container.childElementCount) {
+            container.style.display = container.style.display === "none" ? "" : "none";
+            return;
+        }
+        const children = await api(`/mock/api/tree?field=${field}&node=${encodeURIComponent(nodeEl.getAttribute("paw:value"))}`);
+        for (const child of children) {
+            const childEl = container.appendChild(el(nodeHtml(field, child)));
+            bindNode(root, field, childEl, child);
+        }
+    };
+
+    const bindNode = (root, field, nodeEl, node) => {
+        const header = nodeEl.querySelector(":scope > .pawTreeNodeHeader");
+        const exp = header.querySelector("img#pawExp");
+        if (exp) exp.addEventListener("click", (e) => { e.stopPropagation(); loadChildren(root, field, nodeEl); });
+        header.addEventListener("click", () => {
+            if (!node.leaf) return loadChildren(root, field, nodeEl);
+            setField(root, node.id, node.label);
+            closePopups();
+        });
+    };
+
+    for (const field of ["padPortfolio_id", "padCategories_id"]) {
+        const root = document.getElementById(field);
+        const btn = root.querySelector("button[paw\\:handler='pawDataFieldDropDownBrowser_btnShowPopTree']");
+        btn.addEventListener("click", async () => {
+            const rootNode = {id: "root", label: root.getAttribute("paw:root"), leaf: false};
+            const popup = el(`<div paw:ctrl="pawTree" class="pawTreePopup pawMockPopup">${nodeHtml(field, rootNode)}</div>`);
+            const rootEl = popup.querySelector(".pawTreeNode");
+            bindNode(root, field, rootEl, rootNode);
+            await loadChildren(root, field, rootEl);
+            showPopup(popup, btn);
+        });
+    }
+
+    // =========================
+    // RADIO PRIMERA LÍNEA
+    // =========================
+    // img-cycler como en el sitio real: cada click alterna el estado (un segundo click lo apaga)
+    const radio = document.getElementById("dfrb_FirstLineActionScale");
+    radio.addEventListener("click", async () => {
+        const on = radio.classList.toggle("checked");
+        await api(`/mock/api/ping`);
+        document.querySelector("#pawSvcAuthGroups_id button[paw\\:handler='pawDataFieldDropDownBrowser_btnShowPopSel']").disabled = !on;
+    });
+
+    // =========================
+    // API DE LOS CAMPOS CON VALOR (re-aplicar los campos constantes)
+    // =========================
+    document.querySelectorAll("table.pawField:not(#creationDate)").forEach((root) => exposeApi(
+        root,
+        () => root.pawModel ? {...root.pawModel} : null,
+        (model) => { if (model && model.value) setField(root, model.value, model.label); }
+    ));
+
+    document.addEventListener("keydown", (e) => { if (e.key === "Escape") closePopups(); });
+})();
@@ -0,0 +1,115 @@
+"""
+Entrada por línea de comandos, sin tkinter ni PIL: sirve para programar cargas en un servidor.
+
+    python -m src.cli run planilla.xlsx --workers 2 --headless
+    python -m src.cli run planillas/ otra.xlsx --backend async
+    python -m src.cli daemon start|stop|status
+
+Código de salida: 0 todo creado · 1 hubo filas con error · 2 no se pudo ejecutar · 130 cancelado (Ctrl+C).
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from src.config import WEB_WORKERS, BROWSER_DAEMON_PORT
+
+
+# "http" queda fuera: solo sirve contra el servidor mock (ver HttpBackend)
+BACKENDS = ["playwright", "async"]
+
+EXIT_OK = 0
+EXIT_FAILED_ROWS = 1
+EXIT_ERROR = 2
+EXIT_CANCELLED = 130
+
+
+def cmd_run(args) -> int:
+    # run_worker no importa Playwright ni polars hasta que el hilo arranca
+    from src.services.run_worker import RunWorker
+
+    sources = [Path(p) for p in args.files]
+    missing = [str(p) for p in sources if not p.exists()]
+    if missing:
+        print(f"❌ No existe: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_ERROR
+
+    # una planilla suelta va por MainController; varias o carpetas, en lote con un solo login
+    target = sources[0] if len(sources) == 1 and sources[0].is_file() else sources
+    worker = RunWorker(target, workers=args.workers, headless=args.headless, backend=args.backend)
+    worker.start()
+
+    result = None
+    while result is None:
+        try:
+            result = _pump(worker, args.quiet)
+        except KeyboardInterrupt:
+            # primer Ctrl+C: termina el ticket en curso y guarda; el segundo corta en seco
+            if worker.control.cancelled:
+                raise
+            print("⏹️ Cancelando al terminar el ticket en curso (Ctrl+C otra vez para forzar)", file=sys.stderr)
+            worker.control.cancel()
+
+    kind, payload = result
+    if kind == "error":
+        print(f"❌ {payload}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if worker.control.cancelled:
+        return EXIT_CANCELLED
+    return EXIT_FAILED_ROWS if worker.failed_rows else EXIT_OK
+
+
+def _pump(worker, quiet: bool):
+    """ Imprime los mensajes del worker hasta que termine; retorna ("done"|"error", payload) """
+    while True:
+        for kind, payload in worker.drain(timeout=0.2):
+            if kind == "status":
+                if not quiet:
+                    print(payload, flush=True)
+            else:
+                return kind, payload
+
+
+def cmd_daemon(args) -> int:
+    from src.services import browser_daemon
+
+    if args.action == "start":
+        print(f"🟢 Navegador residente: {browser_daemon.start_daemon_process(args.port)}")
+    elif args.action == "stop":
+        print("🛑 Navegador residente cerrado" if browser_daemon.stop_daemon() else "No hay navegador residente")
+    else:
+        endpoint = browser_daemon.daemon_endpoint()
+        print(f"🟢 {endpoint}" if endpoint else "⚪ No hay navegador residente")
+        # para scripts: 0 si está vivo, 1 si no
+        return EXIT_OK if endpoint else 1
+
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Carga automática de tickets en ProactivaNet")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="carga los tickets de una o más planillas")
+    run.add_argument("files", nargs="+", help="planillas .xlsx o carpetas que las contengan")
+    run.add_argument("--workers", type=int, default=WEB_WORKERS, help=f"navegadores en paralelo (default {WEB_WORKERS})")
+    run.add_argument("--headless", action=argparse.BooleanOptionalAction, default=None, help="navegador sin ventana (default: config.WEB_HEADLESS)")
+    run.add_argument("--backend", choices=BACKENDS, default=None, help="cómo se crean los tickets (default: config.SUBMISSION_BACKEND)")
+    run.add_argument("-q", "--quiet", action="store_true", help="solo errores y código de salida")
+    run.set_defaults(func=cmd_run)
+
+    daemon = sub.add_parser("daemon", help="navegador residente con la sesión iniciada")
+    daemon.add_argument("action", choices=["start", "stop", "status"])
+    daemon.add_argument("--port", type=int, default=BROWSER_DAEMON_PORT)
+    daemon.set_defaults(func=cmd_daemon)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
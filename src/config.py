@@ -5,6 +5,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 STORAGE_DIR = BASE_DIR / "storages"
 
 STATES_DIR = STORAGE_DIR / "states"
+STATES_DB_PATH = STATES_DIR / "states.db"
 WEB_STORAGE_DIR = STORAGE_DIR / "web"
 
 SRC_DIR = BASE_DIR / "src"
@@ -18,9 +19,34 @@ DOWNLOAD_DIR = ASSETS_DIR / "download"
 APP_SIZE = "637x369"
 APP_TITLE = "Carga automatica de Ticket"
 
+# Íconos redimensionados una sola vez (así el arranque no necesita PIL)
+ASSET_CACHE_DIR = STORAGE_DIR / "cache" / "assets"
+
 DEFAULT_REPORT_USER = "chiguera"
 DEFAULT_JOB_GROUP = "Soporte Terreno República"
 
+# WEB CONFIG
+# Cantidad de navegadores que procesan tickets en paralelo (1 = secuencial)
+WEB_WORKERS = 1
+
+# Perfil rápido: headless con viewport chico si ya existe una sesión guardada.
+# Si la sesión pide login/MFA se vuelve al navegador visible.
+WEB_HEADLESS = False
+WEB_FAST_VIEWPORT = {"width": 1280, "height": 800}
+WEB_FAST_LOGIN_TIMEOUT_MS = 30_000
+# Vida supuesta de las cookies de sesión (sin fecha) desde que se guardó proactiva_storage_state.json
+WEB_SESSION_MAX_AGE_H = 12
+
+# Campos iguales para todos los tickets (notificado por, tipo, categoría, servicio, grupo, técnico):
+# se eligen con popups en el primer ticket y en los siguientes se re-aplican de una vez
+WEB_PREFILL_CONSTANTS = True
+
+# Navegador residente (python -m src.services.browser_daemon start): si está corriendo,
+# las ejecuciones se conectan por CDP en vez de lanzar un navegador nuevo
+WEB_USE_DAEMON = True
+BROWSER_DAEMON_PORT = 9333
+BROWSER_DAEMON_PROFILE_DIR = WEB_STORAGE_DIR / "daemon_profile"
+
 REQUIRED_COLUMNS = [
     "FECHA",
     "HORA",
@@ -39,8 +65,43 @@ CORE_COLUMNS = [
 
 TICKET_COLUMNS = {"TKT", "TICKET"}
 
+# Tabla de jobs ya normalizada, cacheada en Parquet por contenido del archivo (sha256 + versión del parser).
+# Se desalojan las entradas sin uso hace más de N días o las más viejas si el caché pasa de N MB
+SHEET_CACHE_ENABLED = True
+SHEET_CACHE_DIR = STORAGE_DIR / "cache" / "sheets"
+SHEET_CACHE_MAX_MB = 64
+SHEET_CACHE_MAX_AGE_DAYS = 30
+
+# Vuelca la tabla de jobs por consola y a debug_output.csv en cada carga (solo para depurar el parser)
+EXCEL_DEBUG_DUMP = False
+
+# Cada cuantos jobs se guarda el Excel (FECHA, HORA, TICKET); siempre se guarda al final
+EXCEL_FLUSH_EVERY = 10
+
+# Cada cuantas transiciones el journal de estado se compacta en el snapshot .state.json
+STATE_COMPACT_EVERY = 50
+
+# Métricas por paso (p50/p95/max) exportadas al final de cada ejecución: JSON, CSV y OpenMetrics (.prom)
+METRICS_ENABLED = True
+METRICS_DIR = STORAGE_DIR / "metrics"
+
+# Backend del estado de jobs: "json" (un archivo por planilla) o "sqlite" (una base para todas)
+STATE_BACKEND = "json"
+
 URL_PROACTIVA = "https://unab.proactivanet.com/proactivanet/servicedesk/default.paw"
 
+# Servidor mock local (desarrollo / benchmarks offline)
+MOCK_SERVER_PORT = 8765
+
+# Backend de envío de tickets: "playwright" (formulario web), "async" (varias pestañas en un event loop)
+# o "http" (POST directo con la sesión guardada, SOLO contra el mock: el formato REST real de ProactivaNet no se conoce)
+SUBMISSION_BACKEND = "playwright"
+ASYNC_PAGES = 3
+HTTP_BACKEND_URL = f"http://127.0.0.1:{MOCK_SERVER_PORT}"
+HTTP_INCIDENTS_PATH = "/proactivanet/api/Incidents"
+HTTP_POOL_SIZE = 4
+HTTP_BATCH_SIZE = 1
+
 MONTHS_ES = {
     1: "enero", 2: "febrero", 3: "marzo", 4: "abril", 5: "mayo", 6: "junio",
     7: "julio", 8: "agosto", 9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre",
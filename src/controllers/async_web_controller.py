@@ -0,0 +1,477 @@
+from playwright.async_api import async_playwright, expect, TimeoutError as PWTimeoutError
+from pathlib import Path
+from urllib.parse import urlsplit
+from datetime import date, time
+
+from src.config import URL_PROACTIVA, WEB_STORAGE_DIR, WEB_HEADLESS, WEB_FAST_LOGIN_TIMEOUT_MS, WEB_USE_DAEMON, WEB_PREFILL_CONSTANTS
+from src.helpers.web_helpers import get_default_browser, get_sesion
+from src.helpers.async_web_helpers import (
+    find_in_all_frames,
+    wait_visible_enabled,
+    wait_in_all_frames,
+    smart_click,
+    wait_visible_popup,
+    get_label_txt,
+    select_popup_option_by_text,
+    select_popup_option_by_attr_contains,
+    get_tree_popup,
+    tree_select_path,
+    click_radio_btn,
+    set_datefield_text,
+    capture_fields,
+    replay_fields
+)
+from src.helpers import paw_form as form
+from src.helpers.paw_form import PopupStep, TreeStep, parse_month_year_es
+
+from src.helpers.datetime_helpers import format_web_creation_dt
+
+from src.models.ticket_job import TicketJob
+from src.services.browser_daemon import daemon_endpoint
+from src.helpers.session_helpers import check_session
+
+from src.utils.context_manager import waiting
+from src.utils.tree_path_cache import get_tree_path_cache
+
+from src.config import DEFAULT_REPORT_USER, DEFAULT_JOB_GROUP
+
+
+class AsyncWebController:
+    """
+    Variante de WebController sobre async_playwright, con los mismos pasos del formulario.
+    Cada controlador maneja una pestaña; new_page() crea otra pestaña en el mismo contexto (misma sesión),
+    así un solo event loop completa varios formularios a la vez. Selectores y pasos en paw_form.
+    """
+
+    def __init__(self, headless: bool | None = None, url: str | None = None, state_path: Path | None = None):
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+
+        self.state_path = state_path or WEB_STORAGE_DIR / "proactiva_storage_state.json"
+        # URL_PROACTIVA salvo contra el sitio mock (benchmarks)
+        self.url = url or URL_PROACTIVA
+        self.headless = WEB_HEADLESS if headless is None else headless
+
+        # las pestañas creadas con new_page() no cierran el navegador
+        self._owner = True
+        self.attached = False
+        self._direct_date_ok: bool | None = None
+        # snapshot de CONSTANT_FIELDS, compartido con las pestañas de new_page()
+        self._prefill = {"fields": None}
+
+    async def start(self):
+        print("🌐 Iniciando AsyncWebController...")
+
+        self.playwright = await async_playwright().start()
+
+        # el navegador residente está en el sitio real
+        if WEB_USE_DAEMON and self.url == URL_PROACTIVA and await self._attach_daemon():
+            print("✅ AsyncWebController listo (navegador residente)")
+            return
+
+        # precheck offline: con la sesión vencida se va directo al login, sin probar el perfil headless
+        # STALE (solo la edad del archivo) se prueba igual: _start_fast vuelve al navegador visible si pide login
+        session = check_session(self.state_path, url=self.url)
+        if not session.usable:
+            print(f"🔐 {session.reason}, se abrirá el navegador para iniciar sesión")
+        elif not session.valid:
+            print(f"⚠️ {session.reason}")
+
+        if self.headless and session.usable:
+            if await self._start_fast():
+                print("✅ AsyncWebController listo (headless)")
+                return
+
+        await self._launch(headless=False)
+        await self._wait_for_login_and_save_state()
+
+        print("✅ AsyncWebController listo")
+
+    async def _start_fast(self) -> bool:
+        """ Arranca headless con la sesión guardada. Si pide login/MFA, vuelve al modo visible """
+        await self._launch(headless=True)
+        try:
+            await self._wait_for_new_incident(timeout_ms=WEB_FAST_LOGIN_TIMEOUT_MS)
+        except PWTimeoutError:
+            print("🔐 La sesión guardada requiere login, abriendo navegador visible...")
+            await self._close_browser()
+            return False
+
+        await self._save_context()
+        return True
+
+    async def _attach_daemon(self) -> bool:
+        """ Ver WebController._attach_daemon """
+        endpoint = daemon_endpoint()
+        if not endpoint:
+            return False
+
+        try:
+            self.browser = await self.playwright.chromium.connect_over_cdp(endpoint)
+            self.context = self.browser.contexts[0]
+            self.page = await self.context.new_page()
+            self.attached = True
+
+            await self.page.goto(self.url, wait_until="domcontentloaded", timeout=60_000)
+            await self._wait_for_new_incident(timeout_ms=WEB_FAST_LOGIN_TIMEOUT_MS)
+        except Exception as e:
+            print(f"⚠️ No se pudo usar el navegador residente: {e}")
+            await self._close_browser()
+            return False
+
+        print(f"🔌 Conectado al navegador residente: {endpoint}")
+        return True
+
+    async def _launch(self, headless: bool):
+        self.browser = await self._select_browser(headless)
+        self.context = await self.browser.new_context(**get_sesion(self.state_path, headless=headless))
+
+        self.page = await self.context.new_page()
+        await self.page.goto(self.url, wait_until="domcontentloaded", timeout=60_000)
+
+    async def new_page(self) -> "AsyncWebController":
+        """ Otra pestaña sobre la misma sesión, lista en la pantalla de inicio """
+        ctrl = AsyncWebController(headless=self.headless, url=self.url, state_path=self.state_path)
+        ctrl.playwright = self.playwright
+        ctrl.browser = self.browser
+        ctrl.context = self.context
+        ctrl._owner = False
+        ctrl._direct_date_ok = self._direct_date_ok
+        ctrl._prefill = self._prefill
+
+        ctrl.page = await self.context.new_page()
+        await ctrl.page.goto(self.url, wait_until="domcontentloaded", timeout=60_000)
+        return ctrl
+
+    async def close(self):
+        if not self._owner:
+            if self.page:
+                await self.page.close()
+            self.page = None
+            return
+
+        print("🧹 Cerrando navegador...")
+        try:
+            await self._close_browser()
+        finally:
+            if self.playwright:
+                await self.playwright.stop()
+            self.playwright = None
+
+    async def _close_browser(self):
+        if self.attached:
+            # el navegador y su contexto son del daemon: solo se cierra la pestaña propia
+            try:
+                if self.page:
+                    await self.page.close()
+            except Exception:
+                pass
+            self.attached = False
+            self.context = None
+            self.browser = None
+            self.page = None
+            return
+
+        try:
+            if self.context:
+                await self.context.close()
+        finally:
+            if self.browser:
+                await self.browser.close()
+            self.context = None
+            self.browser = None
+            self.page = None
+
+    async def _select_browser(self, headless: bool = False):
+        """ Selecciona el navegador a utilizar """
+        browser_channel = get_default_browser()
+
+        print(f"🧭 Navegador: {browser_channel} ({'headless' if headless else 'visible'})")
+
+        return await self.playwright.chromium.launch(
+            channel=browser_channel,
+            headless=headless,
+            args=form.launch_args(headless)
+        )
+
+    async def _save_context(self):
+        try:
+            await self.context.storage_state(path=str(self.state_path))
+            print(f"💾 Sesión guardada en: {self.state_path.name}")
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar storage_state: {e}")
+
+    # =========================
+    # AUTENTICACIÓN
+    # =========================
+    async def _wait_for_login_and_save_state(self):
+        print("🔐 Esperando login del usuario (manual si aplica)...")
+        try:
+            locator, _ = await self._wait_for_new_incident(timeout_ms=180_000)
+        except PWTimeoutError:
+            raise RuntimeError(
+                "No se detectó autenticación en ProactivaNet.\n"
+                "Inicia sesión manualmente (incluido MFA) y asegúrate de llegar a la pantalla donde exista 'Nueva incidencia'."
+            )
+
+        print("✅ Login detectado correctamente")
+
+        await self._save_context()
+
+        return locator
+
+    async def _wait_for_new_incident(self, timeout_ms: int = 180_000):
+        """ Espera hasta que exista #newIncident en main frame o iframes. Retorna (locator, frame) """
+        locator, frame = await wait_in_all_frames(self.page, form.NEW_INCIDENT, timeout_ms=timeout_ms)
+        await wait_visible_enabled(self.page, locator, timeout_ms=10_000)
+        return locator, frame
+
+    # =========================
+    # ACCIONES
+    # =========================
+
+    # abre nueva incidencia
+    async def open_new_incident(self):
+        locator, frame = await self._wait_for_new_incident(timeout_ms=60_000)
+        if not locator:
+            raise RuntimeError("No se encontró #newIncident.")
+
+        await smart_click(locator, frame=frame, expect_nav=True)
+
+    # selecciona fecha, hora y minutos
+    async def ensure_creation_datetime(self, job: TicketJob):
+        excel_date = job.fecha
+        excel_time = job.hora
+
+        if not excel_date:
+            current_text = await get_label_txt(self.page, selector=form.CREATION_DATE_LABEL, timeout_ms=10_000)
+            print(f"Sin fecha en excel, fecha asignada {current_text}")
+            return current_text
+
+        if excel_time and self._direct_date_ok is not False:
+            final_text = await self._set_creation_datetime_direct(excel_date, excel_time)
+            if final_text:
+                return final_text
+
+        # mes y dia
+        popup = await self._open_creation_date_popup()
+        await self._calendar_goto_month_year(popup, excel_date.year, excel_date.month)
+        await self._calendar_select_day(popup, excel_date)
+
+        # horas y minutos
+        await self._calendar_goto_hours_minute(excel_time)
+
+        final_text = await get_label_txt(self.page, selector=form.CREATION_DATE_LABEL, timeout_ms=10_000)
+        return final_text
+
+    async def _set_creation_datetime_direct(self, d: date, t: time) -> str | None:
+        """ Escribe la fecha/hora directo en #creationDate y la verifica una vez. None si hay que usar los popups """
+        expected = format_web_creation_dt(d, t)
+
+        applied = await set_datefield_text(self.page, form.CREATION_DATE, expected)
+        final_text = await get_label_txt(self.page, selector=form.CREATION_DATE_LABEL, timeout_ms=10_000) if applied else None
+
+        if final_text == expected:
+            self._direct_date_ok = True
+            return final_text
+
+        if self._direct_date_ok is None:
+            self._direct_date_ok = False
+            print("↩️ Fecha directa no soportada, se usan los popups del calendario")
+
+        return None
+
+    # POPUPS
+    async def _open_popup(self, step: PopupStep):
+        locator, frame = await find_in_all_frames(self.page, step.button)
+        if not locator:
+            raise RuntimeError(step.not_found)
+
+        await smart_click(locator, frame=frame, expect_nav=False)
+        return await wait_visible_popup(self.page, step.popup, must_contain_selector=step.must_contain, timeout_ms=10_000, frame=frame)
+
+    async def _open_creation_date_popup(self):
+        return await self._open_popup(form.DATE_POPUP)
+
+    async def _open_creation_hours_popup(self):
+        return await self._open_popup(form.HOURS_POPUP)
+
+    async def _open_creation_minutes_popup(self):
+        return await self._open_popup(form.MINUTES_POPUP)
+
+    # orquesta la seleccion del mes y del dia
+    async def _calendar_goto_month_year(self, popup, target_year: int, target_month: int):
+        prev_btn = popup.locator(form.CAL_PREV_MONTH)
+        next_btn = popup.locator(form.CAL_NEXT_MONTH)
+
+        label = popup.locator(form.CAL_MONTH_LABEL)
+
+        with waiting():
+            await prev_btn.wait_for(state="visible", timeout=10_000)
+            await next_btn.wait_for(state="visible", timeout=10_000)
+            await label.wait_for(state="visible", timeout=10_000)
+
+        target = (target_year, target_month)
+
+        for _ in range(form.CAL_MAX_MONTH_STEPS):
+            current_text = (await label.inner_text()).strip()
+            current = parse_month_year_es(current_text)
+
+            if current == target:
+                return
+
+            if current < target:
+                await next_btn.click()
+            else:
+                await prev_btn.click()
+
+            with waiting():
+                await expect(label).not_to_have_text(current_text, timeout=10_000)
+
+        raise RuntimeError(f"No pude llegar al mes objetivo {target_month}/{target_year}")
+
+    # selecciona el dia
+    async def _calendar_select_day(self, popup, d: date):
+        day_id = form.calendar_day_id(d)
+        day = popup.locator(f"td#{day_id}")
+
+        if await day.count() == 0:
+            raise RuntimeError(f"No se encontró el día en el popup: {day_id} (¿mes correcto?)")
+
+        await day.wait_for(state="visible", timeout=10_000)
+        await day.click()
+
+    # orquesta las horas y minutos
+    async def _calendar_goto_hours_minute(self, excel_time):
+        if not excel_time:
+            raise RuntimeError("Excel time no se encuentra")
+
+        popup = await self._open_creation_hours_popup()
+        await select_popup_option_by_text(popup, form.TIME_OPTION, str(excel_time.hour), timeout_ms=10_000)
+
+        popup = await self._open_creation_minutes_popup()
+        try:
+            await select_popup_option_by_text(popup, form.TIME_OPTION, str(excel_time.minute), timeout_ms=10_000)
+        except Exception:
+            await select_popup_option_by_text(popup, form.TIME_OPTION, f"{excel_time.minute:02d}", timeout_ms=10_000)
+
+    # campos constantes del lote
+    async def fill_constant_fields(self):
+        """ Ver WebController.fill_constant_fields """
+        radio_on = False
+        if self._prefill["fields"]:
+            if await self._replay_constant_fields():
+                return
+            radio_on = True
+
+        await self.goto_notificado_por()
+        await self.select_tipo_solicitud_servicio()
+        await self.select_categoria()
+        await self.select_servicio()
+        await self.goto_grupo_responsable(radio_on=radio_on)
+
+        if WEB_PREFILL_CONSTANTS and self._prefill["fields"] is None:
+            self._prefill["fields"] = await capture_fields(self.page, list(form.CONSTANT_FIELDS)) or False
+            if self._prefill["fields"] is False:
+                print("↩️ Los campos constantes no exponen un setter propio, se siguen usando los popups")
+
+    async def _replay_constant_fields(self) -> bool:
+        await click_radio_btn(self.page, form.FIRST_LINE_RADIO, timeout=10_000)
+
+        if await replay_fields(self.page, self._prefill["fields"]):
+            return True
+
+        print("↩️ No se pudieron re-aplicar los campos constantes, se usan los popups")
+        self._prefill["fields"] = False
+        return False
+
+    # selecciona la persona que notifico el problema
+    async def goto_notificado_por(self):
+        popup = await self._open_popup(form.NOTIFICADO_POPUP)
+        await self._filter_and_select(popup, DEFAULT_REPORT_USER, attr="completeview", needle=f"\\{DEFAULT_REPORT_USER}", timeout_ms=10_000)
+
+    # ingresa el titulo y descripcion de incidencia
+    async def select_titulo_descripcion(self, job: TicketJob):
+        problema = job.problema
+        if not problema:
+            raise RuntimeError("Problema Vacio en el JOB")
+
+        locator, _ = await find_in_all_frames(self.page, form.INCIDENT_TITLE)
+        if not locator:
+            raise RuntimeError("No se encontro frame titulo de incidencia")
+        await locator.wait_for(state="visible", timeout=10_000)
+        await locator.fill("")
+        await locator.type(problema[:256], delay=0)
+
+        locator, _ = await find_in_all_frames(self.page, form.DESCRIPTION)
+        if not locator:
+            raise RuntimeError("No se encontró #description (Descripción)")
+
+        await locator.wait_for(state="visible", timeout=10_000)
+        await locator.click(timeout=5_000)
+        await locator.fill(problema)
+
+    # selecciona el tipo de solicitud
+    async def select_tipo_solicitud_servicio(self):
+        popup = await self._open_popup(form.TIPO_POPUP)
+        await select_popup_option_by_text(popup, option_selector=form.TIPO_OPTION, target_text=form.TIPO_SOLICITUD, timeout_ms=10_000)
+
+    # selecciona la categoria de la solicitud
+    async def select_categoria(self):
+        await self._select_tree(form.CATEGORIA_TREE)
+
+    # selecciona el servicio a realizar
+    async def select_servicio(self):
+        await self._select_tree(form.SERVICIO_TREE)
+
+    async def _select_tree(self, step: TreeStep):
+        btn, btn_frame = await find_in_all_frames(self.page, step.button)
+        if not btn:
+            raise RuntimeError(step.not_found)
+
+        await smart_click(btn, frame=btn_frame, expect_nav=False)
+
+        popup = await get_tree_popup(btn_frame, root_label=step.root_label, timeout=20_000)
+
+        labels = list(step.path)
+        cache = get_tree_path_cache()
+        if await tree_select_path(self.page, popup, labels, cache=cache, cache_key=cache.key(f"{urlsplit(self.url).hostname}/{step.tree}", labels)):
+            print(f"⚡ {labels[-1]} desde cache")
+
+    # selecciona grupo responsable y usuario
+    async def goto_grupo_responsable(self, radio_on: bool = False):
+        if not radio_on:
+            await click_radio_btn(self.page, form.FIRST_LINE_RADIO, timeout=10_000)
+
+        btn, _ = await wait_in_all_frames(self.page, form.GRUPO_POPUP.button, timeout_ms=10_000)
+        await wait_visible_enabled(self.page, btn, timeout_ms=10_000)
+
+        tecnico = await get_label_txt(self.page, selector=form.TECNICO_LABEL, timeout_ms=10_000)
+
+        popup = await self._open_popup(form.GRUPO_POPUP)
+        await self._filter_and_select(popup, DEFAULT_JOB_GROUP, attr="paw:label", needle=DEFAULT_JOB_GROUP)
+
+        popup = await self._open_popup(form.TECNICO_POPUP)
+        await self._filter_and_select(popup, tecnico, attr="paw:label", needle=tecnico)
+
+    async def _filter_and_select(self, popup, text: str, attr: str, needle: str, timeout_ms: int = 20_000):
+        """ Escribe en el filtro del selector y elige la opción cuyo `attr` contiene `needle` """
+        inp = popup.locator(form.FILTER_INPUT)
+        await inp.wait_for(state="visible", timeout=10_000)
+        await inp.fill("")
+        await inp.type(text, delay=0)
+
+        try:
+            await inp.press("Enter")
+        except Exception:
+            pass
+
+        await select_popup_option_by_attr_contains(popup=popup, attr=attr, needle=needle, timeout_ms=timeout_ms, case_insensitive=True)
+
+    async def crear_ticket(self):
+        print("✅ Ticket creado correctamente")
+
+    async def _go_home(self):
+        await self.page.goto(self.url, wait_until="domcontentloaded", timeout=60_000)
@@ -0,0 +1,154 @@
+from pathlib import Path
+
+from src.controllers.main_controller import MainController, export_metrics
+from src.services.submission_backends import SubmissionBackend, make_backend
+from src.services.web_worker_pool import WebWorkerPool
+from src.services.run_worker import RunControl
+from src.models.ticket_job import TicketJob
+from src.utils.metrics import METRICS
+from src.config import WEB_WORKERS
+
+
+EXCEL_SUFFIXES = {".xlsx", ".xls"}
+
+
+def collect_workbooks(sources) -> list[Path]:
+    """ Expande carpetas a sus planillas (sin los temporales ~$ de Excel) y respeta el orden dado """
+    paths = []
+    for source in sources:
+        source = Path(source)
+        if source.is_dir():
+            paths += sorted(
+                p for p in source.iterdir()
+                if p.suffix.lower() in EXCEL_SUFFIXES and not p.name.startswith("~$")
+            )
+        else:
+            paths.append(source)
+
+    # el estado se guarda por nombre de archivo: dos planillas con el mismo nombre se pisarían
+    seen = {}
+    for path in paths:
+        if path.stem in seen and seen[path.stem] != path.resolve():
+            raise ValueError(f"Hay dos planillas con el mismo nombre: {path.name}")
+        seen[path.stem] = path.resolve()
+
+    return list(dict.fromkeys(paths))
+
+
+class BatchController:
+    """
+    Varias planillas en una sola ejecución: cada una con su ExcelController y su estado (MainController),
+    pero todos los jobs pendientes pasan por el mismo backend, con un solo login/MFA.
+    """
+    def __init__(self, excel_paths, on_status=None, workers: int | None = None, headless: bool | None = None, backend: str | SubmissionBackend | None = None, control: RunControl | None = None):
+        METRICS.reset()
+
+        self.excel_paths = collect_workbooks(excel_paths)
+        if not self.excel_paths:
+            raise ValueError("No se encontraron planillas para procesar")
+
+        # como en MainController: un backend inyectado lo cierra quien lo creó
+        self._owns_backend = not isinstance(backend, SubmissionBackend)
+        self.backend = make_backend(backend, headless=headless) if self._owns_backend else backend
+        self.on_status = on_status
+        self.workers = workers or WEB_WORKERS
+        self.control = control
+
+        # una planilla mal armada no frena al resto del lote
+        self.controllers: list[MainController] = []
+        for path in self.excel_paths:
+            self._emit(f"📄 Cargando {path.name}")
+            try:
+                self.controllers.append(MainController(
+                    path,
+                    on_status=self._prefixed(path),
+                    backend=self.backend,
+                    control=control,
+                    reset_metrics=False,
+                ))
+            except Exception as e:
+                self._emit(f"⚠️ Se omite {path.name}: {e}")
+
+        if not self.controllers:
+            raise ValueError("Ninguna planilla del lote se pudo cargar")
+
+    @property
+    def jobs(self) -> list[TicketJob]:
+        return [job for ctrl in self.controllers for job in ctrl.jobs]
+
+    def start(self):
+        self._emit(f"🧭 Iniciando carga de {len(self.controllers)} planillas")
+
+        # un solo backend para todo el lote: se abre una vez y se cierra al terminar (las planillas no lo cierran)
+        try:
+            self.backend.start()
+
+            # (controller, unidad): cada resultado vuelve a la planilla y al estado de su fila
+            units = [(ctrl, unit) for ctrl in self.controllers for unit in ctrl.pending_units()]
+            workers = max(1, min(self.workers, len(units)))
+            if workers > 1:
+                self._emit(f"🧵 Procesando con {workers} workers en paralelo")
+
+            pool = WebWorkerPool(workers, handle_job=self._handle_unit, on_status=self.on_status, checkpoint=self._checkpoint)
+            pool.run(units, lead=self.backend)
+        finally:
+            try:
+                self._close_controllers()
+            finally:
+                if self._owns_backend:
+                    self.backend.close()
+
+        self._emit_summary()
+
+    def _close_controllers(self):
+        """ Cierra todas las planillas aunque alguna falle al guardar; los errores se juntan en uno solo """
+        errors = []
+        for ctrl in self.controllers:
+            try:
+                ctrl.close()
+            except Exception as e:
+                self._emit(f"⚠️ No se pudo cerrar {ctrl.excel_path.name}: {e}")
+                errors.append(f"{ctrl.excel_path.name}: {e}")
+
+        export_metrics(f"lote_{len(self.controllers)}_planillas", self._emit)
+
+        if errors:
+            raise RuntimeError("No se pudieron guardar algunas planillas del lote:\n" + "\n".join(errors))
+
+    def _handle_unit(self, item: tuple[MainController, list[TicketJob]], backend: SubmissionBackend):
+        ctrl, unit = item
+        ctrl._handle_unit(unit, backend)
+
+    def _checkpoint(self) -> bool:
+        if not self.control:
+            return True
+        if self.control.paused:
+            self._emit("⏸️ En pausa")
+            if self.control.checkpoint():
+                self._emit("▶️ Reanudando")
+        return self.control.checkpoint()
+
+    def _emit_summary(self):
+        for ctrl in self.controllers:
+            created = sum(1 for job in ctrl.jobs if job.status == "CREATED")
+            failed = sum(1 for job in ctrl.jobs if job.status == "FAILED")
+            self._emit(f"📄 {ctrl.excel_path.name}: {created} creados · {failed} con error · {ctrl.pending_count()} pendientes")
+
+        if self.control and self.control.cancelled:
+            left = sum(ctrl.pending_count() for ctrl in self.controllers)
+            self._emit(f"⏹️ Ejecución cancelada: {left} filas quedan pendientes para la próxima")
+            return
+
+        self._emit("🏁 Lote finalizado")
+
+    # =========================
+    # EMISIÓN DE ESTADO
+    # =========================
+    def _prefixed(self, path: Path):
+        return lambda message: self._emit(f"[{path.stem}] {message}")
+
+    def _emit(self, message: str):
+        if self.on_status:
+            self.on_status(message)
+        else:
+            print(message)
@@ -1,8 +1,9 @@
+import threading
 import polars as pl
 from pathlib import Path
 
 from src.helpers import excel_helpers
-from src.config import REQUIRED_COLUMNS, TICKET_COLUMNS
+from src.config import REQUIRED_COLUMNS, TICKET_COLUMNS, EXCEL_FLUSH_EVERY, SHEET_CACHE_ENABLED, EXCEL_DEBUG_DUMP, STATES_DIR
 
 
 from pathlib import Path
@@ -10,14 +11,24 @@ import polars as pl
 
 from src.helpers.datetime_helpers import normalize_fecha_hora_polars, split_web_creation_dt
 
-from openpyxl import load_workbook
 from src.models.ticket_job import TicketJob
+from src.services.excel_write_back import ExcelWriteBack, CellEdit
+from src.utils.context_manager import timed
+from src.utils.sheet_cache import SheetCache
 
 
+# Subir cuando cambie cómo se arma la tabla de jobs (_parse_excel, normalización de fecha/hora):
+# invalida las tablas ya cacheadas de todas las planillas
+PARSER_VERSION = 1
+
 class ExcelController:
-    def __init__(self, excel_path: Path):
+    def __init__(self, excel_path: Path, cache_dir: Path | None = None, states_dir: Path | None = None):
         self.excel_path = excel_path
         self.df = None
+        # carpeta del SheetCache; None = SHEET_CACHE_DIR
+        self.cache_dir = cache_dir
+        # ediciones aún no guardadas en el Excel, junto al estado de la planilla (ver ExcelWriteBack)
+        self.journal_path = (states_dir or STATES_DIR) / f"{excel_path.stem}.cells.journal"
 
         self.format = None
         self.ticket_column = None
@@ -25,11 +36,20 @@ class ExcelController:
         self._headers = None
         self._header_row_df = None
 
+        # ediciones de celdas encoladas, se guardan en bloque
+        self._write_back: ExcelWriteBack | None = None
+        self._writer_lock = threading.Lock()
+
         self._run()
 
     def _run(self):
         self._validate_file()
-        self._load_excel()
+        with timed("excel.load"):
+            self._load_excel()
+
+        # ediciones de una ejecución anterior que no se alcanzaron a guardar: se re-aplican y se guardan al cerrar
+        if self.journal_path.exists():
+            self._writer()
         # self._validate_structure()
         # self._filter_pending()
 
@@ -38,13 +58,64 @@ class ExcelController:
             raise FileNotFoundError("El archivo Excel no existe")
         
     def _load_excel(self):
-        df_raw = excel_helpers.read_excel_with_excel_row(self.excel_path)
+        cache = SheetCache(self.cache_dir) if SHEET_CACHE_ENABLED else None
+        key = None
+        cached = None
+
+        if cache:
+            with timed("excel.cache_get"):
+                key = cache.key(self.excel_path, PARSER_VERSION)
+                cached = cache.get(key)
+
+        if cached:
+            df_data, meta = cached
+            self._apply_meta(meta)
+        else:
+            with timed("excel.parse"):
+                df_data = self._parse_excel()
+            if cache:
+                try:
+                    cache.put(key, df_data, self._meta())
+                except OSError as e:
+                    print(f"⚠️ No se pudo cachear la planilla: {e}")
+
+        if df_data.is_empty():
+            raise ValueError("La planilla no contiene ticket pendientes para cargar")
+
+        self.df = df_data
 
-        if df_raw.is_empty():
+        if EXCEL_DEBUG_DUMP:
+            print("df_data")
+            print(df_data)
+            self.df.write_csv("debug_output.csv")
+
+    def _meta(self) -> dict:
+        return {
+            "format": self.format,
+            "ticket_column": self.ticket_column,
+            "headers": self._headers,
+            "header_row": self._header_row_df,
+        }
+
+    def _apply_meta(self, meta: dict):
+        self.format = meta["format"]
+        self.ticket_column = meta["ticket_column"]
+        self._headers = meta["headers"]
+        self._header_row_df = meta["header_row"]
+
+    def _parse_excel(self) -> pl.DataFrame:
+        """
+        Un solo plan lazy: encabezados detectados sobre las primeras filas y después
+        proyección a las columnas core + filtro de pendientes antes de parsear FECHA/HORA.
+        """
+        lf_raw = excel_helpers.scan_excel_with_excel_row(self.excel_path)
+        head = lf_raw.head(excel_helpers.HEADER_SCAN_ROWS).collect()
+
+        if head.is_empty():
             raise ValueError("El archivo Excel no contiene datos")
         
-        header_row = excel_helpers.detect_header_row(df_raw)
-        raw_headers = list(df_raw.row(header_row))[1:]
+        header_row = excel_helpers.detect_header_row(head)
+        raw_headers = list(head.row(header_row))[1:]
         headers = excel_helpers.clean_headers([str(h) for h in raw_headers])
 
         self._headers = headers
@@ -52,27 +123,18 @@ class ExcelController:
 
         self.format = excel_helpers.detect_format(headers)
         self.ticket_column = excel_helpers.validate_required_columns(headers, REQUIRED_COLUMNS, TICKET_COLUMNS)
-        
-        df_data = df_raw.slice(header_row + 1)
-        if self.format == "NEW":
-            df_data = df_data.slice(1)
-
-        df_data = df_data.select(["EXCEL_ROW"] + df_data.columns[1:1 + len(headers)])
-        df_data.columns = ["EXCEL_ROW"] + headers
-        df_data = df_data.filter(pl.any_horizontal(pl.all().is_not_null()))
-        df_data = normalize_fecha_hora_polars(df_data)
-        df_data = excel_helpers.reduce_to_core_columns(df = df_data, ticket_col= self.ticket_column)
-        df_data = excel_helpers.filter_pending_tickets(df=df_data, ticket_col="TICKET")
-
-        if df_data.is_empty():
-            raise ValueError("La planilla no contiene ticket pendientes para cargar")
 
-        self.df = df_data
-
-        print("df_data")
-        print(df_data)
+        first_data = header_row + 1
+        if self.format == "NEW":
+            first_data += 1
 
-        self.df.write_csv("debug_output.csv")
+        data_cols = head.columns[1:1 + len(headers)]
+        lf = lf_raw.slice(first_data).select(
+            [pl.col("EXCEL_ROW")] + [pl.col(c).alias(h) for c, h in zip(data_cols, headers)]
+        )
+        lf = excel_helpers.reduce_to_core_columns(df=lf, ticket_col=self.ticket_column)
+        lf = excel_helpers.filter_pending_tickets(df=lf, ticket_col="TICKET")
+        return normalize_fecha_hora_polars(lf).collect()
 
     def _excel_col_index(self, header_name: str) -> int:
         # OJO: headers corresponden a columnas reales del Excel empezando desde col_2
@@ -87,21 +149,9 @@ class ExcelController:
 
         web_date, _ = split_web_creation_dt(job.creation_dt_text)
 
-        wb = load_workbook(self.excel_path)
-        ws = wb.worksheets[0]
-
         r = int(job.row_id)
         c = self._excel_col_index("FECHA")
-        cell = ws.cell(row=r, column=c)
-
-        if cell.value in (None, "", "NONE"):
-            print(f"📅 Agregando FECHA en Excel fila {r}")
-            cell.value = web_date
-
-            if cell.number_format in (None, "", "General"):
-                cell.number_format = "dd-mm-yyyy"  # o "dd/mm/yyyy"
-
-        wb.save(self.excel_path)
+        self._writer().put(CellEdit(r, c, web_date, number_format="dd-mm-yyyy", message=f"📅 Agregando FECHA en Excel fila {r}"))
 
 
     def add_time(self, job):
@@ -110,27 +160,44 @@ class ExcelController:
 
         _, web_time = split_web_creation_dt(job.creation_dt_text)
 
-        wb = load_workbook(self.excel_path)
-        ws = wb.worksheets[0]
-
         r = int(job.row_id)
         c = self._excel_col_index("HORA")
-        cell = ws.cell(row=r, column=c)
-
-        if cell.value in (None, "", "NONE"):
-            print(f"🕒 Agregando HORA en Excel fila {r}")
-            cell.value = web_time
-
-            # Mantiene fill/border/font/alignment (destino).
-            # Ajusta SOLO el formato numérico si está en General:
-            if cell.number_format in (None, "", "General"):
-                cell.number_format = "hh:mm"  # o "hh:mm:ss"
-
-        wb.save(self.excel_path)
+        self._writer().put(CellEdit(r, c, web_time, number_format="hh:mm", message=f"🕒 Agregando HORA en Excel fila {r}"))
 
 
     def add_ticket(self, job: TicketJob):
-        print(f"✍️ Registrando ticket en Excel fila {job.row_id}")
+        if not job.ticket_id:
+            # el backend no entregó el número real: solo se registra, la columna TICKET queda como está
+            print(f"✍️ Registrando ticket en Excel fila {job.row_id}")
+            return
+
+        r = int(job.row_id)
+        c = self._excel_col_index(self.ticket_column)
+        self._writer().put(CellEdit(r, c, job.ticket_id, message=f"✍️ Registrando ticket en Excel fila {r}"))
+
+    # =========================
+    # WRITE-BACK
+    # =========================
+    def job_done(self):
+        if self._write_back:
+            self._write_back.job_done()
+
+    def flush(self):
+        if self._write_back:
+            with timed("excel.flush"):
+                self._write_back.flush()
+
+    def close(self):
+        if self._write_back:
+            writer, self._write_back = self._write_back, None
+            with timed("excel.close"):
+                writer.close()
+
+    def _writer(self) -> ExcelWriteBack:
+        with self._writer_lock:
+            if self._write_back is None:
+                self._write_back = ExcelWriteBack(self.excel_path, flush_every=EXCEL_FLUSH_EVERY, journal_path=self.journal_path)
+            return self._write_back
 
 
     def return_excel(self):
@@ -1,97 +1,195 @@
+from datetime import datetime
 from pathlib import Path
+from time import perf_counter
+
+import polars as pl
 
 from src.controllers.excel_controller import ExcelController
-from src.controllers.web_controller import WebController
 from src.services.job_state_manager import JobStateManager
+from src.services.submission_backends import SubmissionBackend, make_backend
+from src.services.web_worker_pool import WebWorkerPool
+from src.services.run_worker import RunControl
 from src.models.ticket_job import TicketJob
+from src.utils.context_manager import get_wait_time, reset_wait_time, job_scope, timed
+from src.utils.metrics import METRICS
+from src.config import WEB_WORKERS, METRICS_ENABLED, METRICS_DIR
 
 
 class MainController:
-    def __init__(self, excel_path: Path, on_status=None):
-        self.excel_ctrl = ExcelController(excel_path)
-        self.web_ctrl = WebController()
-
-        self.state = JobStateManager(excel_path)
+    def __init__(self, excel_path: Path, on_status=None, workers: int | None = None, headless: bool | None = None, backend: str | SubmissionBackend | None = None, control: RunControl | None = None, reset_metrics: bool = True,
+                 states_dir: Path | None = None, metrics_dir: Path | None = None, cache_dir: Path | None = None):
+        # métricas de esta ejecución (carga del Excel incluida); en lote las resetea BatchController
+        if reset_metrics:
+            METRICS.reset()
+        self.excel_path = excel_path
+
+        self.excel_ctrl = ExcelController(excel_path, cache_dir=cache_dir, states_dir=states_dir)
+        # un backend ya construido (BatchController, benchmarks) lo cierra quien lo creó; el de make_backend se cierra en close()
+        self._owns_backend = not isinstance(backend, SubmissionBackend)
+        self.backend = make_backend(backend, headless=headless) if self._owns_backend else backend
+
+        # carpetas de estado, métricas y caché de planillas: las de config salvo que se indiquen (benchmarks)
+        self.state = JobStateManager(excel_path, states_dir=states_dir)
+        self.metrics_dir = metrics_dir
 
         self.jobs: list[TicketJob] = []
         self.on_status = on_status
+        self.workers = workers or WEB_WORKERS
+        # pausa/cancelación desde la UI; se respeta entre jobs
+        self.control = control
 
         self._load_jobs()
 
     def start(self):
         self._emit("🧭 Iniciando proceso de carga de tickets")
-        
-        self.web_ctrl.start()
-
-        for job in self.jobs:
-            if job.status != "PENDING":
-                continue
-
-            self._emit(f"➡️ Procesando fila {job.row_id}")
-            self.state.mark_in_progress(job)
 
-            result = self._process_job(job)
+        try:
+            self.backend.start()
 
-            if result["success"]:
-                self.excel_ctrl.add_ticket(job)
-                self.state.mark_created(job, result["ticket_id"])
-                self._emit(f"✅ Ticket creado: {result['ticket_id']}")
+            units = self.pending_units()
+            workers = max(1, min(self.workers, len(units)))
 
+            if workers == 1:
+                for unit in units:
+                    if not self._checkpoint():
+                        break
+                    self._handle_unit(unit, self.backend)
             else:
-                self.state.mark_failed(job, result["error"])
-                self._emit(f"❌ Error en fila {job.row_id}: {result['error']}")
-
-        self._emit("🏁 Proceso finalizado")
+                self._emit(f"🧵 Procesando con {workers} workers en paralelo")
+                pool = WebWorkerPool(workers, handle_job=self._handle_unit, on_status=self.on_status, checkpoint=self._checkpoint)
+                pool.run(units, lead=self.backend)
+        finally:
+            self.close()
+            export_metrics(self.excel_path.stem, self._emit, metrics_dir=self.metrics_dir)
 
+        if self.control and self.control.cancelled:
+            self._emit(f"⏹️ Ejecución cancelada: {self.pending_count()} filas quedan pendientes para la próxima")
+            return
 
-    def _process_job(self, job: TicketJob):
-        try:
-            self.web_ctrl.open_new_incident()
-            creation_dt_text = self.web_ctrl.ensure_creation_datetime(job)
+        self._emit("🏁 Proceso finalizado")
 
-            if not job.data.get("FECHA") or not job.data.get("HORA"):
-                job.creation_dt_text = creation_dt_text
-            
-            job.creation_dt_text = creation_dt_text
+    def pending_units(self) -> list[list[TicketJob]]:
+        pending = [job for job in self.jobs if job.status == "PENDING"]
+        return self._batches(pending)
 
-            self.excel_ctrl.add_datetime(job)
-            self.excel_ctrl.add_time(job)
+    def pending_count(self) -> int:
+        return sum(1 for job in self.jobs if job.status == "PENDING")
 
-            self.web_ctrl.goto_notificado_por()
-            self.web_ctrl.select_titulo_descripcion(job)
-            self.web_ctrl.select_tipo_solicitud_servicio()
-            self.web_ctrl.select_categoria()
-            self.web_ctrl.select_servicio()
-            self.web_ctrl.goto_grupo_responsable()
-            self.web_ctrl.crear_ticket()
+    def close(self):
+        # un solo guardado final con lo que quede en los journals; el estado se cierra aunque el Excel falle
+        try:
+            try:
+                self.excel_ctrl.close()
+            finally:
+                self.state.close()
+        finally:
+            if self._owns_backend:
+                self.backend.close()
+
+    def _checkpoint(self) -> bool:
+        """ Entre jobs: espera si está en pausa y corta si se canceló """
+        if not self.control:
+            return True
+        if self.control.paused:
+            self._emit("⏸️ En pausa")
+            if self.control.checkpoint():
+                self._emit("▶️ Reanudando")
+        return self.control.checkpoint()
+
+    def _batches(self, jobs: list[TicketJob]) -> list[list[TicketJob]]:
+        """ Agrupa los jobs según el batch_size del backend (1 = un job por envío) """
+        size = self.backend.batch_size
+        return [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+    def _handle_unit(self, jobs: list[TicketJob], backend: SubmissionBackend):
+        for job in jobs:
+            self._emit(f"➡️ Procesando fila {job.row_id}")
+            self.state.mark_in_progress(job)
 
-            
+        reset_wait_time()
+        t0 = perf_counter()
 
+        if len(jobs) == 1:
+            with job_scope(jobs[0].row_id):
+                results = [self._process_job(jobs[0], backend)]
+        else:
+            results = backend.submit_batch(jobs)
 
-            # TODO: completar formulario con PROBLEMA, SOLUCION, TECNICO, etc.
-            # ticket_id_real = self.web_ctrl.submit_incident(...)
+        total = perf_counter() - t0
+        wait = get_wait_time()
+        if len(jobs) == 1:
+            self._emit(f"⏱️ Fila {jobs[0].row_id}: {total:.1f}s (esperando DOM {wait:.1f}s / acciones {total - wait:.1f}s)")
+        else:
+            # con pestañas en paralelo las esperas se solapan: la suma puede superar el tiempo del lote
+            self._emit(f"⏱️ Lote de {len(jobs)} filas: {total:.1f}s (esperando DOM {wait:.1f}s sumando los {len(jobs)} formularios)")
+
+        unit_job = jobs[0].row_id if len(jobs) == 1 else None
+        METRICS.record("job.total" if len(jobs) == 1 else "batch.total", total, job=unit_job)
+        METRICS.record("job.dom_wait" if len(jobs) == 1 else "batch.dom_wait", wait, job=unit_job)
+
+        for job, result in zip(jobs, results):
+            with job_scope(job.row_id), timed("job.record_result"):
+                self._record_result(job, result)
+
+    def _process_job(self, job: TicketJob, backend: SubmissionBackend | None = None):
+        backend = backend or self.backend
+        return backend.submit(job)
+
+    def _record_result(self, job: TicketJob, result: dict):
+        # fecha/hora con la que quedó creado el ticket (aunque el resto haya fallado)
+        self.excel_ctrl.add_datetime(job)
+        self.excel_ctrl.add_time(job)
+
+        if result["success"]:
+            # la edición del TICKET queda en el journal de celdas antes de marcar CREATED:
+            # si el Excel no se puede guardar, se re-aplica en la próxima ejecución
+            job.ticket_id = result["ticket_id"]
+            self.excel_ctrl.add_ticket(job)
+            self.state.mark_created(job, result["ticket_id"])
+            self._emit(f"✅ Ticket creado: {result['ticket_id'] or f'fila {job.row_id}'}")
 
-            self.web_ctrl._go_home()
+        else:
+            self.state.mark_failed(job, result["error"])
+            self._emit(f"❌ Error en fila {job.row_id}: {result['error']}")
 
-            return {
-                "success": True,
-                "ticket_id": "REQ-2026-XXXX"
-            }
-        except Exception as e:
-            self.web_ctrl._go_home()
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        self.excel_ctrl.job_done()
 
     def _load_jobs(self):
-        rows = self.excel_ctrl.df.to_dicts()
-
-        for row in rows:
-            excel_row = int(row["EXCEL_ROW"])
-            job = TicketJob(data=row, row_id=excel_row)
-            self.state.hydrate_job(job)
-            self.jobs.append(job)
+        with timed("state.hydrate"):
+            self._hydrate_jobs()
+
+    def _hydrate_jobs(self):
+        """
+        Un solo join entre la tabla normalizada y el estado guardado; las filas ya CREATED
+        se descartan antes de crear objetos. El resto (PENDING, FAILED, IN_PROGRESS) conserva su estado.
+        """
+        df = self.excel_ctrl.df
+        state = self.state.state_frame().rename({"row_id": "EXCEL_ROW"})
+
+        rows = (
+            df.lazy()
+              .join(state.lazy(), on="EXCEL_ROW", how="left")
+              .filter(pl.col("status").is_null() | (pl.col("status") != "CREATED"))
+              .collect()
+        )
+
+        skipped = df.height - rows.height
+        if skipped:
+            self._emit(f"⏭️ {skipped} filas ya tienen ticket creado, se omiten")
+
+        # por columnas y posición: sin un dict por fila
+        columns = rows.select("EXCEL_ROW", "FECHA", "HORA", "PROBLEMA", "SOLUCION", "status", "ticket_id", "error")
+        for row_id, fecha, hora, problema, solucion, status, ticket_id, error in columns.iter_rows():
+            self.jobs.append(TicketJob(
+                row_id=int(row_id),
+                fecha=fecha,
+                hora=hora,
+                problema=problema or "",
+                solucion=solucion,
+                status=status or "PENDING",
+                ticket_id=ticket_id,
+                error=error,
+            ))
 
     # =========================
     # EMISIÓN DE ESTADO
@@ -101,3 +199,21 @@ class MainController:
             self.on_status(message)
         else:
             print(message)
+
+
+def export_metrics(run_stem: str, emit, metrics_dir: Path | None = None):
+    """ Exporta METRICS de la ejecución (JSON/CSV/OpenMetrics) y muestra los pasos más lentos """
+    if not METRICS_ENABLED or not METRICS.spans:
+        return
+
+    run_name = f"{run_stem}_{datetime.now():%Y%m%d_%H%M%S}"
+    try:
+        paths = METRICS.export(metrics_dir or METRICS_DIR, run_name)
+    except OSError as e:
+        emit(f"⚠️ No se pudieron exportar las métricas: {e}")
+        return
+
+    emit("📊 Pasos más lentos:")
+    for line in METRICS.format_top():
+        emit(f"   {line}")
+    emit(f"📊 Métricas en {paths['json'].parent}")
@@ -1,90 +1,184 @@
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeoutError
+from playwright.sync_api import sync_playwright, expect, TimeoutError as PWTimeoutError
+from pathlib import Path
+from urllib.parse import urlsplit
 from datetime import datetime, date, time
 
-from src.config import URL_PROACTIVA, WEB_STORAGE_DIR
+from src.config import URL_PROACTIVA, WEB_STORAGE_DIR, WEB_HEADLESS, WEB_FAST_LOGIN_TIMEOUT_MS, WEB_USE_DAEMON, WEB_PREFILL_CONSTANTS
 from src.helpers.web_helpers import (
     get_default_browser,
     get_sesion,
     find_in_all_frames,
     wait_visible_enabled,
+    wait_in_all_frames,
     smart_click,
     wait_visible_popup,
-    get_label_popup_txt,
     get_label_txt,
     select_popup_option_by_text,
-    parse_month_year_es,
     select_popup_option_by_attr_contains,
     get_tree_popup,
-    tree_wait_label_visible,
-    tree_expand,
-    tree_click_leaf,
-    click_radio_btn
+    tree_select_path,
+    click_radio_btn,
+    set_datefield_text,
+    capture_fields,
+    replay_fields
 )
+from src.helpers import paw_form as form
+from src.helpers.paw_form import PopupStep, TreeStep, parse_month_year_es
 
-from src.helpers.datetime_helpers import parse_excel_date_text
+from src.helpers.datetime_helpers import format_web_creation_dt
 
 
 from src.models.ticket_job import TicketJob
+from src.services.browser_daemon import daemon_endpoint
+from src.helpers.session_helpers import check_session
 
-from src.utils.context_manager import timed
+from src.utils.context_manager import waiting
+from src.utils.tree_path_cache import get_tree_path_cache
 
 from src.config import DEFAULT_REPORT_USER, DEFAULT_JOB_GROUP
 
 
 class WebController:
-    def __init__(self):
+    """ Pasos del formulario de incidencias sobre sync_playwright; selectores y pasos en paw_form """
+
+    def __init__(self, headless: bool | None = None, url: str | None = None, state_path: Path | None = None):
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
 
-        self.state_path = WEB_STORAGE_DIR / "proactiva_storage_state.json"
+        self.state_path = state_path or WEB_STORAGE_DIR / "proactiva_storage_state.json"
+        # URL_PROACTIVA salvo contra el sitio mock (benchmarks)
+        self.url = url or URL_PROACTIVA
+        self.headless = WEB_HEADLESS if headless is None else headless
+        # conectado al navegador residente: al cerrar solo se suelta la pestaña
+        self.attached = False
+
+        # None = no probado; True/False = si la fecha directa funcionó en esta sesión
+        self._direct_date_ok: bool | None = None
+        # snapshot de CONSTANT_FIELDS: None = aún no capturado; False = re-aplicar no funcionó en esta sesión
+        self._constant_fields: dict | bool | None = None
 
     def start(self):
         print("🌐 Iniciando WebController...")
 
         self.playwright = sync_playwright().start()
-        self.browser = self._select_browser()
-        self.context = self._get_context()
 
-        self.page = self.context.new_page()
-       
-        self.page.goto(URL_PROACTIVA, wait_until="domcontentloaded", timeout=60_000)
+        # el navegador residente está en el sitio real
+        if WEB_USE_DAEMON and self.url == URL_PROACTIVA and self._attach_daemon():
+            print("✅ WebController listo (navegador residente)")
+            return
+
+        # perfil rápido: solo tiene sentido si ya hay una sesión guardada
+        # precheck offline: con la sesión vencida se va directo al login, sin probar el perfil headless
+        # STALE (solo la edad del archivo) se prueba igual: _start_fast vuelve al navegador visible si pide login
+        session = check_session(self.state_path, url=self.url)
+        if not session.usable:
+            print(f"🔐 {session.reason}, se abrirá el navegador para iniciar sesión")
+        elif not session.valid:
+            print(f"⚠️ {session.reason}")
+
+        if self.headless and session.usable:
+            if self._start_fast():
+                print("✅ WebController listo (headless)")
+                return
 
+        self._launch(headless=False)
         self._wait_for_login_and_save_state()
 
         print("✅ WebController listo")
 
+    def _start_fast(self) -> bool:
+        """ Arranca headless con la sesión guardada. Si pide login/MFA, vuelve al modo visible """
+        self._launch(headless=True)
+        try:
+            self._wait_for_new_incident(timeout_ms=WEB_FAST_LOGIN_TIMEOUT_MS)
+        except PWTimeoutError:
+            print("🔐 La sesión guardada requiere login, abriendo navegador visible...")
+            self._close_browser()
+            return False
+
+        self._save_context()
+        return True
+
+    def _attach_daemon(self) -> bool:
+        """ Se conecta por CDP al navegador residente y abre una pestaña propia en su sesión """
+        endpoint = daemon_endpoint()
+        if not endpoint:
+            return False
+
+        try:
+            self.browser = self.playwright.chromium.connect_over_cdp(endpoint)
+            self.context = self.browser.contexts[0]
+            self.page = self.context.new_page()
+            self.attached = True
+
+            self.page.goto(self.url, wait_until="domcontentloaded", timeout=60_000)
+            self._wait_for_new_incident(timeout_ms=WEB_FAST_LOGIN_TIMEOUT_MS)
+        except Exception as e:
+            print(f"⚠️ No se pudo usar el navegador residente: {e}")
+            self._close_browser()
+            return False
+
+        print(f"🔌 Conectado al navegador residente: {endpoint}")
+        return True
+
+    def _launch(self, headless: bool):
+        self.browser = self._select_browser(headless)
+        self.context = self._get_context(headless)
+
+        self.page = self.context.new_page()
+       
+        self.page.goto(self.url, wait_until="domcontentloaded", timeout=60_000)
+
     # TODO: Modificar para que tambien cerre la conexion con playwright ya que me da problema con ASYNC
     def close(self):
         print("🧹 Cerrando navegador...")
+        try:
+            self._close_browser()
+        finally:
+            if self.playwright:
+                self.playwright.stop()
+
+    def _close_browser(self):
+        if self.attached:
+            # el navegador y su contexto son del daemon: solo se cierra la pestaña propia
+            try:
+                if self.page:
+                    self.page.close()
+            except Exception:
+                pass
+            self.attached = False
+            self.context = None
+            self.browser = None
+            self.page = None
+            return
+
         try:
             if self.context:
                 self.context.close()
         finally:
             if self.browser:
                 self.browser.close()
-            if self.playwright:
-                self.playwright.stop()
+            self.context = None
+            self.browser = None
+            self.page = None
 
-    def _select_browser(self):
+    def _select_browser(self, headless: bool = False):
         """ Selecciona el navegador a utilizar """
         browser_channel = get_default_browser()
 
-        print(f"🧭 Navegador: {browser_channel}")
+        print(f"🧭 Navegador: {browser_channel} ({'headless' if headless else 'visible'})")
 
         return self.playwright.chromium.launch(
             channel=browser_channel,
-            headless=False,
-            args=[
-                "--start-maximized",
-                "--disable-blink-features=AutomationControlled",
-            ]
+            headless=headless,
+            args=form.launch_args(headless)
         )
     
-    def _get_context(self):
+    def _get_context(self, headless: bool = False):
         """ Decide si existe una sesion ya iniciada o se tiene que iniciar una """
-        context_kwargs = get_sesion(self.state_path)
+        context_kwargs = get_sesion(self.state_path, headless=headless)
         return self.browser.new_context(**context_kwargs)
 
     def _save_context(self):
@@ -104,7 +198,7 @@ class WebController:
         print("🔐 Esperando login del usuario (manual si aplica)...")
         locator = None
         try:
-            locator = self._wait_for_new_incident(timeout_ms=180_000)
+            locator, _ = self._wait_for_new_incident(timeout_ms=180_000)
         except PWTimeoutError:
             raise RuntimeError(
                 "No se detectó autenticación en ProactivaNet.\n"
@@ -118,20 +212,10 @@ class WebController:
         return locator
 
     def _wait_for_new_incident(self, timeout_ms: int = 180_000):
-        """ Espera hasta que exista #newIncident en main frame o iframes. """
-        step = 500
-        waited = 0
-
-        while waited < timeout_ms:
-            locator, frame = find_in_all_frames(self.page, "#newIncident")
-            if locator:
-                wait_visible_enabled(self.page, locator, timeout_ms=min(10_000, timeout_ms - waited))
-                return locator
-
-            self.page.wait_for_timeout(step)
-            waited += step
-
-        raise PWTimeoutError("Timeout esperando #newIncident")
+        """ Espera hasta que exista #newIncident en main frame o iframes. Retorna (locator, frame) """
+        locator, frame = wait_in_all_frames(self.page, form.NEW_INCIDENT, timeout_ms=timeout_ms)
+        wait_visible_enabled(self.page, locator, timeout_ms=10_000)
+        return locator, frame
 
     # =========================
     # ACCIONES
@@ -141,9 +225,7 @@ class WebController:
     def open_new_incident(self):
         print("🆕 Abriendo nueva incidencia...")
 
-        locator = self._wait_for_new_incident(timeout_ms=60_000)
-
-        locator, frame = find_in_all_frames(self.page, "#newIncident")
+        locator, frame = self._wait_for_new_incident(timeout_ms=60_000)
         if not locator:
             raise RuntimeError("No se encontró #newIncident.")
 
@@ -153,18 +235,19 @@ class WebController:
 
     # selecciona fecha, hora y minutos
     def ensure_creation_datetime(self, job: TicketJob):
-        excel_date = job.data.get("FECHA")
-        excel_time = job.data.get("HORA")
+        excel_date = job.fecha
+        excel_time = job.hora
 
         if not excel_date:
-            current_text = get_label_txt(self.page, selector="#creationDate #pawTheTgt", timeout_ms=10_000)
+            current_text = get_label_txt(self.page, selector=form.CREATION_DATE_LABEL, timeout_ms=10_000)
             print(f"Sin fecha en excel, fecha asignada {current_text}")
             return current_text
-        
-        if isinstance(excel_date, str):
-            excel_date = parse_excel_date_text(excel_date)
 
-            print("Excel_date de isinstance", excel_date)
+        # vía rápida: escribir la fecha sin abrir calendario/horas/minutos
+        if excel_time and self._direct_date_ok is not False:
+            final_text = self._set_creation_datetime_direct(excel_date, excel_time)
+            if final_text:
+                return final_text
         
         # mes y dia
         popup = self._open_creation_date_popup()
@@ -174,55 +257,65 @@ class WebController:
         # horas y minutos
         self._calendar_goto_hours_minute(excel_time)
 
-        final_text = get_label_txt(self.page, selector="#creationDate #pawTheTgt", timeout_ms=10_000)
+        final_text = get_label_txt(self.page, selector=form.CREATION_DATE_LABEL, timeout_ms=10_000)
         return final_text 
 
+    def _set_creation_datetime_direct(self, d: date, t: time) -> str | None:
+        """ Escribe la fecha/hora directo en #creationDate y la verifica una vez. None si hay que usar los popups """
+        expected = format_web_creation_dt(d, t)
+
+        applied = set_datefield_text(self.page, form.CREATION_DATE, expected)
+        final_text = get_label_txt(self.page, selector=form.CREATION_DATE_LABEL, timeout_ms=10_000) if applied else None
+
+        if final_text == expected:
+            self._direct_date_ok = True
+            return final_text
+
+        # si nunca funcionó en esta sesión no se vuelve a intentar
+        if self._direct_date_ok is None:
+            self._direct_date_ok = False
+            print("↩️ Fecha directa no soportada, se usan los popups del calendario")
+
+        return None
+
     # POPUPS
-    def _open_creation_date_popup(self):
-        print("🆕 Abriendo Fecha...")
-        locator, frame = find_in_all_frames(self.page, "#creationDate button[paw\\:handler='pawDataFieldDate_btnShowPopCal']")
+    def _open_popup(self, step: PopupStep):
+        locator, frame = find_in_all_frames(self.page, step.button)
         if not locator:
-            raise RuntimeError("No se encontro #creationDate #pawTheTgt (ni en main frame ni en iframes).")
-        
+            raise RuntimeError(step.not_found)
+
         smart_click(locator, frame=frame, expect_nav=False)
-        popup = wait_visible_popup(self.page, "span.pawCalPopup", must_contain_selector="td#pawTheLabelTgt", timeout_ms=10_000)
-        return popup
-    
+        return wait_visible_popup(self.page, step.popup, must_contain_selector=step.must_contain, timeout_ms=10_000, frame=frame)
+
+    def _open_creation_date_popup(self):
+        print("🆕 Abriendo Fecha...")
+        return self._open_popup(form.DATE_POPUP)
+
     def _open_creation_hours_popup(self):
         print("🆕 Abriendo Horas...")
-        locator, frame = find_in_all_frames(self.page, "#creationDate button[paw\\:handler='pawDataFieldDate_btnShowPopHours']")
-        if not locator:
-            raise RuntimeError("No se encontro BOTON de Horas")
-        
-        smart_click(locator, frame=frame, expect_nav=False)
-        popup = wait_visible_popup(self.page, "span.pawDFSelPopup", must_contain_selector="td.pawOptTdr", timeout_ms=10_000)
-        return popup
+        return self._open_popup(form.HOURS_POPUP)
 
     def _open_creation_minutes_popup(self):
         print("🆕 Abriendo Minutos...")
-        locator, frame = find_in_all_frames(self.page, "#creationDate button[paw\\:handler='pawDataFieldDate_btnShowPopMinutes']")
-        if not locator:
-            raise RuntimeError("No se encontro BOTON de mINUTOS")
-        
-        smart_click(locator, frame=frame, expect_nav=False)
-        popup = wait_visible_popup(self.page, "span.pawDFSelPopup", must_contain_selector="td.pawOptTdr", timeout_ms=10_000)
-        return popup
+        return self._open_popup(form.MINUTES_POPUP)
 
     # orquesta la seleccion del mes y del dia
     def _calendar_goto_month_year(self, popup, target_year: int, target_month: int):
-        prev_btn = popup.locator("td[paw\\:cmd='prm']")
-        next_btn = popup.locator("td[paw\\:cmd='nxm']")
+        prev_btn = popup.locator(form.CAL_PREV_MONTH)
+        next_btn = popup.locator(form.CAL_NEXT_MONTH)
 
-        prev_btn.wait_for(state="visible", timeout=10_000)
-        next_btn.wait_for(state="visible", timeout=10_000)
+        label = popup.locator(form.CAL_MONTH_LABEL)
+
+        with waiting():
+            prev_btn.wait_for(state="visible", timeout=10_000)
+            next_btn.wait_for(state="visible", timeout=10_000)
+            label.wait_for(state="visible", timeout=10_000)
 
         target = (target_year, target_month)
 
-        # Rango en 2 Años para cargar ticket
-        for _ in range(24):
-            current_text = get_label_popup_txt(self.page, popup_selector="span.pawCalPopup", label_selector="td#pawTheLabelTgt", timeout_ms=10_000)
-            cy, cm = parse_month_year_es(current_text)
-            current = (cy, cm)
+        for _ in range(form.CAL_MAX_MONTH_STEPS):
+            current_text = label.inner_text().strip()
+            current = parse_month_year_es(current_text)
 
             if current == target:
                 return
@@ -233,13 +326,15 @@ class WebController:
             else:
                 prev_btn.click()
 
-            self.page.wait_for_timeout(150)
+            # sigue apenas el calendario re-renderiza el mes
+            with waiting():
+                expect(label).not_to_have_text(current_text, timeout=10_000)
 
         raise RuntimeError(f"No pude llegar al mes objetivo {target_month}/{target_year}")
     
     # selecciona el dia
     def _calendar_select_day(self, popup, d: date):
-        day_id = f"pawDay_{d.year:04d}{d.month:02d}{d.day:02d}"
+        day_id = form.calendar_day_id(d)
         day = popup.locator(f"td#{day_id}")
 
         if day.count() == 0:
@@ -257,56 +352,64 @@ class WebController:
         minute = excel_time.minute
         
         popup = self._open_creation_hours_popup()
-        select_popup_option_by_text(popup, "td.pawOptTdr", str(hour), timeout_ms=10_000)
+        select_popup_option_by_text(popup, form.TIME_OPTION, str(hour), timeout_ms=10_000)
 
         popup = self._open_creation_minutes_popup()
         try:
-            select_popup_option_by_text(popup, "td.pawOptTdr", str(minute), timeout_ms=10_000)
+            select_popup_option_by_text(popup, form.TIME_OPTION, str(minute), timeout_ms=10_000)
         except Exception:
-            select_popup_option_by_text(popup, "td.pawOptTdr", f"{minute:02d}", timeout_ms=10_000)
+            select_popup_option_by_text(popup, form.TIME_OPTION, f"{minute:02d}", timeout_ms=10_000)
     
-    # selecciona la persona que notifico el problema
-    def goto_notificado_por(self):
-        print("🆕 Abriendo Notificado Por...")
-        popup = self._open_notificado_por_popup()
-        self._select_notificado_por(popup)
+    # campos constantes del lote
+    def fill_constant_fields(self):
+        """ Notificado por, tipo, categoría, servicio, grupo y técnico. Solo el primer ticket abre los popups """
+        # el radio de primera línea es un img-cycler: si el replay ya lo activó, los popups no lo vuelven a tocar
+        radio_on = False
+        if self._constant_fields:
+            if self._replay_constant_fields():
+                return
+            radio_on = True
 
-    # abre el popup de notificado por
-    def _open_notificado_por_popup(self):
-        locator, frame = find_in_all_frames(self.page, 'table[paw\\:name="panUsers_idSource"][paw\\:label="Notificado por"]')
-        if not locator:
-            raise RuntimeError("No se encontro campo 'Notificado por'")
-        
-        smart_click(locator, frame=frame, expect_nav=False)
-        popup = wait_visible_popup(self.page, 'span[paw\\:ctrl="pawDataFieldSelector"]#panUsers_idSource', must_contain_selector="input.pawDFSelFilterTableInp", timeout_ms=10_000)
-        return popup
+        self.goto_notificado_por()
+        self.select_tipo_solicitud_servicio()
+        self.select_categoria()
+        self.select_servicio()
+        self.goto_grupo_responsable(radio_on=radio_on)
 
-    # abre y selecciona el notificado por
-    def _select_notificado_por(self, popup):
-        inp = popup.locator("input.pawDFSelFilterTableInp")
-        inp.wait_for(state="visible", timeout=10_000)
-        inp.fill("")
-        inp.type(DEFAULT_REPORT_USER, delay=0)
+        if WEB_PREFILL_CONSTANTS and self._constant_fields is None:
+            self._constant_fields = capture_fields(self.page, list(form.CONSTANT_FIELDS)) or False
+            if self._constant_fields is False:
+                print("↩️ Los campos constantes no exponen un setter propio, se siguen usando los popups")
 
-        needle = f"\\{DEFAULT_REPORT_USER}"
-        try:
-            inp.press("Enter")
-        except Exception:
-            pass
+    def _replay_constant_fields(self) -> bool:
+        # el radio de primera línea habilita grupo/técnico
+        click_radio_btn(self.page, form.FIRST_LINE_RADIO, timeout=10_000)
+
+        if replay_fields(self.page, self._constant_fields):
+            print("⚡ Campos constantes re-aplicados")
+            return True
 
-        select_popup_option_by_attr_contains(popup=popup,attr="completeview",needle=needle,timeout_ms=10_000)
+        print("↩️ No se pudieron re-aplicar los campos constantes, se usan los popups")
+        self._constant_fields = False
+        return False
+
+    # selecciona la persona que notifico el problema
+    def goto_notificado_por(self):
+        print("🆕 Abriendo Notificado Por...")
+        popup = self._open_popup(form.NOTIFICADO_POPUP)
+        self._filter_and_select(popup, DEFAULT_REPORT_USER, attr="completeview", needle=f"\\{DEFAULT_REPORT_USER}", timeout_ms=10_000)
 
     # ingresa el titulo y descripcion de incidencia
     def select_titulo_descripcion(self, job: TicketJob):
         print("🆕 Seleccionando Titulo...")
-        problema = job.data.get("PROBLEMA").strip()
+        problema = job.problema
         titulo = problema[:256]
 
         # Titulo
         if not problema:
             raise RuntimeError("Problema Vacio en el JOB")
 
-        locator, _ = find_in_all_frames(self.page, "#incidentTitle")
+        locator, _ = find_in_all_frames(self.page, form.INCIDENT_TITLE)
         if not locator:
             raise RuntimeError("No se encontro frame titulo de incidencia")
         locator.wait_for(state="visible", timeout=10_000)
@@ -315,7 +418,7 @@ class WebController:
         
         # Descripcion
         print("🆕 Abriendo Descripcion...")
-        locator, _ = find_in_all_frames(self.page, "#description")
+        locator, _ = find_in_all_frames(self.page, form.DESCRIPTION)
         if not locator:
             raise RuntimeError("No se encontró #description (Descripción)")
 
@@ -326,106 +429,66 @@ class WebController:
     # selecciona el tipo de solicitud
     def select_tipo_solicitud_servicio(self):
         print("🆕 Abriendo Solicitud de Servicio...")
-        btn, frame = find_in_all_frames(self.page, "#padTypes_id button#pawTheBtn")
-        if not btn:
-            raise RuntimeError("No se encontró el botón del dropdown Tipo (#padTypes_id #pawTheBtn)")
-
-        smart_click(btn, frame=frame, expect_nav=False)
-        popup = wait_visible_popup(self.page, "span.pawDFSelPopup#viewAllIncidents_padTypes_id_Selector", must_contain_selector="div.pawOpt", timeout_ms=10_000)
-        select_popup_option_by_text(popup, option_selector="div.pawOpt", target_text="Solicitud de Servicio", timeout_ms=10_000)
+        popup = self._open_popup(form.TIPO_POPUP)
+        select_popup_option_by_text(popup, option_selector=form.TIPO_OPTION, target_text=form.TIPO_SOLICITUD, timeout_ms=10_000)
 
     # selecciona la categoria de la solicitud
     def select_categoria(self):
         print("🆕 Abriendo Categorias...")
-        btn, btn_frame = find_in_all_frames(self.page,'table#padPortfolio_id button[paw\\:handler="pawDataFieldDropDownBrowser_btnShowPopTree"]')
-        if not btn:
-            raise RuntimeError("No se encontró el botón de servicio categoría (tree)")
-
-        smart_click(btn, frame=btn_frame, expect_nav=False)
-
-        popup = get_tree_popup(btn_frame, root_label="Servicio", timeout=20_000)
-
-        # 3) Ruta: expandir → expandir → click leaf
-        tree_expand(self.page, popup, "Servicios TI")
-        tree_wait_label_visible(popup, "Computadores e Impresoras")
-
-        tree_expand(self.page, popup, "Computadores e Impresoras")
-        tree_wait_label_visible(popup, "Computadores")
-
-        tree_click_leaf(self.page, popup, "Computadores")
+        self._select_tree(form.CATEGORIA_TREE)
 
     # selecciona el servicio a realizar
     def select_servicio(self):
         print("🆕 Abriendo Servicios...")
-        btn, btn_frame = find_in_all_frames(self.page, 'table#padCategories_id button[paw\\:handler="pawDataFieldDropDownBrowser_btnShowPopTree"]')
+        self._select_tree(form.SERVICIO_TREE)
+
+    def _select_tree(self, step: TreeStep):
+        btn, btn_frame = find_in_all_frames(self.page, step.button)
         if not btn:
-            raise RuntimeError("No se encontro el boton de Categorias")
-        
+            raise RuntimeError(step.not_found)
+
         smart_click(btn, frame=btn_frame, expect_nav=False)
 
-        popup = get_tree_popup(btn_frame, root_label="Categorías", timeout=20_000)
+        popup = get_tree_popup(btn_frame, root_label=step.root_label, timeout=20_000)
 
-        tree_click_leaf(self.page, popup, "Mantención de Equipos")
+        # Ruta: expandir → expandir → click leaf (cada nivel por su id cacheado si lo hay)
+        labels = list(step.path)
+        cache = get_tree_path_cache()
+        if tree_select_path(self.page, popup, labels, cache=cache, cache_key=cache.key(f"{urlsplit(self.url).hostname}/{step.tree}", labels)):
+            print(f"⚡ {labels[-1]} desde cache")
 
     # selecciona grupo responsable y usuario
-    def goto_grupo_responsable(self):
+    def goto_grupo_responsable(self, radio_on: bool = False):
         print("🆕 Abriendo Grupo Responsable...")
-        click_radio_btn(self.page, "dfrb_FirstLineActionScale", timeout=10_000)
-        self.page.wait_for_timeout(400)
+        # radio_on: el radio de primera línea ya se activó en este formulario (un segundo click lo apaga)
+        if not radio_on:
+            click_radio_btn(self.page, form.FIRST_LINE_RADIO, timeout=10_000)
 
-        tecnico = get_label_txt(self.page, selector="span#pawTheUserInfoLabel", timeout_ms=10_000)
-        popup = self._open_grupo_responsable_popup()
-        self._select_grupo_responsable(popup)
+        # el radio habilita el dropdown de grupo; se espera eso en vez de dormir
+        btn, _ = wait_in_all_frames(self.page, form.GRUPO_POPUP.button, timeout_ms=10_000)
+        wait_visible_enabled(self.page, btn, timeout_ms=10_000)
 
-        popup = self._open_tecnico_encargado()
-        self._select_tecnico_encargado(popup, tecnico)
+        tecnico = get_label_txt(self.page, selector=form.TECNICO_LABEL, timeout_ms=10_000)
+        popup = self._open_popup(form.GRUPO_POPUP)
+        self._filter_and_select(popup, DEFAULT_JOB_GROUP, attr="paw:label", needle=DEFAULT_JOB_GROUP)
 
-    def _open_grupo_responsable_popup(self):
-        btn, btn_frame = find_in_all_frames(self.page,'table#pawSvcAuthGroups_id button[paw\\:handler="pawDataFieldDropDownBrowser_btnShowPopSel"]')
-        if not btn:
-            raise RuntimeError("No se encontró el botón dropdown (PopSel) para Grupo responsable")
-
-        smart_click(btn, frame=btn_frame, expect_nav=False)
-
-        popup = wait_visible_popup(self.page, 'span[paw\\:ctrl="pawDataFieldSelector"]#pawSvcAuthGroups_id', must_contain_selector="input.pawDFSelFilterTableInp", timeout_ms=10_000)
-        return popup
-    
-    def _open_tecnico_encargado(self):
         print("🆕 Abriendo Tecnico Encargado...")
-        btn, btn_frame = find_in_all_frames(self.page, 'table#pawSvcAuthUsers_idResponsible button[paw\\:handler="pawDataFieldDropDownBrowser_btnShowPopSel"]')
-        if not btn:
-            raise RuntimeError("No se encontró botón PopSel para Técnico de 2ª línea")
+        popup = self._open_popup(form.TECNICO_POPUP)
+        self._filter_and_select(popup, tecnico, attr="paw:label", needle=tecnico)
 
-        smart_click(btn, frame=btn_frame, expect_nav=False)
-        popup = wait_visible_popup(self.page, 'span[paw\\:ctrl="pawDataFieldSelector"]#pawSvcAuthUsers_idResponsible', must_contain_selector="input.pawDFSelFilterTableInp", timeout_ms=10_000)
-        
-        return popup
-
-    def _select_grupo_responsable(self, popup):
-        inp = popup.locator("input.pawDFSelFilterTableInp")
-        inp.wait_for(state="visible", timeout=10_000)
-        inp.fill("")
-        inp.type(DEFAULT_JOB_GROUP, delay=0)
-
-        try:
-            inp.press("Enter")
-        except Exception:
-            pass
-
-        select_popup_option_by_attr_contains(popup=popup, attr="paw:label", needle=DEFAULT_JOB_GROUP, timeout_ms=20_000, case_insensitive=True)
-        
-    def _select_tecnico_encargado(self, popup, tecnico):
-        inp = popup.locator("input.pawDFSelFilterTableInp")
+    def _filter_and_select(self, popup, text: str, attr: str, needle: str, timeout_ms: int = 20_000):
+        """ Escribe en el filtro del selector y elige la opción cuyo `attr` contiene `needle` """
+        inp = popup.locator(form.FILTER_INPUT)
         inp.wait_for(state="visible", timeout=10_000)
         inp.fill("")
-        inp.type(tecnico, delay=0)
+        inp.type(text, delay=0)
 
         try:
             inp.press("Enter")
         except Exception:
             pass
 
-        select_popup_option_by_attr_contains(popup=popup, attr="paw:label", needle=tecnico, timeout_ms=20_000, case_insensitive=True)
+        select_popup_option_by_attr_contains(popup=popup, attr=attr, needle=needle, timeout_ms=timeout_ms, case_insensitive=True)
 
     def crear_ticket(self):
         print("✅ Ticket creado correctamente")
@@ -436,4 +499,4 @@ class WebController:
 
 
     def _go_home(self):
-        self.page.goto(URL_PROACTIVA, wait_until="domcontentloaded", timeout=60_000)
\ No newline at end of file
+        self.page.goto(self.url, wait_until="domcontentloaded", timeout=60_000)
\ No newline at end of file
@@ -0,0 +1,320 @@
+"""
+Versión async (playwright.async_api) de los helpers de web_helpers.
+Selectores, JS y helpers puros vienen de paw_form, igual que en la versión sync.
+"""
+import re
+from time import monotonic
+from playwright.async_api import TimeoutError as PWTimeoutError
+
+from src.helpers.paw_form import (
+    get_frame_cache,
+    popup_option_attr_xpath,
+    tree_header_by_label,
+    tree_node_header,
+    DOM_READY_JS,
+    DATEFIELD_SETTER_JS,
+    DATEFIELD_HOLDS_JS,
+    FIELDS_CAPTURE_JS,
+    FIELDS_REPLAY_JS,
+    TREE_NODE_JS,
+    TREE_POPUP,
+    TREE_NODE_LABEL,
+)
+from src.utils.context_manager import waiting
+
+
+# ----- | WEB | -----
+async def find_in_all_frames(page, css_selector: str):
+    cache = get_frame_cache(page)
+
+    frame = cache.get(css_selector)
+    if frame is not None:
+        loc = frame.locator(css_selector)
+        try:
+            if not frame.is_detached() and await loc.count() > 0:
+                return loc, frame
+        except Exception:
+            pass
+        cache.pop(css_selector, None)
+
+    loc = page.main_frame.locator(css_selector)
+    try:
+        if await loc.count() > 0:
+            cache[css_selector] = page.main_frame
+            return loc, page.main_frame
+    except Exception:
+        pass
+
+    # iframes
+    for frame in page.frames:
+        if frame is page.main_frame:
+            continue
+        loc = frame.locator(css_selector)
+        try:
+            if await loc.count() > 0:
+                cache[css_selector] = frame
+                return loc, frame
+        except Exception:
+            continue
+
+    return None, None
+
+async def wait_visible_enabled(page, locator, timeout_ms: int):
+    with waiting():
+        await locator.wait_for(state="visible", timeout=timeout_ms)
+        handle = await locator.element_handle(timeout=timeout_ms)
+        await handle.wait_for_element_state("enabled", timeout=timeout_ms)
+
+
+# ----- | READINESS | -----
+async def wait_until_resolved(page, resolve, selector: str, must_contain_selector: str | None = None, visible: bool = False, timeout_ms: int = 10_000, slice_ms: int = 2_000):
+    """ Ver web_helpers.wait_until_resolved. `resolve` es una corrutina """
+    deadline = monotonic() + timeout_ms / 1000
+
+    with waiting():
+        while True:
+            remaining = int((deadline - monotonic()) * 1000)
+            if remaining > 0:
+                try:
+                    await page.wait_for_function(DOM_READY_JS, arg=[selector, must_contain_selector, visible], timeout=min(remaining, slice_ms))
+                except Exception:
+                    pass
+
+            found = await resolve()
+            if found:
+                return found
+
+            if monotonic() >= deadline:
+                raise PWTimeoutError(f"Timeout esperando: {selector} (must_contain={must_contain_selector})")
+
+async def wait_in_all_frames(page, css_selector: str, timeout_ms: int = 10_000):
+    async def resolve():
+        locator, frame = await find_in_all_frames(page, css_selector)
+        return (locator, frame) if locator else None
+
+    return await wait_until_resolved(page, resolve, css_selector, timeout_ms=timeout_ms)
+
+
+async def smart_click(locator, frame=None, expect_nav: bool = False, nav_timeout_ms: int = 30_000):
+    try:
+        await locator.scroll_into_view_if_needed(timeout=5_000)
+    except Exception:
+        pass
+
+    if expect_nav and frame is not None:
+        try:
+            async with frame.expect_navigation(wait_until="domcontentloaded", timeout=nav_timeout_ms):
+                await locator.click(timeout=10_000)
+            return
+        except PWTimeoutError:
+            pass
+
+    await locator.click(timeout=10_000)
+
+async def get_visible_popup(page, popup_selector, must_contain_selector: None):
+    for fr in page.frames:
+        p = await get_visible_popup_in_frame(fr, popup_selector, must_contain_selector)
+        if p:
+            return p
+
+    return None
+
+async def get_visible_popup_in_frame(frame, popup_selector, must_contain_selector: None):
+    popups = frame.locator(popup_selector)
+    try:
+        count = await popups.count()
+    except Exception:
+        return None
+
+    for i in range(count):
+        p = popups.nth(i)
+        try:
+            if not await p.is_visible():
+                continue
+            if must_contain_selector and await p.locator(must_contain_selector).count() == 0:
+                continue
+            return p
+        except Exception:
+            continue
+
+    return None
+
+async def wait_visible_popup(page, popup_selector, must_contain_selector: None, timeout_ms: int = 10_000, frame=None):
+    async def resolve():
+        if frame is not None:
+            p = await get_visible_popup_in_frame(frame, popup_selector, must_contain_selector)
+            if p:
+                return p
+        return await get_visible_popup(page, popup_selector, must_contain_selector)
+
+    return await wait_until_resolved(page, resolve, popup_selector, must_contain_selector=must_contain_selector, visible=True, timeout_ms=timeout_ms)
+
+async def get_label_txt(page, selector: str, timeout_ms: int = 10_000):
+    locator, frame = await find_in_all_frames(page, selector)
+    if not locator:
+        raise RuntimeError(f"No se encontró el elemento: {selector}")
+
+    with waiting():
+        await locator.wait_for(state="visible", timeout=timeout_ms)
+    txt = (await locator.inner_text()).strip()
+    return txt
+
+async def select_popup_option_by_text(popup, option_selector: str, target_text: str, timeout_ms: int = 10_000):
+    opts = popup.locator(option_selector)
+    with waiting():
+        await opts.first.wait_for(state="visible", timeout=timeout_ms)
+
+    exact = re.compile(rf"^\s*{re.escape(target_text)}\s*$")
+    opt = opts.filter(has_text=exact, visible=True).first
+    if await opt.count() == 0:
+        raise RuntimeError(f"No se encontró la opción '{target_text}' en el popup ({option_selector}).")
+
+    await opt.click()
+    return True
+
+async def select_popup_option_by_attr_contains(popup, attr: str, needle: str, timeout_ms: int = 10_000, case_insensitive: bool = True):
+    xp = popup_option_attr_xpath(attr, needle, case_insensitive)
+
+    opt = popup.locator(xp).first
+    with waiting():
+        await opt.wait_for(state="visible", timeout=timeout_ms)
+    await opt.click(timeout=timeout_ms)
+    return True
+
+async def set_datefield_text(page, field_selector: str, text: str, timeout_ms: int = 5_000) -> bool:
+    locator, frame = await find_in_all_frames(page, field_selector)
+    if not locator:
+        return False
+
+    try:
+        if await frame.evaluate(DATEFIELD_SETTER_JS, [field_selector, text]):
+            return True
+    except Exception:
+        pass
+
+    inp = frame.locator(f"{field_selector} input:not([type=hidden])").first
+    try:
+        if await inp.count() == 0 or not await inp.is_editable():
+            return False
+        await inp.fill(text, timeout=timeout_ms)
+        await inp.press("Tab")
+        return await frame.evaluate(DATEFIELD_HOLDS_JS, [field_selector, text])
+    except Exception:
+        return False
+
+
+async def capture_fields(page, selectors: list[str]) -> dict | None:
+    snaps = {}
+    for frame, group in await _group_by_frame(page, selectors):
+        if frame is None:
+            return None
+        try:
+            values = await frame.evaluate(FIELDS_CAPTURE_JS, group)
+        except Exception:
+            return None
+        if any(v is None for v in values):
+            return None
+        snaps.update(zip(group, values))
+    return snaps
+
+async def replay_fields(page, snaps: dict) -> bool:
+    try:
+        for frame, group in await _group_by_frame(page, list(snaps)):
+            if frame is None:
+                return False
+            if not all(await frame.evaluate(FIELDS_REPLAY_JS, [[sel, snaps[sel]] for sel in group])):
+                return False
+
+        return await capture_fields(page, list(snaps)) == snaps
+    except Exception:
+        return False
+
+async def _group_by_frame(page, selectors: list[str]):
+    frames, groups = {}, {}
+    for sel in selectors:
+        _, frame = await find_in_all_frames(page, sel)
+        key = id(frame) if frame else None
+        frames[key] = frame
+        groups.setdefault(key, []).append(sel)
+    return [(frames[key], group) for key, group in groups.items()]
+
+
+# Popup con label
+async def get_tree_popup(frame, root_label: str, timeout=20_000):
+    popup = frame.locator(TREE_POPUP).first
+    with waiting():
+        await popup.wait_for(state="visible", timeout=timeout)
+
+        await popup.locator(TREE_NODE_LABEL, has_text=root_label).first.wait_for(
+            state="visible", timeout=timeout
+        )
+    return popup
+
+async def tree_expand(header, timeout=20_000):
+    await header.scroll_into_view_if_needed()
+
+    exp = header.locator("css=img#pawExp").first
+    if await exp.count() > 0:
+        await exp.wait_for(state="visible", timeout=timeout)
+        await exp.click()
+    else:
+        await header.click()
+
+async def tree_click_leaf(popup, header):
+    await header.scroll_into_view_if_needed()
+    await header.click()
+
+    try:
+        with waiting():
+            await popup.wait_for(state="hidden", timeout=5_000)
+    except PWTimeoutError:
+        pass
+
+async def tree_select_path(page, popup, labels: list[str], cache=None, cache_key: str | None = None, timeout=20_000) -> bool:
+    """ Ver web_helpers.tree_select_path """
+    entry = cache.get(cache_key) if cache else None
+    cached = entry["nodes"] if entry and len(entry.get("nodes", [])) == len(labels) else [None] * len(labels)
+
+    nodes = []
+    for depth, (label, node) in enumerate(zip(labels, cached)):
+        header, node = await _tree_level_header(popup, label, node, timeout)
+        nodes.append(node)
+
+        if depth < len(labels) - 1:
+            await tree_expand(header, timeout=timeout)
+        else:
+            await tree_click_leaf(popup, header)
+
+    hit = None not in cached and nodes == cached
+    if cache:
+        cache.count(hit)
+        if not hit and all(nodes):
+            cache.set(cache_key, {"nodes": nodes})
+    return hit
+
+async def _tree_level_header(popup, label: str, node: dict | None, timeout: int):
+    by_label = tree_header_by_label(popup, label)
+
+    if node:
+        by_id = tree_node_header(popup, node)
+        with waiting():
+            await by_id.or_(by_label).first.wait_for(state="visible", timeout=timeout)
+        if await by_id.count() and (await by_id.locator(TREE_NODE_LABEL).first.inner_text()).strip() == label:
+            return by_id, node
+
+    with waiting():
+        await by_label.wait_for(state="visible", timeout=timeout)
+
+    try:
+        found = await by_label.evaluate(TREE_NODE_JS)
+    except Exception:
+        found = None
+    return by_label, found if found and found.get("label") == label else None
+
+async def click_radio_btn(page, row_id: str, timeout=10_000):
+    loc, fr = await find_in_all_frames(page, f"tr#{row_id}")
+    if not loc:
+        raise RuntimeError(f"No se encontró el img-cycler tr#{row_id}")
+    await loc.wait_for(state="visible", timeout=timeout)
+    await smart_click(loc, frame=fr, expect_nav=False)
+    return fr
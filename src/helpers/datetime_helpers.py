@@ -65,14 +65,19 @@ def split_web_creation_dt(text: str) -> tuple[date, time]:
     dt = parse_web_creation_dt(text)
     return dt.date(), dt.time()
 
+def format_web_creation_dt(d: date, t: time) -> str:
+    return datetime.combine(d, time(t.hour, t.minute)).strftime(WEB_CREATION_FMT)
+
 # -------------------------
 # NORMALIZACIÓN EN POLARS (columnas -> Date/Time)
 # -------------------------
 
-def normalize_fecha_hora_polars(df: pl.DataFrame, fecha_col: str = "FECHA", hora_col: str = "HORA") -> pl.DataFrame:
+def normalize_fecha_hora_polars(df: pl.DataFrame | pl.LazyFrame, fecha_col: str = "FECHA", hora_col: str = "HORA") -> pl.DataFrame | pl.LazyFrame:
+    """ Acepta DataFrame o LazyFrame; con LazyFrame solo agrega las expresiones al plan """
     exprs: list[pl.Expr] = []
+    columns = df.collect_schema().names()
 
-    if fecha_col in df.columns:
+    if fecha_col in columns:
         fecha_txt = (
             pl.col(fecha_col)
             .cast(pl.Utf8, strict=False)
@@ -95,7 +100,7 @@ def normalize_fecha_hora_polars(df: pl.DataFrame, fecha_col: str = "FECHA", hora
             ).alias(fecha_col)
         )
 
-    if hora_col in df.columns:
+    if hora_col in columns:
         hora_txt = (
             pl.col(hora_col)
             .cast(pl.Utf8, strict=False)
@@ -1,7 +1,6 @@
+import fastexcel
 import polars as pl
 from typing import List, Tuple, Set
-from openpyxl import load_workbook
-from datetime import datetime, date, time as dtime
 from pathlib import Path
 from src.config import CORE_COLUMNS
 
@@ -10,6 +9,10 @@ from src.models.ticket_job import TicketJob
 from src.helpers.datetime_helpers import split_web_creation_dt
 
 
+# La fila de encabezados se busca solo al principio de la hoja
+HEADER_SCAN_ROWS = 50
+
+
 def clean_headers(headers: List[str]) -> List[str]:
     return [
         h.strip()
@@ -17,17 +20,31 @@ def clean_headers(headers: List[str]) -> List[str]:
         if h and str(h).strip().upper() != "NONE"
     ]
 
-def detect_header_row(df_raw: pl.DataFrame) -> int:
-    for i, row in enumerate(df_raw.iter_rows()):
-        normalized = {
-            str(c).strip().upper()
-            for c in row
-            if c
-        }
-        if "FECHA" in normalized and "HORA" in normalized:
-            return i
-    
-    raise ValueError("No se pudo detectar la fila de encabezados")
+def detect_header_row(df_raw: pl.DataFrame | pl.LazyFrame, scan_rows: int = HEADER_SCAN_ROWS) -> int:
+    """ Posición de la primera fila (entre las primeras scan_rows) que tiene celdas FECHA y HORA """
+    lf = df_raw.lazy().head(scan_rows)
+    cells = [
+        pl.col(c).cast(pl.Utf8).str.strip_chars().str.to_uppercase()
+        for c in lf.collect_schema().names()
+        if c != "EXCEL_ROW"
+    ]
+    if not cells:
+        raise ValueError("No se pudo detectar la fila de encabezados")
+
+    is_header = (
+        lf.select(
+            (pl.any_horizontal([cell == "FECHA" for cell in cells]) & pl.any_horizontal([cell == "HORA" for cell in cells]))
+            .fill_null(False)
+            .alias("is_header")
+        )
+        .collect()
+        .get_column("is_header")
+    )
+
+    found = is_header.arg_true()
+    if found.is_empty():
+        raise ValueError("No se pudo detectar la fila de encabezados")
+    return int(found[0])
 
 def detect_format(headers: List[str]) -> str:
     normalized = {h.upper() for h in headers}
@@ -58,20 +75,21 @@ def validate_required_columns( headers: List[str], required: Set[str], ticket_al
 
 
 
-def reduce_to_core_columns(df: pl.DataFrame, ticket_col: str) -> pl.DataFrame:
+def reduce_to_core_columns(df: pl.DataFrame | pl.LazyFrame, ticket_col: str) -> pl.DataFrame | pl.LazyFrame:
 
     # Normalizar nombre del ticket
     if ticket_col != "TICKET":
         df = df.rename({ticket_col: "TICKET"})
 
-    missing = [c for c in CORE_COLUMNS if c not in df.columns]
+    columns = df.collect_schema().names()
+    missing = [c for c in CORE_COLUMNS if c not in columns]
     if missing:
         raise ValueError(f"Columnas críticas faltantes: {', '.join(missing)}")
     
-    cols = (["EXCEL_ROW"] if "EXCEL_ROW" in df.columns else []) + CORE_COLUMNS
+    cols = (["EXCEL_ROW"] if "EXCEL_ROW" in columns else []) + CORE_COLUMNS
     return df.select(cols)
 
-def filter_pending_tickets(df: pl.DataFrame, ticket_col: str) -> pl.DataFrame:
+def filter_pending_tickets(df: pl.DataFrame | pl.LazyFrame, ticket_col: str) -> pl.DataFrame | pl.LazyFrame:
     return df.filter(
         pl.col(ticket_col).is_null()
         | (pl.col(ticket_col)
@@ -82,53 +100,40 @@ def filter_pending_tickets(df: pl.DataFrame, ticket_col: str) -> pl.DataFrame:
            .str.to_uppercase() == "NONE")
     )
 
-def read_excel_with_excel_row(path: Path, sheet_name: str | None = None) -> pl.DataFrame:
-    wb = load_workbook(path, read_only=True, data_only=True)
-    ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
-
-    max_row, max_col = ws.max_row, ws.max_column
-
-    used_cols = [False] * max_col   # marca columnas que tienen algún dato real
-    rows = []
-
-    for r_idx, row in enumerate(
-        ws.iter_rows(min_row=1, max_row=max_row, max_col=max_col, values_only=True),
-        start=1
-    ):
-        if all(v is None or v == "" for v in row):
-            continue
-
-        vals = []
-        for j, v in enumerate(row, start=1):
-            if v is None or v == "":
-                vals.append(None)
-                continue
-
-            # hay valor real => esta columna se usa
-            used_cols[j - 1] = True
-
-            if isinstance(v, (datetime, date, dtime)):
-                vals.append(v.isoformat())
-            else:
-                s = str(v).strip()
-                vals.append(s if s != "" else None)
-                # si era solo espacios, no cuenta como dato real
-                if s == "":
-                    used_cols[j - 1] = False
-
-        rows.append([r_idx, *vals])
-
-    keep = [i + 1 for i, ok in enumerate(used_cols) if ok]
-    cropped = []
-    for r in rows:
-        excel_row = r[0]
-        data = r[1:]
-        cropped.append([excel_row] + [data[i - 1] for i in keep])
-
-    schema = ["EXCEL_ROW"] + [f"col_{i}" for i in keep]
-    return pl.DataFrame(cropped, schema=schema, orient="row")
-
+def scan_excel_with_excel_row(path: Path, sheet_name: str | None = None) -> pl.LazyFrame:
+    """
+    Lee la hoja con fastexcel (calamine) directo a Arrow/polars, todo como texto, y deja el resto como plan lazy.
+    EXCEL_ROW es la fila real del Excel (1-based). Se descartan filas y columnas sin datos.
+    El strip de textos se hace recién al recolectar y solo en las columnas que el plan termine usando.
+    """
+    reader = fastexcel.read_excel(path)
+
+    # header_row=None + skip_rows=0: la fila 0 del DataFrame es la fila 1 del Excel
+    sheet = reader.load_sheet(
+        sheet_name if sheet_name else 0,
+        header_row=None,
+        skip_rows=0,
+        dtypes="string",
+        whitespace_as_null=True,
+    )
+    df = sheet.to_polars()
 
+    # columnas que tienen algún dato real (whitespace_as_null ya dejó en null las celdas en blanco)
+    keep = [c for c, nulls in zip(df.columns, df.null_count().row(0)) if nulls < df.height]
+    names = [f"col_{i}" for i in range(1, len(keep) + 1)]
 
+    lf = (
+        df.lazy()
+          .with_row_index("EXCEL_ROW", offset=1)
+          .select([pl.col("EXCEL_ROW").cast(pl.Int64)] + [pl.col(c).alias(n) for c, n in zip(keep, names)])
+    )
+    if not names:
+        return lf.filter(pl.lit(False))
 
+    return (
+        lf.filter(pl.any_horizontal(pl.col(names).is_not_null()))
+          .with_columns(pl.col(names).str.strip_chars())
+    )
 
+def read_excel_with_excel_row(path: Path, sheet_name: str | None = None) -> pl.DataFrame:
+    return scan_excel_with_excel_row(path, sheet_name).collect()
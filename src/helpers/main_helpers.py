@@ -0,0 +1,43 @@
+import os
+import tkinter as tk
+from pathlib import Path
+
+from src.config import ASSET_CACHE_DIR
+
+
+def resized_asset(path: Path, size: tuple[int, int]) -> Path:
+    """
+    PNG redimensionado (LANCZOS) guardado en el caché de assets. El nombre lleva tamaño y mtime del original,
+    así un asset nuevo se vuelve a generar solo. PIL se importa únicamente cuando falta la copia.
+    """
+    width, height = size
+    stamp = f"{path.stat().st_mtime_ns:x}"
+    cached = ASSET_CACHE_DIR / f"{path.parent.name}_{path.stem}_{width}x{height}_{stamp}.png"
+    if cached.exists():
+        return cached
+
+    from PIL import Image
+
+    ASSET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with Image.open(path) as img:
+        resized = img.resize(size, Image.LANCZOS)
+
+    # escritura atómica: dos ventanas abriendo a la vez no dejan un PNG a medias
+    tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+    resized.save(tmp, format="PNG")
+    os.replace(tmp, cached)
+    return cached
+
+def load_photo(path: Path, size: tuple[int, int] | None = None, master=None) -> tk.PhotoImage:
+    """ PhotoImage de Tk (lee PNG sin PIL); con size usa la copia redimensionada del caché """
+    if size is None:
+        return tk.PhotoImage(master=master, file=path)
+
+    try:
+        return tk.PhotoImage(master=master, file=resized_asset(path, size))
+    except OSError:
+        # caché sin permisos de escritura: se redimensiona en memoria como antes
+        from PIL import Image, ImageTk
+
+        with Image.open(path) as img:
+            return ImageTk.PhotoImage(img.resize(size, Image.LANCZOS), master=master)
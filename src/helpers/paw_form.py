@@ -0,0 +1,310 @@
+"""
+Lo común a WebController (sync) y AsyncWebController: selectores y pasos del formulario de incidencias,
+los JS que corren en el navegador y los helpers puros (sin llamadas a Playwright).
+web_helpers y async_web_helpers solo aportan su capa de llamadas sobre estas definiciones.
+"""
+import weakref
+from dataclasses import dataclass
+from datetime import date
+
+from src.config import MONTHS_ES_INV
+
+
+# ----- | PASOS DEL FORMULARIO | -----
+@dataclass(frozen=True)
+class PopupStep:
+    button: str             # botón/campo que abre el popup
+    popup: str
+    must_contain: str       # el popup está listo cuando contiene esto
+    not_found: str          # mensaje si el botón no existe
+
+
+@dataclass(frozen=True)
+class TreeStep:
+    tree: str               # nombre del campo (clave del TreePathCache)
+    button: str
+    root_label: str         # label que tiene el árbol apenas se abre
+    path: tuple[str, ...]   # expandir path[:-1] y elegir path[-1]
+    not_found: str
+
+
+NEW_INCIDENT = "#newIncident"
+INCIDENT_TITLE = "#incidentTitle"
+DESCRIPTION = "#description"
+
+# fecha de creación
+CREATION_DATE = "#creationDate"
+CREATION_DATE_LABEL = "#creationDate #pawTheTgt"
+DATE_POPUP = PopupStep(
+    "#creationDate button[paw\\:handler='pawDataFieldDate_btnShowPopCal']",
+    "span.pawCalPopup", "td#pawTheLabelTgt",
+    "No se encontro #creationDate #pawTheTgt (ni en main frame ni en iframes).",
+)
+HOURS_POPUP = PopupStep(
+    "#creationDate button[paw\\:handler='pawDataFieldDate_btnShowPopHours']",
+    "span.pawDFSelPopup", "td.pawOptTdr",
+    "No se encontro BOTON de Horas",
+)
+MINUTES_POPUP = PopupStep(
+    "#creationDate button[paw\\:handler='pawDataFieldDate_btnShowPopMinutes']",
+    "span.pawDFSelPopup", "td.pawOptTdr",
+    "No se encontro BOTON de mINUTOS",
+)
+CAL_PREV_MONTH = "td[paw\\:cmd='prm']"
+CAL_NEXT_MONTH = "td[paw\\:cmd='nxm']"
+CAL_MONTH_LABEL = "td#pawTheLabelTgt"
+TIME_OPTION = "td.pawOptTdr"
+# el calendario permite moverse 2 años para cargar un ticket
+CAL_MAX_MONTH_STEPS = 24
+
+# selectores con filtro (notificado por, grupo, técnico)
+FILTER_INPUT = "input.pawDFSelFilterTableInp"
+NOTIFICADO_POPUP = PopupStep(
+    'table[paw\\:name="panUsers_idSource"][paw\\:label="Notificado por"]',
+    'span[paw\\:ctrl="pawDataFieldSelector"]#panUsers_idSource', FILTER_INPUT,
+    "No se encontro campo 'Notificado por'",
+)
+GRUPO_POPUP = PopupStep(
+    'table#pawSvcAuthGroups_id button[paw\\:handler="pawDataFieldDropDownBrowser_btnShowPopSel"]',
+    'span[paw\\:ctrl="pawDataFieldSelector"]#pawSvcAuthGroups_id', FILTER_INPUT,
+    "No se encontró el botón dropdown (PopSel) para Grupo responsable",
+)
+TECNICO_POPUP = PopupStep(
+    'table#pawSvcAuthUsers_idResponsible button[paw\\:handler="pawDataFieldDropDownBrowser_btnShowPopSel"]',
+    'span[paw\\:ctrl="pawDataFieldSelector"]#pawSvcAuthUsers_idResponsible', FILTER_INPUT,
+    "No se encontró botón PopSel para Técnico de 2ª línea",
+)
+# el radio de primera línea habilita grupo/técnico
+FIRST_LINE_RADIO = "dfrb_FirstLineActionScale"
+TECNICO_LABEL = "span#pawTheUserInfoLabel"
+
+# tipo de solicitud
+TIPO_POPUP = PopupStep(
+    "#padTypes_id button#pawTheBtn",
+    "span.pawDFSelPopup#viewAllIncidents_padTypes_id_Selector", "div.pawOpt",
+    "No se encontró el botón del dropdown Tipo (#padTypes_id #pawTheBtn)",
+)
+TIPO_OPTION = "div.pawOpt"
+TIPO_SOLICITUD = "Solicitud de Servicio"
+
+# árboles de categoría y servicio
+CATEGORIA_TREE = TreeStep(
+    "padPortfolio_id",
+    'table#padPortfolio_id button[paw\\:handler="pawDataFieldDropDownBrowser_btnShowPopTree"]',
+    "Servicio", ("Servicios TI", "Computadores e Impresoras", "Computadores"),
+    "No se encontró el botón de servicio categoría (tree)",
+)
+SERVICIO_TREE = TreeStep(
+    "padCategories_id",
+    'table#padCategories_id button[paw\\:handler="pawDataFieldDropDownBrowser_btnShowPopTree"]',
+    "Categorías", ("Mantención de Equipos",),
+    "No se encontro el boton de Categorias",
+)
+TREE_POPUP = 'css=div[paw\\:ctrl="pawTree"].pawTreePopup:visible'
+TREE_NODE_LABEL = "css=span.pawTreeNodeLabel"
+
+# widgets con el mismo valor en todos los tickets de una ejecución (ver fill_constant_fields)
+CONSTANT_FIELDS = (
+    NOTIFICADO_POPUP.button,
+    "table#padTypes_id",
+    "table#padPortfolio_id",
+    "table#padCategories_id",
+    "table#pawSvcAuthGroups_id",
+    "table#pawSvcAuthUsers_idResponsible",
+)
+
+
+def launch_args(headless: bool) -> list[str]:
+    if headless:
+        return [
+            "--disable-blink-features=AutomationControlled",
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-dev-shm-usage",
+            "--mute-audio",
+        ]
+
+    return [
+        "--start-maximized",
+        "--disable-blink-features=AutomationControlled",
+    ]
+
+def calendar_day_id(d: date) -> str:
+    return f"pawDay_{d.year:04d}{d.month:02d}{d.day:02d}"
+
+def parse_month_year_es(text: str) -> tuple[int, int]:
+    t = (text or "").strip().lower()
+    parts = [p.strip() for p in t.split(" de ")]
+    if len(parts) != 2:
+        raise RuntimeError(f"No pude parsear mes/año desde: '{text}'")
+
+    month_name, year_str = parts
+    if month_name not in MONTHS_ES_INV:
+        raise RuntimeError(f"Mes no reconocido: '{month_name}' en '{text}'")
+
+    return int(year_str), MONTHS_ES_INV[month_name]
+
+def popup_option_attr_xpath(attr: str, needle: str, case_insensitive: bool = True) -> str:
+    wanted = (needle or "").strip()
+    if not wanted:
+        raise RuntimeError("needle vacío")
+
+    # 👇 si el atributo tiene ":", usar name()='paw:label'
+    if ":" in attr:
+        attr_expr = f"@*[name()='{attr}']"
+    else:
+        attr_expr = f"@{attr}"
+
+    if case_insensitive:
+        return (
+            "xpath=.//div[contains(@class,'pawOpt') and not(@id='pawIdNull') and "
+            f"contains(translate({attr_expr}, "
+            "'ABCDEFGHIJKLMNOPQRSTUVWXYZÁÉÍÓÚÜÑ', "
+            "'abcdefghijklmnopqrstuvwxyzáéíóúüñ'), "
+            f"'{wanted.lower()}')]"
+        )
+
+    return (
+        "xpath=.//div[contains(@class,'pawOpt') and not(@id='pawIdNull') and "
+        f"contains({attr_expr}, '{wanted}')]"
+    )
+
+def tree_header_by_label(popup, label: str):
+    return popup.locator('xpath=.//div[contains(@class,"pawTreeNodeHeader")]'f'[.//span[contains(@class,"pawTreeNodeLabel")][normalize-space(.)="{label}"]]').first
+
+def tree_node_header(popup, node: dict):
+    """ Header del nodo cacheado (ver TreePathCache) """
+    node_xp = f'xpath=.//*[@id="{node["id"]}"]'
+    if node.get("header_is_node"):
+        return popup.locator(node_xp).first
+    return popup.locator(f'{node_xp}/descendant-or-self::div[contains(@class,"pawTreeNodeHeader")]').first
+
+
+# ----- | CACHE DE FRAMES | -----
+# Cache por página: selector -> frame donde se encontró la última vez
+_FRAME_CACHE = weakref.WeakKeyDictionary()
+
+def get_frame_cache(page) -> dict:
+    """ Cache selector -> frame de la página. Se vacía al navegar o al agregar/quitar iframes """
+    cache = _FRAME_CACHE.get(page)
+    if cache is None:
+        cache = {}
+        _FRAME_CACHE[page] = cache
+
+        def invalidate(_frame):
+            cache.clear()
+
+        page.on("framenavigated", invalidate)
+        page.on("frameattached", invalidate)
+        page.on("framedetached", invalidate)
+
+    return cache
+
+
+# ----- | JS | -----
+# Busca el selector en el documento y en todos los iframes del mismo origen.
+# Corre dentro del navegador con requestAnimationFrame: responde apenas el DOM está listo.
+DOM_READY_JS = """
+([selector, mustContain, visible]) => {
+    const isVisible = (el) => {
+        const r = el.getBoundingClientRect();
+        const st = el.ownerDocument.defaultView.getComputedStyle(el);
+        return r.width > 0 && r.height > 0 && st.visibility !== "hidden" && st.display !== "none";
+    };
+    const check = (doc) => {
+        for (const el of doc.querySelectorAll(selector)) {
+            if (visible && !isVisible(el)) continue;
+            if (mustContain && !el.querySelector(mustContain)) continue;
+            return true;
+        }
+        return false;
+    };
+    const walk = (win) => {
+        try {
+            if (check(win.document)) return true;
+        } catch (e) {
+            // iframe de otro origen: lo resuelve Python
+        }
+        for (let i = 0; i < win.frames.length; i++) {
+            if (walk(win.frames[i])) return true;
+        }
+        return false;
+    };
+    return walk(window);
+}
+"""
+
+# API propia de los widgets paw. Lo que el formulario envía son los inputs con name del widget:
+# eso lo actualiza el widget al aplicar un valor, nunca estos JS, así la verificación no se cumple sola.
+_PAW_WIDGET_JS = """
+    const pawMethod = (root, names) => names.find((name) => typeof root[name] === "function") || null;
+    const pawGetter = (root) => pawMethod(root, ["getValue", "pawGetValue", "get_value"]);
+    const pawSetter = (root) => pawMethod(root, ["setValue", "pawSetValue", "set_value"]);
+    const pawSubmitted = (root) => Object.fromEntries([...root.querySelectorAll("input[name]")].map((i) => [i.name, i.value]));
+    const pawHolds = (root, text) => {
+        const getter = pawGetter(root);
+        if (getter && root[getter]() === text) return true;
+        return Object.values(pawSubmitted(root)).includes(text);
+    };
+"""
+
+# Campo fecha (pawDataFieldDate) sin popups: true solo si el widget quedó con `text` para enviar
+DATEFIELD_SETTER_JS = """
+([selector, text]) => {""" + _PAW_WIDGET_JS + """
+    const root = document.querySelector(selector);
+    const setter = root && pawSetter(root);
+    if (!setter) return false;
+    root[setter](text);
+    return pawHolds(root, text);
+}
+"""
+
+DATEFIELD_HOLDS_JS = """
+([selector, text]) => {""" + _PAW_WIDGET_JS + """
+    const root = document.querySelector(selector);
+    return !!root && pawHolds(root, text);
+}
+"""
+
+# Campos paw del formulario: captura y re-aplicación sin popups (un evaluate por frame).
+# Un widget sin getter/setter propio o sin inputs que enviar no se puede re-aplicar: null y se usan los popups.
+FIELDS_CAPTURE_JS = """
+(selectors) => {""" + _PAW_WIDGET_JS + """
+    return selectors.map((selector) => {
+        const root = document.querySelector(selector);
+        if (!root) return null;
+        const getter = pawGetter(root);
+        const submitted = pawSubmitted(root);
+        if (!getter || !pawSetter(root) || !Object.keys(submitted).length) return null;
+        return {value: root[getter](), submitted};
+    });
+}
+"""
+
+FIELDS_REPLAY_JS = """
+(fields) => {""" + _PAW_WIDGET_JS + """
+    return fields.map(([selector, snap]) => {
+        const root = document.querySelector(selector);
+        const setter = root && snap && pawSetter(root);
+        if (!setter) return false;
+        root[setter](snap.value);
+        return true;
+    });
+}
+"""
+
+# Identidad de un nodo del árbol: el elemento con id más cercano (el header o su nodo contenedor)
+TREE_NODE_JS = """
+(header) => {
+    let el = header;
+    while (el && !el.id) {
+        el = el.parentElement;
+        if (el && el.getAttribute("paw:ctrl") === "pawTree") return null;
+    }
+    if (!el) return null;
+    const attrs = {};
+    for (const a of el.attributes) attrs[a.name] = a.value;
+    const label = header.querySelector(".pawTreeNodeLabel");
+    return {id: el.id, header_is_node: el === header, attrs, label: label ? label.textContent.trim() : null};
+}
+"""
@@ -0,0 +1,144 @@
+"""
+Lectura de proactiva_storage_state.json sin levantar un navegador.
+Decide de antemano si la sesión guardada sirve (perfil headless) o si hay que pedir login.
+"""
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from src.config import URL_PROACTIVA, WEB_SESSION_MAX_AGE_H
+
+
+# claves de expiración habituales en tokens guardados en localStorage (segundos epoch)
+_TOKEN_EXPIRY_KEYS = ("expiresOn", "expires_on", "extendedExpiresOn", "exp")
+
+# cookies de autenticación de ProactivaNet (pawAuthCookie, pawAuthCookieUserName, ...): su fecha manda
+AUTH_COOKIE_PREFIX = "pawAuthCookie"
+
+
+@dataclass
+class SessionCheck:
+    status: str                     # "VALID" | "STALE" | "EXPIRED" | "MISSING"
+    reason: str
+    expires_at: float | None = None
+
+    @property
+    def valid(self) -> bool:
+        return self.status == "VALID"
+
+    @property
+    def usable(self) -> bool:
+        """ Vale la pena probarla (headless / HTTP): STALE no se puede confirmar sin abrir el sitio """
+        return self.status in ("VALID", "STALE")
+
+
+def check_session(state_path: Path, url: str = URL_PROACTIVA, now: float | None = None) -> SessionCheck:
+    """
+    Vencimiento de la sesión guardada (gana el límite más cercano):
+    - cookies de autenticación del host (pawAuthCookie*) con fecha: la primera que vence
+    - sin ellas, el resto de las cookies del host con fecha: la que vence más tarde
+    - tokens en localStorage del origen con fecha de expiración
+    Si solo hay cookies de sesión (sin fecha) y el archivo tiene más de WEB_SESSION_MAX_AGE_H,
+    queda STALE: es solo una pista, quien llama igual puede probarla.
+    """
+    now = time.time() if now is None else now
+
+    state = _read_state(state_path)
+    if state is None:
+        return SessionCheck("MISSING", "No hay sesión guardada")
+
+    host = urlsplit(url).hostname or ""
+    cookies = host_cookies(state, host)
+    tokens = _origin_token_expiries(state, host)
+
+    if not cookies and not tokens:
+        return SessionCheck("MISSING", f"La sesión guardada no tiene cookies para {host}")
+
+    auth_dated = [c["expires"] for c in cookies if c["name"].startswith(AUTH_COOKIE_PREFIX) and _has_expiry(c)]
+    dated = [c["expires"] for c in cookies if _has_expiry(c)]
+
+    limits = []
+    if auth_dated:
+        limits.append(min(auth_dated))
+    elif dated:
+        limits.append(max(dated))
+    if tokens:
+        limits.append(max(tokens))
+
+    if limits:
+        expires_at = min(limits)
+        if expires_at <= now:
+            return SessionCheck("EXPIRED", "La sesión guardada expiró", expires_at)
+        return SessionCheck("VALID", "Sesión guardada vigente", expires_at)
+
+    # solo cookies de sesión: la edad del archivo es una estimación
+    expires_at = state_path.stat().st_mtime + WEB_SESSION_MAX_AGE_H * 3600
+    if expires_at <= now:
+        return SessionCheck("STALE", f"La sesión guardada tiene más de {WEB_SESSION_MAX_AGE_H} h, puede pedir login", expires_at)
+
+    return SessionCheck("VALID", "Sesión guardada vigente", expires_at)
+
+
+def host_cookies(state: dict, host: str, now: float | None = None) -> list[dict]:
+    """ Cookies de storage_state que aplican a `host`. Con `now` se descartan las vencidas """
+    cookies = [
+        c for c in state.get("cookies", [])
+        if c.get("domain") and _domain_matches(host, c["domain"])
+    ]
+    if now is not None:
+        cookies = [c for c in cookies if not _has_expiry(c) or c["expires"] > now]
+    return cookies
+
+
+def load_cookie_header(state_path: Path, host: str) -> str | None:
+    """ Arma el header Cookie con las cookies no expiradas de storage_state para `host` """
+    state = _read_state(state_path)
+    if state is None:
+        return None
+
+    cookies = host_cookies(state, host, now=time.time())
+    return "; ".join(f"{c['name']}={c['value']}" for c in cookies) or None
+
+
+def _read_state(state_path: Path) -> dict | None:
+    if not state_path.exists():
+        return None
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _domain_matches(host: str, domain: str) -> bool:
+    """ Mismo host o subdominio: "evil-proactiva.cl" no recibe las cookies de "proactiva.cl" """
+    host = host.lower()
+    domain = domain.lstrip(".").lower()
+    return host == domain or host.endswith("." + domain)
+
+def _has_expiry(cookie: dict) -> bool:
+    return cookie.get("expires") not in (-1, None)
+
+def _origin_token_expiries(state: dict, host: str) -> list[float]:
+    expiries = []
+    for origin in state.get("origins", []):
+        if urlsplit(origin.get("origin", "")).hostname != host:
+            continue
+
+        for item in origin.get("localStorage", []):
+            try:
+                value = json.loads(item.get("value") or "")
+            except (TypeError, json.JSONDecodeError):
+                continue
+            if not isinstance(value, dict):
+                continue
+
+            for key in _TOKEN_EXPIRY_KEYS:
+                try:
+                    expiries.append(float(value[key]))
+                    break
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+    return expiries
@@ -1,11 +1,36 @@
-import winreg
+import re
+from time import monotonic
 from pathlib import Path
 from playwright.sync_api import TimeoutError as PWTimeoutError
 
-from src.config import MONTHS_ES_INV
+from src.config import WEB_FAST_VIEWPORT
+from src.helpers.paw_form import (
+    get_frame_cache,
+    popup_option_attr_xpath,
+    tree_header_by_label,
+    tree_node_header,
+    DOM_READY_JS,
+    DATEFIELD_SETTER_JS,
+    DATEFIELD_HOLDS_JS,
+    FIELDS_CAPTURE_JS,
+    FIELDS_REPLAY_JS,
+    TREE_NODE_JS,
+    TREE_POPUP,
+    TREE_NODE_LABEL,
+)
+from src.utils.context_manager import waiting
+
+try:
+    import winreg
+except ImportError:
+    # fuera de Windows (sitio mock, benchmarks): se usa el Chromium de Playwright
+    winreg = None
 
 # Obtiene el navegador por defecto
 def get_default_browser() -> str | None:
+    if winreg is None:
+        return None
+
     try:
         key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\Shell\Associations\UrlAssociations\https\UserChoice")
         prog_id, _ = winreg.QueryValueEx(key, "ProgId")
@@ -31,8 +56,12 @@ def get_default_browser() -> str | None:
     return None
 
 # Verifica si existe una sesion o hay que registrarse
-def get_sesion(state_path: Path):
-    context_kwargs = {"viewport": None}
+def get_sesion(state_path: Path, headless: bool = False):
+    if headless:
+        # viewport fijo y sin animaciones: menos trabajo de render por ticket
+        context_kwargs = {"viewport": dict(WEB_FAST_VIEWPORT), "reduced_motion": "reduce"}
+    else:
+        context_kwargs = {"viewport": None}
 
     if state_path.exists():
         context_kwargs["storage_state"] = str(state_path)
@@ -47,18 +76,35 @@ def chrome_installed() -> bool:
 
 # ----- | WEB | -----
 def find_in_all_frames(page, css_selector: str):
+    cache = get_frame_cache(page)
+
+    # frame cacheado: 1 round trip (se verifica igual, el evento de navegación puede llegar tarde)
+    frame = cache.get(css_selector)
+    if frame is not None:
+        loc = frame.locator(css_selector)
+        try:
+            if not frame.is_detached() and loc.count() > 0:
+                return loc, frame
+        except Exception:
+            pass
+        cache.pop(css_selector, None)
+
     loc = page.main_frame.locator(css_selector)
     try:
         if loc.count() > 0:
+            cache[css_selector] = page.main_frame
             return loc, page.main_frame
     except Exception:
         pass
 
     # iframes
     for frame in page.frames:
+        if frame is page.main_frame:
+            continue
         loc = frame.locator(css_selector)
         try:
             if loc.count() > 0:
+                cache[css_selector] = frame
                 return loc, frame
         except Exception:
             continue
@@ -69,22 +115,45 @@ def find_in_all_frames(page, css_selector: str):
 
 
 def wait_visible_enabled(page, locator, timeout_ms: int):
-    locator.wait_for(state="visible", timeout=timeout_ms)
-    page.wait_for_timeout(200)
-
-    # loop corto y simple (sin meterse a _impl_obj)
-    waited = 0
-    step = 200
-    while waited < timeout_ms:
-        try:
-            if locator.is_enabled():
-                return
-        except Exception:
-            pass
-        page.wait_for_timeout(step)
-        waited += step
-
-    raise PWTimeoutError("Locator visible pero no habilitado a tiempo")
+    with waiting():
+        locator.wait_for(state="visible", timeout=timeout_ms)
+        # espera el estado "enabled" dentro del navegador, sin polling desde Python
+        locator.element_handle(timeout=timeout_ms).wait_for_element_state("enabled", timeout=timeout_ms)
+
+
+# ----- | READINESS | -----
+def wait_until_resolved(page, resolve, selector: str, must_contain_selector: str | None = None, visible: bool = False, timeout_ms: int = 10_000, slice_ms: int = 2_000):
+    """
+    Espera (en el navegador) a que `selector` exista y luego llama a `resolve()` para obtener el locator.
+    `resolve` debe retornar algo truthy cuando el elemento está listo.
+    Cada `slice_ms` se vuelve a llamar `resolve()` igual, por si el elemento vive en un iframe de otro origen.
+    """
+    deadline = monotonic() + timeout_ms / 1000
+
+    with waiting():
+        while True:
+            remaining = int((deadline - monotonic()) * 1000)
+            if remaining > 0:
+                try:
+                    page.wait_for_function(DOM_READY_JS, arg=[selector, must_contain_selector, visible], timeout=min(remaining, slice_ms))
+                except Exception:
+                    # timeout de la ventana o navegación en curso
+                    pass
+
+            found = resolve()
+            if found:
+                return found
+
+            if monotonic() >= deadline:
+                raise PWTimeoutError(f"Timeout esperando: {selector} (must_contain={must_contain_selector})")
+
+def wait_in_all_frames(page, css_selector: str, timeout_ms: int = 10_000):
+    """ Igual que find_in_all_frames pero espera a que el selector aparezca. Retorna (locator, frame) """
+    def resolve():
+        locator, frame = find_in_all_frames(page, css_selector)
+        return (locator, frame) if locator else None
+
+    return wait_until_resolved(page, resolve, css_selector, timeout_ms=timeout_ms)
 
 
 def smart_click(locator, frame=None, expect_nav: bool = False, nav_timeout_ms: int = 30_000):
@@ -106,38 +175,42 @@ def smart_click(locator, frame=None, expect_nav: bool = False, nav_timeout_ms: i
 def get_visible_popup(page, popup_selector, must_contain_selector: None):
 
     for fr in page.frames:
-        popups = fr.locator(popup_selector)
+        p = get_visible_popup_in_frame(fr, popup_selector, must_contain_selector)
+        if p:
+            return p
+
+    return None
+
+def get_visible_popup_in_frame(frame, popup_selector, must_contain_selector: None):
+    popups = frame.locator(popup_selector)
+    try:
+        count = popups.count()
+    except Exception:
+        return None
+
+    for i in range(count):
+        p = popups.nth(i)
         try:
-            count = popups.count()
+            if not p.is_visible():
+                continue
+            if must_contain_selector and p.locator(must_contain_selector).count() == 0:
+                continue
+            return p
         except Exception:
             continue
 
-        for i in range(count):
-            p = popups.nth(i)
-            try:
-                if not p.is_visible():
-                    continue
-                if must_contain_selector and p.locator(must_contain_selector).count() == 0:
-                    continue
-                return p
-            except Exception:
-                continue
-
     return None
 
-def wait_visible_popup(page, popup_selector, must_contain_selector: None, timeout_ms: int = 10_000, step_ms: int = 200):
-    waited = 0
-    while waited < timeout_ms:
-        p = get_visible_popup(page, popup_selector, must_contain_selector)
-        if p:
-            return p
-        page.wait_for_timeout(step_ms)
-        waited += step_ms
+def wait_visible_popup(page, popup_selector, must_contain_selector: None, timeout_ms: int = 10_000, frame=None):
+    """ Si se indica `frame` (donde se hizo click) se busca ahí primero, luego en todos los frames """
+    def resolve():
+        if frame is not None:
+            p = get_visible_popup_in_frame(frame, popup_selector, must_contain_selector)
+            if p:
+                return p
+        return get_visible_popup(page, popup_selector, must_contain_selector)
 
-    raise PWTimeoutError(
-        f"Timeout esperando popup visible: {popup_selector} "
-        f"(must_contain={must_contain_selector})"
-    )
+    return wait_until_resolved(page, resolve, popup_selector, must_contain_selector=must_contain_selector, visible=True, timeout_ms=timeout_ms)
 
 def get_label_popup_txt(page, popup_selector: str, label_selector: str, timeout_ms: int = 10_000):
     popup = wait_visible_popup(page, popup_selector, must_contain_selector=label_selector, timeout_ms=timeout_ms)
@@ -154,86 +227,115 @@ def get_label_txt(page, selector: str, timeout_ms: int = 10_000):
     if not locator:
         raise RuntimeError(f"No se encontró el elemento: {selector}")
 
-    locator.wait_for(state="visible", timeout=timeout_ms)
+    with waiting():
+        locator.wait_for(state="visible", timeout=timeout_ms)
     txt = locator.inner_text().strip()
     return txt
 
 def select_popup_option_by_text(popup, option_selector: str, target_text: str, timeout_ms: int = 10_000):
     opts = popup.locator(option_selector)
-    opts.first.wait_for(state="visible", timeout=timeout_ms)
+    with waiting():
+        opts.first.wait_for(state="visible", timeout=timeout_ms)
 
-    count = opts.count()
-    for i in range(count):
-        c = opts.nth(i)
-        try:
-            if c.is_visible() and c.inner_text().strip() == target_text:
-                c.click()
-                return True
-        except Exception:
-            continue
-
-    raise RuntimeError(f"No se encontró la opción '{target_text}' en el popup ({option_selector}).")
-
-def parse_month_year_es(text: str) -> tuple[int, int]:
-    t = (text or "").strip().lower()
-    parts = [p.strip() for p in t.split(" de ")]
-    if len(parts) != 2:
-        raise RuntimeError(f"No pude parsear mes/año desde: '{text}'")
+    # el filtro por texto exacto corre en el navegador: un round trip en vez de uno por opción
+    exact = re.compile(rf"^\s*{re.escape(target_text)}\s*$")
+    opt = opts.filter(has_text=exact, visible=True).first
+    if opt.count() == 0:
+        raise RuntimeError(f"No se encontró la opción '{target_text}' en el popup ({option_selector}).")
 
-    month_name, year_str = parts
-    if month_name not in MONTHS_ES_INV:
-        raise RuntimeError(f"Mes no reconocido: '{month_name}' en '{text}'")
-
-    return int(year_str), MONTHS_ES_INV[month_name]
+    opt.click()
+    return True
 
 def select_popup_option_by_attr_contains(popup, attr: str, needle: str, timeout_ms: int = 10_000, case_insensitive: bool = True):
-    wanted = (needle or "").strip()
-    if not wanted:
-        raise RuntimeError("needle vacío")
-
-    # 👇 si el atributo tiene ":", usar name()='paw:label'
-    if ":" in attr:
-        attr_expr = f"@*[name()='{attr}']"
-    else:
-        attr_expr = f"@{attr}"
-
-    if case_insensitive:
-        xp = (
-            "xpath=.//div[contains(@class,'pawOpt') and not(@id='pawIdNull') and "
-            f"contains(translate({attr_expr}, "
-            "'ABCDEFGHIJKLMNOPQRSTUVWXYZÁÉÍÓÚÜÑ', "
-            "'abcdefghijklmnopqrstuvwxyzáéíóúüñ'), "
-            f"'{wanted.lower()}')]"
-        )
-    else:
-        xp = (
-            "xpath=.//div[contains(@class,'pawOpt') and not(@id='pawIdNull') and "
-            f"contains({attr_expr}, '{wanted}')]"
-        )
+    xp = popup_option_attr_xpath(attr, needle, case_insensitive)
 
     opt = popup.locator(xp).first
-    opt.wait_for(state="visible", timeout=timeout_ms)
+    with waiting():
+        opt.wait_for(state="visible", timeout=timeout_ms)
     opt.click(timeout=timeout_ms)
     return True
 
+def set_datefield_text(page, field_selector: str, text: str, timeout_ms: int = 5_000) -> bool:
+    """
+    Intenta escribir la fecha directamente en el widget:
+    1) setter propio del widget (si lo expone)
+    2) escribiendo en su input editable
+    Retorna True solo si el widget quedó con `text` para enviar (su getter o sus inputs con name).
+    """
+    locator, frame = find_in_all_frames(page, field_selector)
+    if not locator:
+        return False
+
+    try:
+        if frame.evaluate(DATEFIELD_SETTER_JS, [field_selector, text]):
+            return True
+    except Exception:
+        pass
+
+    inp = frame.locator(f"{field_selector} input:not([type=hidden])").first
+    try:
+        if inp.count() == 0 or not inp.is_editable():
+            return False
+        inp.fill(text, timeout=timeout_ms)
+        inp.press("Tab")
+        return frame.evaluate(DATEFIELD_HOLDS_JS, [field_selector, text])
+    except Exception:
+        return False
+
+
+def capture_fields(page, selectors: list[str]) -> dict | None:
+    """ Snapshot {selector: valor del widget/inputs enviados}. None si falta alguno o no expone getter/setter """
+    snaps = {}
+    for frame, group in _group_by_frame(page, selectors):
+        if frame is None:
+            return None
+        try:
+            values = frame.evaluate(FIELDS_CAPTURE_JS, group)
+        except Exception:
+            return None
+        if any(v is None for v in values):
+            return None
+        snaps.update(zip(group, values))
+    return snaps
+
+def replay_fields(page, snaps: dict) -> bool:
+    """
+    Re-aplica un snapshot de capture_fields con el setter de cada widget y verifica con una captura nueva:
+    el valor del widget y los inputs que envía el formulario solo coinciden si el widget aplicó el valor.
+    """
+    try:
+        for frame, group in _group_by_frame(page, list(snaps)):
+            if frame is None:
+                return False
+            if not all(frame.evaluate(FIELDS_REPLAY_JS, [[sel, snaps[sel]] for sel in group])):
+                return False
+
+        return capture_fields(page, list(snaps)) == snaps
+    except Exception:
+        return False
+
+def _group_by_frame(page, selectors: list[str]):
+    frames, groups = {}, {}
+    for sel in selectors:
+        _, frame = find_in_all_frames(page, sel)
+        key = id(frame) if frame else None
+        frames[key] = frame
+        groups.setdefault(key, []).append(sel)
+    return [(frames[key], group) for key, group in groups.items()]
 
 
 # Popup con label
 def get_tree_popup(frame, root_label: str, timeout=20_000):
-    popup = frame.locator('css=div[paw\\:ctrl="pawTree"].pawTreePopup:visible').first
-    popup.wait_for(state="visible", timeout=timeout)
+    popup = frame.locator(TREE_POPUP).first
+    with waiting():
+        popup.wait_for(state="visible", timeout=timeout)
 
-    popup.locator('css=span.pawTreeNodeLabel', has_text=root_label).first.wait_for(
-        state="visible", timeout=timeout
-    )
+        popup.locator(TREE_NODE_LABEL, has_text=root_label).first.wait_for(
+            state="visible", timeout=timeout
+        )
     return popup
 
-def tree_header_by_label(popup, label: str):
-    return popup.locator('xpath=.//div[contains(@class,"pawTreeNodeHeader")]'f'[.//span[contains(@class,"pawTreeNodeLabel")][normalize-space(.)="{label}"]]').first
-
-def tree_expand(page, popup, label: str, timeout=20_000):
-    header = tree_header_by_label(popup, label)
-    header.wait_for(state="visible", timeout=timeout)
+def tree_expand(header, timeout=20_000):
     header.scroll_into_view_if_needed()
 
     exp = header.locator("css=img#pawExp").first
@@ -242,18 +344,66 @@ def tree_expand(page, popup, label: str, timeout=20_000):
         exp.click()
     else:
         header.click()
+    # no se duerme: los hijos cargan al expandir y el siguiente nivel los espera (_tree_level_header)
 
-    page.wait_for_timeout(200)
-
-def tree_click_leaf(page, popup, label: str, timeout=20_000):
-    header = tree_header_by_label(popup, label)
-    header.wait_for(state="visible", timeout=timeout)
+def tree_click_leaf(popup, header):
     header.scroll_into_view_if_needed()
     header.click()
-    page.wait_for_timeout(200)
 
-def tree_wait_label_visible(popup, label: str, timeout=20_000):
-    popup.locator("css=span.pawTreeNodeLabel", has_text=label).first.wait_for(state="visible", timeout=timeout)
+    # al elegir la hoja el popup se cierra
+    try:
+        with waiting():
+            popup.wait_for(state="hidden", timeout=5_000)
+    except PWTimeoutError:
+        pass
+
+def tree_select_path(page, popup, labels: list[str], cache=None, cache_key: str | None = None, timeout=20_000) -> bool:
+    """
+    Expande labels[:-1] y elige labels[-1]. El árbol carga los hijos recién al expandir: se baja nivel por nivel
+    esperando cada nodo. Con cache, cada nivel se ubica por el id guardado (ancestros y hoja) en vez de buscarlo
+    por texto; si un id ya no está, ese nivel se busca por label y la entrada se actualiza una vez.
+    Retorna True si toda la ruta salió del cache.
+    """
+    entry = cache.get(cache_key) if cache else None
+    cached = entry["nodes"] if entry and len(entry.get("nodes", [])) == len(labels) else [None] * len(labels)
+
+    nodes = []
+    for depth, (label, node) in enumerate(zip(labels, cached)):
+        header, node = _tree_level_header(popup, label, node, timeout)
+        nodes.append(node)
+
+        if depth < len(labels) - 1:
+            tree_expand(header, timeout=timeout)
+        else:
+            tree_click_leaf(popup, header)
+
+    hit = None not in cached and nodes == cached
+    if cache:
+        cache.count(hit)
+        if not hit and all(nodes):
+            cache.set(cache_key, {"nodes": nodes})
+    return hit
+
+def _tree_level_header(popup, label: str, node: dict | None, timeout: int):
+    """ Header de un nivel de la ruta y su nodo: por el id cacheado si sigue en el árbol, si no por label """
+    by_label = tree_header_by_label(popup, label)
+
+    if node:
+        by_id = tree_node_header(popup, node)
+        # el nivel recién se carga al expandir el anterior: se espera el id o, si cambió, el label
+        with waiting():
+            by_id.or_(by_label).first.wait_for(state="visible", timeout=timeout)
+        if by_id.count() and by_id.locator(TREE_NODE_LABEL).first.inner_text().strip() == label:
+            return by_id, node
+
+    with waiting():
+        by_label.wait_for(state="visible", timeout=timeout)
+
+    try:
+        found = by_label.evaluate(TREE_NODE_JS)
+    except Exception:
+        found = None
+    return by_label, found if found and found.get("label") == label else None
 
 def click_radio_btn(page, row_id: str, timeout=10_000):
     loc, fr = find_in_all_frames(page, f"tr#{row_id}")
@@ -261,5 +411,4 @@ def click_radio_btn(page, row_id: str, timeout=10_000):
         raise RuntimeError(f"No se encontró el img-cycler tr#{row_id}")
     loc.wait_for(state="visible", timeout=timeout)
     smart_click(loc, frame=fr, expect_nav=False)
-    page.wait_for_timeout(200)
     return fr
\ No newline at end of file
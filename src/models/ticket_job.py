@@ -1,11 +1,21 @@
+from dataclasses import dataclass
 from datetime import date, time
 
+
+@dataclass(slots=True, eq=False)
 class TicketJob:
-    def __init__(self, data: dict, row_id: int):
-        self.row_id = row_id
-        self.data = data
-        self.status = "PENDING"
-        self.ticket_id = None
-        self.error = None
-
-        self.creation_dt_text: str | None = None
\ No newline at end of file
+    """
+    Fila pendiente de la planilla. FECHA y HORA ya vienen como date/time desde
+    normalize_fecha_hora_polars, así que los controladores no vuelven a parsear texto.
+    """
+    row_id: int
+    fecha: date | None = None
+    hora: time | None = None
+    problema: str = ""
+    solucion: str | None = None
+
+    status: str = "PENDING"
+    ticket_id: str | None = None
+    error: str | None = None
+
+    creation_dt_text: str | None = None
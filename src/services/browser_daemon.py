@@ -0,0 +1,171 @@
+"""
+Navegador residente para ProactivaNet.
+Mantiene un Chromium abierto (perfil persistente + sesión iniciada) con el puerto CDP habilitado;
+WebController se conecta con connect_over_cdp en vez de lanzar un navegador nuevo en cada ejecución.
+
+    python -m src.services.browser_daemon start    # lo deja corriendo en segundo plano
+    python -m src.services.browser_daemon status
+    python -m src.services.browser_daemon stop
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+from src.config import (
+    URL_PROACTIVA,
+    WEB_STORAGE_DIR,
+    BROWSER_DAEMON_PORT,
+    BROWSER_DAEMON_PROFILE_DIR,
+)
+
+
+DAEMON_INFO_PATH = WEB_STORAGE_DIR / "browser_daemon.json"
+
+
+# =========================
+# CLIENTE
+# =========================
+def daemon_endpoint(timeout: float = 0.5) -> str | None:
+    """ Endpoint CDP del navegador residente si está vivo; None si no hay daemon """
+    info = _read_info()
+    if not info:
+        return None
+
+    endpoint = f"http://127.0.0.1:{info['port']}"
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            if response.status == 200:
+                return endpoint
+    except Exception:
+        pass
+
+    return None
+
+def start_daemon_process(port: int = BROWSER_DAEMON_PORT, wait_s: float = 300) -> str:
+    """ Lanza el daemon en un proceso aparte y espera a que el login esté listo """
+    endpoint = daemon_endpoint()
+    if endpoint:
+        return endpoint
+
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+
+    subprocess.Popen(
+        [sys.executable, "-m", "src.services.browser_daemon", "run", "--port", str(port)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        **kwargs
+    )
+
+    # el archivo de info se escribe recién con la sesión iniciada (puede incluir login/MFA manual)
+    deadline = time.monotonic() + wait_s
+    while time.monotonic() < deadline:
+        endpoint = daemon_endpoint()
+        if endpoint:
+            return endpoint
+        time.sleep(0.5)
+
+    raise RuntimeError("El navegador residente no quedó listo a tiempo")
+
+def stop_daemon() -> bool:
+    endpoint = daemon_endpoint()
+    if not endpoint:
+        DAEMON_INFO_PATH.unlink(missing_ok=True)
+        return False
+
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.connect_over_cdp(endpoint)
+        # browser.close() solo desconecta a un cliente CDP; Browser.close cierra el proceso
+        browser.new_browser_cdp_session().send("Browser.close")
+
+    return True
+
+def _read_info() -> dict | None:
+    if not DAEMON_INFO_PATH.exists():
+        return None
+    try:
+        with open(DAEMON_INFO_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+# =========================
+# DAEMON
+# =========================
+def run_daemon(port: int = BROWSER_DAEMON_PORT):
+    from playwright.sync_api import sync_playwright
+    from src.helpers.web_helpers import get_default_browser, wait_in_all_frames, wait_visible_enabled
+
+    state_path = WEB_STORAGE_DIR / "proactiva_storage_state.json"
+    BROWSER_DAEMON_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+    with sync_playwright() as p:
+        context = p.chromium.launch_persistent_context(
+            str(BROWSER_DAEMON_PROFILE_DIR),
+            channel=get_default_browser(),
+            headless=False,
+            no_viewport=True,
+            args=[
+                f"--remote-debugging-port={port}",
+                "--start-maximized",
+                "--disable-blink-features=AutomationControlled",
+            ],
+        )
+
+        # siembra el perfil con la sesión guardada por WebController
+        if state_path.exists():
+            with open(state_path, "r", encoding="utf-8") as f:
+                cookies = json.load(f).get("cookies", [])
+            if cookies:
+                context.add_cookies(cookies)
+
+        page = context.pages[0] if context.pages else context.new_page()
+        page.goto(URL_PROACTIVA, wait_until="domcontentloaded", timeout=60_000)
+
+        print("🔐 Esperando login del usuario (manual si aplica)...")
+        locator, _ = wait_in_all_frames(page, "#newIncident", timeout_ms=300_000)
+        wait_visible_enabled(page, locator, timeout_ms=10_000)
+        context.storage_state(path=str(state_path))
+
+        WEB_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(DAEMON_INFO_PATH, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "port": port, "started_at": time.time()}, f, indent=2)
+
+        print(f"🟢 Navegador residente listo en http://127.0.0.1:{port}")
+        try:
+            # hasta que se cierre el navegador (stop o a mano)
+            context.wait_for_event("close", timeout=0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            DAEMON_INFO_PATH.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Navegador residente de ProactivaNet (CDP)")
+    parser.add_argument("command", choices=["run", "start", "stop", "status"])
+    parser.add_argument("--port", type=int, default=BROWSER_DAEMON_PORT)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run_daemon(args.port)
+    elif args.command == "start":
+        print(f"🟢 Navegador residente: {start_daemon_process(args.port)}")
+    elif args.command == "stop":
+        print("🛑 Navegador residente cerrado" if stop_daemon() else "No hay navegador residente")
+    else:
+        endpoint = daemon_endpoint()
+        print(f"🟢 {endpoint}" if endpoint else "⚪ No hay navegador residente")
+
+
+if __name__ == "__main__":
+    main()
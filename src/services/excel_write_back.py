@@ -0,0 +1,265 @@
+import json
+import os
+import queue
+import threading
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, time
+from io import BytesIO
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from src.utils.context_manager import timed
+
+
+@dataclass
+class CellEdit:
+    row: int
+    column: int
+    value: object
+    number_format: str | None = None
+    message: str | None = None
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        value = self.value
+        # FECHA/HORA: se guarda el tipo para reconstruir la celda igual al re-aplicar
+        if isinstance(value, (date, time)):
+            data["value"] = value.isoformat()
+            data["kind"] = "datetime" if isinstance(value, datetime) else "date" if isinstance(value, date) else "time"
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> "CellEdit":
+        data = json.loads(line)
+        kind = data.pop("kind", None)
+        if kind == "datetime":
+            data["value"] = datetime.fromisoformat(data["value"])
+        elif kind == "date":
+            data["value"] = date.fromisoformat(data["value"])
+        elif kind == "time":
+            data["value"] = time.fromisoformat(data["value"])
+        return cls(**data)
+
+
+class ExcelWriteBack:
+    """
+    Journal de ediciones de celdas (FECHA, HORA, TICKET).
+    Un hilo escritor mantiene el workbook abierto, aplica las ediciones en memoria
+    y guarda en disco cada `flush_every` jobs, así el loop web no espera al disco.
+
+    Con `journal_path` cada edición queda además en un archivo (una línea JSON) hasta que un guardado
+    la incluye: si el Excel no se puede guardar (abierto en Excel, cierre inesperado) las ediciones
+    se re-aplican al abrir la planilla en la próxima ejecución, aunque sus filas ya estén CREATED.
+    """
+    def __init__(self, excel_path: Path, flush_every: int = 10, journal_path: Path | None = None):
+        self.excel_path = excel_path
+        self.flush_every = max(1, flush_every)
+        self.journal_path = journal_path
+
+        self._queue = queue.Queue()
+        self._wb = None
+        self._dirty = False
+        self._jobs_since_save = 0
+        self._error: Exception | None = None
+
+        # el journal y la cola se escriben bajo el mismo lock: las líneas quedan en el orden en que se aplican
+        self._journal_lock = threading.Lock()
+        self._journal = None
+        # ediciones del journal ya aplicadas al workbook en memoria (se descartan del archivo al guardar);
+        # si alguna falló ya no se sabe qué líneas sobran: el journal queda entero hasta la próxima ejecución
+        # (re-aplicar es idempotente, _apply no pisa celdas escritas)
+        self._applied_since_save = 0
+        self._apply_failed = False
+
+        self._replay_journal()
+
+        self._thread = threading.Thread(target=self._run, name="excel-writer", daemon=True)
+        self._thread.start()
+
+    # =========================
+    # API
+    # =========================
+    def put(self, edit: CellEdit):
+        with self._journal_lock:
+            self._append_journal(edit)
+            self._queue.put(("edit", edit))
+
+    def job_done(self):
+        """ Marca el fin de un job; cada `flush_every` jobs se guarda el archivo """
+        self._queue.put(("job", None))
+
+    def flush(self):
+        """ Bloquea hasta que todas las ediciones encoladas estén guardadas """
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait()
+        self._raise_error()
+
+    def close(self):
+        if not self._thread.is_alive():
+            self._raise_error()
+            return
+
+        done = threading.Event()
+        self._queue.put(("close", done))
+        done.wait()
+        self._thread.join()
+        self._raise_error()
+
+    # =========================
+    # HILO ESCRITOR
+    # =========================
+    def _run(self):
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind == "edit":
+                    self._apply(payload)
+                    self._applied_since_save += 1
+                elif kind == "job":
+                    self._jobs_since_save += 1
+                    if self._jobs_since_save >= self.flush_every:
+                        self._save()
+                elif kind in ("flush", "close"):
+                    self._save()
+            except Exception as e:
+                # se avisa ya y se reporta en el próximo flush/close; el hilo sigue vivo y las ediciones
+                # siguen en memoria y en el journal para el próximo guardado
+                self._error = e
+                if kind == "edit":
+                    self._apply_failed = True
+                else:
+                    print(f"⚠️ No se pudo guardar {self.excel_path.name}, se reintenta en el próximo guardado: {e}")
+            finally:
+                if kind in ("flush", "close"):
+                    payload.set()
+
+            if kind == "close":
+                self._wb = None
+                self._close_journal()
+                return
+
+    def _apply(self, edit: CellEdit):
+        if self._wb is None:
+            with timed("excel.open_workbook"):
+                self._wb = load_workbook(self.excel_path)
+
+        ws = self._wb.worksheets[0]
+        cell = ws.cell(row=edit.row, column=edit.column)
+
+        if cell.value not in (None, "", "NONE"):
+            return
+
+        if edit.message:
+            print(edit.message)
+
+        cell.value = edit.value
+
+        # Mantiene fill/border/font/alignment (destino).
+        # Ajusta SOLO el formato numérico si está en General:
+        if edit.number_format and cell.number_format in (None, "", "General"):
+            cell.number_format = edit.number_format
+
+        self._dirty = True
+
+    def _save(self):
+        self._jobs_since_save = 0
+        if self._dirty:
+            with timed("excel.save"):
+                _rewind_images(self._wb)
+                self._wb.save(self.excel_path)
+            self._dirty = False
+            print(f"💾 Excel guardado: {self.excel_path.name}")
+
+        # también sin cambios: las ediciones saltadas (celda ya escrita) ya están en el archivo
+        self._compact_journal()
+
+    def _raise_error(self):
+        if self._error:
+            error, self._error = self._error, None
+            pending = f" (las ediciones pendientes quedan en {self.journal_path.name})" if self.journal_path else ""
+            raise RuntimeError(f"No se pudo guardar el Excel: {error}{pending}") from error
+
+    # =========================
+    # JOURNAL DE EDICIONES
+    # =========================
+    def _replay_journal(self):
+        """ Encola las ediciones que no alcanzaron a guardarse en una ejecución anterior """
+        if not self.journal_path or not self.journal_path.exists():
+            return
+
+        edits = []
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    edits.append(CellEdit.from_json(line))
+                except (json.JSONDecodeError, TypeError, ValueError):
+                    # última línea a medio escribir
+                    break
+
+        # se reescribe sin la línea cortada; las ediciones ya están en el archivo, no se vuelven a anotar
+        self._rewrite_journal(edits)
+        for edit in edits:
+            self._queue.put(("edit", edit))
+
+        if edits:
+            print(f"♻️ Re-aplicando {len(edits)} ediciones pendientes de {self.journal_path.name}")
+
+    def _append_journal(self, edit: CellEdit):
+        if not self.journal_path:
+            return
+
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+        self._journal.write(edit.to_json() + "\n")
+        self._journal.flush()
+
+    def _compact_journal(self):
+        """ Tras guardar: saca del journal las ediciones que ya están en el archivo """
+        applied, self._applied_since_save = self._applied_since_save, 0
+        if not self.journal_path or not applied or self._apply_failed:
+            return
+
+        with self._journal_lock:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            self._rewrite_journal(lines[applied:])
+
+    def _rewrite_journal(self, entries: list):
+        """ Reemplaza el journal (atómico) por `entries` (CellEdit o líneas ya serializadas); vacío = se borra """
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+
+        if not entries:
+            self.journal_path.unlink(missing_ok=True)
+            return
+
+        tmp_path = self.journal_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(entry if isinstance(entry, str) else entry.to_json() + "\n")
+        os.replace(tmp_path, self.journal_path)
+
+    def _close_journal(self):
+        with self._journal_lock:
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+
+
+def _rewind_images(wb):
+    """ openpyxl cierra el buffer de cada imagen al guardar: se renueva para poder guardar el mismo libro varias veces """
+    for ws in wb.worksheets:
+        for img in ws._images:
+            data = getattr(img, "_saved_bytes", None)
+            if data is None:
+                data = img._data()
+                img._saved_bytes = data
+            img.ref = BytesIO(data)
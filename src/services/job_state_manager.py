@@ -1,28 +1,65 @@
+import threading
+
+import polars as pl
+
 from src.utils.state_store import StateStore
+from src.utils.sqlite_state_store import SqliteStateStore
 from src.models.ticket_job import TicketJob
+from src.utils.context_manager import timed
+from src.config import STATE_BACKEND
+
+
+# tabla de estado para hidratar los jobs con un join (ver MainController._hydrate_jobs)
+STATE_SCHEMA = {
+    "row_id": pl.Int64,
+    "status": pl.Utf8,
+    "ticket_id": pl.Utf8,
+    "error": pl.Utf8,
+}
+
+STATE_BACKENDS = {
+    "json": StateStore,
+    "sqlite": SqliteStateStore,
+}
 
 
 class JobStateManager:
-    def __init__(self, excel_path):
-        self.store = StateStore(excel_path)
+    def __init__(self, excel_path, backend: str | None = None, states_dir=None):
+        backend = backend or STATE_BACKEND
+        if backend not in STATE_BACKENDS:
+            raise ValueError(f"Backend de estado no soportado: {backend}")
+
+        self.store = STATE_BACKENDS[backend](excel_path, states_dir=states_dir)
+        # los workers del pool comparten este manager
+        self._lock = threading.RLock()
 
     def mark_in_progress(self, job):
-        job.status = "IN_PROGRESS"
-        self.store.set_job(job.row_id, job.status)
+        with self._lock, timed("state.mark_in_progress"):
+            job.status = "IN_PROGRESS"
+            self.store.set_job(job.row_id, job.status)
 
     def mark_created(self, job, ticket_id):
-        job.status = "CREATED"
-        job.ticket_id = ticket_id
-        self.store.set_job(job.row_id, job.status, ticket_id=ticket_id)
+        with self._lock, timed("state.mark_created"):
+            job.status = "CREATED"
+            job.ticket_id = ticket_id
+            self.store.set_job(job.row_id, job.status, ticket_id=ticket_id)
 
     def mark_failed(self, job, error):
-        job.status = "FAILED"
-        job.error = error
-        self.store.set_job(job.row_id, job.status, error=error)
-
-    def hydrate_job(self, job):
-        stored = self.store.get_job(job.row_id)
-        if stored:
-            job.status = stored["status"]
-            job.ticket_id = stored.get("ticket_id")
-            job.error = stored.get("error")
+        with self._lock, timed("state.mark_failed"):
+            job.status = "FAILED"
+            job.error = error
+            self.store.set_job(job.row_id, job.status, error=error)
+
+    def close(self):
+        with self._lock, timed("state.close"):
+            self.store.close()
+
+    def state_frame(self) -> pl.DataFrame:
+        """ Estado guardado de todas las filas de la planilla como DataFrame (row_id, status, ticket_id, error) """
+        with self._lock:
+            jobs = self.store.get_jobs()
+
+        return pl.DataFrame(
+            {col: [job.get(col) for job in jobs] for col in STATE_SCHEMA},
+            schema=STATE_SCHEMA
+        )
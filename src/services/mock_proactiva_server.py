@@ -0,0 +1,312 @@
+"""
+Servidor local que imita ProactivaNet para desarrollar y medir sin red:
+- los endpoints JSON que usa HttpBackend
+- un sitio con los mismos widgets paw (calendario, selectores, árboles, #newIncident en iframe)
+  que recorre WebController; sus popups piden datos a /mock/api/* con latencia configurable
+
+    python -m src.services.mock_proactiva_server --port 8765 --latency-ms 150 --widget-latency-ms 80
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+from src.helpers.datetime_helpers import WEB_CREATION_FMT
+from src.config import (
+    ASSETS_DIR,
+    URL_PROACTIVA,
+    HTTP_INCIDENTS_PATH,
+    MOCK_SERVER_PORT,
+    DEFAULT_REPORT_USER,
+    DEFAULT_JOB_GROUP,
+)
+
+
+# mismo nombre que la cookie de autenticación real (ver session_helpers.AUTH_COOKIE_PREFIX)
+MOCK_SESSION_COOKIE = "pawAuthCookie"
+MOCK_SITE_DIR = ASSETS_DIR / "mock_proactiva"
+MOCK_USER_LABEL = "Técnico Mock"
+
+# datos de los widgets (mismos textos que recorre WebController)
+MOCK_OPTIONS = {
+    "panUsers_idSource": [
+        {"id": "u1", "label": "Carlos Higuera", "completeview": f"UNAB\\{DEFAULT_REPORT_USER}"},
+        {"id": "u2", "label": "Ana Pérez", "completeview": "UNAB\\aperez"},
+    ],
+    "padTypes_id": [
+        {"id": "t1", "label": "Incidencia"},
+        {"id": "t2", "label": "Solicitud de Servicio"},
+        {"id": "t3", "label": "Consulta"},
+    ],
+    "pawSvcAuthGroups_id": [
+        {"id": "g1", "label": DEFAULT_JOB_GROUP},
+        {"id": "g2", "label": "Soporte Terreno Casona"},
+    ],
+    "pawSvcAuthUsers_idResponsible": [
+        {"id": "r1", "label": MOCK_USER_LABEL},
+        {"id": "r2", "label": "Otro Técnico"},
+    ],
+}
+
+MOCK_TREES = {
+    "padPortfolio_id": {"label": "Servicio", "children": [
+        {"label": "Servicios TI", "children": [
+            {"label": "Computadores e Impresoras", "children": [{"label": "Computadores"}, {"label": "Impresoras"}]},
+            {"label": "Redes y Conectividad", "children": [{"label": "WiFi"}]},
+        ]},
+        {"label": "Servicios Generales", "children": [{"label": "Mobiliario"}]},
+    ]},
+    "padCategories_id": {"label": "Categorías", "children": [
+        {"label": "Mantención de Equipos"},
+        {"label": "Instalación de Software"},
+    ]},
+}
+
+
+class MockProactivaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = MOCK_SERVER_PORT, latency_ms: int = 0, item_latency_ms: int = 0, host: str = "127.0.0.1",
+                 page_latency_ms: int = 0, widget_latency_ms: int = 0, direct_date: bool = True, widget_api: str = "model"):
+        super().__init__((host, port), MockProactivaHandler)
+        # API: latencia fija por request + latencia por incidencia creada
+        self.latency_ms = latency_ms
+        self.item_latency_ms = item_latency_ms
+        # sitio: latencia de cada página y de cada dato que pide un popup
+        self.page_latency_ms = page_latency_ms
+        self.widget_latency_ms = widget_latency_ms
+        # expone setValue en #creationDate (vía rápida de ensure_creation_datetime)
+        self.direct_date = direct_date
+        # getValue/setValue de los widgets: "model" | "ignore" (setter que no aplica nada) | "none"
+        self.widget_api = widget_api
+
+        self.incidents: list[dict] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def site_url(self) -> str:
+        """ Equivalente local de URL_PROACTIVA (se usa como url de WebController) """
+        return self.url + urlsplit(URL_PROACTIVA).path
+
+    def start_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="mock-proactiva", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def write_storage_state(self, path: Path) -> Path:
+        """ storage_state con una cookie de sesión válida para este servidor """
+        host = self.server_address[0]
+        state = {
+            "cookies": [{
+                "name": MOCK_SESSION_COOKIE,
+                "value": "mock",
+                "domain": host,
+                "path": "/",
+                "expires": time.time() + 3600,
+                "httpOnly": True,
+                "secure": False,
+                "sameSite": "Lax"
+            }],
+            "origins": []
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        return path
+
+    def create_incident(self, payload: dict) -> dict:
+        if self.item_latency_ms:
+            time.sleep(self.item_latency_ms / 1000)
+
+        if not (payload.get("title") or "").strip():
+            return {"error": "Título vacío"}
+
+        creation_date = payload.get("creation_date") or datetime.now().strftime(WEB_CREATION_FMT)
+        with self._lock:
+            ticket_id = f"REQ-MOCK-{next(self._ids):06d}"
+            self.incidents.append({**payload, "ticket_id": ticket_id, "creation_date": creation_date})
+
+        return {"ticket_id": ticket_id, "creation_date": creation_date}
+
+
+class MockProactivaHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 para que el cliente pueda reutilizar la conexión (keep-alive)
+    protocol_version = "HTTP/1.1"
+    server: MockProactivaServer
+
+    def do_POST(self):
+        payload = self._read_json()
+        if not self._authorized():
+            return self._send_json(401, {"error": "Sesión no válida"})
+
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+
+        if self.path == HTTP_INCIDENTS_PATH:
+            return self._send_json(201, self.server.create_incident(payload))
+
+        if self.path == f"{HTTP_INCIDENTS_PATH}/batch":
+            return self._send_json(200, [self.server.create_incident(p) for p in payload])
+
+        self._send_json(404, {"error": f"Ruta no encontrada: {self.path}"})
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path, query = parts.path, {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+        if path == HTTP_INCIDENTS_PATH:
+            with self.server._lock:
+                incidents = list(self.server.incidents)
+            return self._send_json(200, incidents)
+
+        if path == urlsplit(URL_PROACTIVA).path:
+            frame_src = "/mock/home.html" if self._authorized() else "/mock/login.html"
+            return self._send_page("default.html", frame_src=frame_src)
+
+        if path in ("/mock/home.html", "/mock/login.html", "/mock/incident.html"):
+            if path != "/mock/login.html" and not self._authorized():
+                return self._send_page("login.html")
+            return self._send_page(path.rsplit("/", 1)[1], user_label=MOCK_USER_LABEL)
+
+        if path == "/mock/config.js":
+            config = json.dumps({"directDate": self.server.direct_date, "widgetApi": self.server.widget_api})
+            return self._send_body(200, f"window.PAW_MOCK = {config};".encode("utf-8"), "application/javascript")
+
+        if path in ("/mock/paw_mock.js", "/mock/paw_mock.css"):
+            content_type = "application/javascript" if path.endswith(".js") else "text/css"
+            return self._send_body(200, (MOCK_SITE_DIR / path.rsplit("/", 1)[1]).read_bytes(), content_type)
+
+        if path.startswith("/mock/api/"):
+            return self._send_widget_api(path.removeprefix("/mock/api/"), query)
+
+        self._send_json(404, {"error": f"Ruta no encontrada: {self.path}"})
+
+    # =========================
+    # SITIO MOCK
+    # =========================
+    def _send_page(self, name: str, **values):
+        if self.server.page_latency_ms:
+            time.sleep(self.server.page_latency_ms / 1000)
+
+        html = (MOCK_SITE_DIR / name).read_text(encoding="utf-8")
+        for key, value in values.items():
+            html = html.replace("{{" + key + "}}", value)
+        self._send_body(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _send_widget_api(self, name: str, query: dict):
+        if not self._authorized():
+            return self._send_json(401, {"error": "Sesión no válida"})
+
+        if self.server.widget_latency_ms:
+            time.sleep(self.server.widget_latency_ms / 1000)
+
+        if name == "options":
+            needle = query.get("q", "").strip().lower()
+            options = [
+                o for o in MOCK_OPTIONS.get(query.get("field"), [])
+                if needle in o["label"].lower() or needle in o.get("completeview", "").lower()
+            ]
+            return self._send_json(200, options)
+
+        if name == "tree":
+            return self._send_json(200, tree_children(query.get("field"), query.get("node", "root")))
+
+        if name in ("calendar", "ping"):
+            return self._send_json(200, {"ok": True})
+
+        self._send_json(404, {"error": f"Ruta no encontrada: {self.path}"})
+
+    def log_message(self, format, *args):
+        pass
+
+    def _authorized(self) -> bool:
+        return f"{MOCK_SESSION_COOKIE}=" in (self.headers.get("Cookie") or "")
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        return json.loads(body) if body else None
+
+    def _send_json(self, status: int, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self._send_body(status, body, "application/json; charset=utf-8")
+
+    def _send_body(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def tree_children(field: str, node_id: str) -> list[dict]:
+    """ Hijos de un nodo de MOCK_TREES. Los ids son la ruta de índices ("root", "0", "0.1", ...) """
+    node = MOCK_TREES.get(field)
+    if node is None:
+        return []
+
+    path = [] if node_id == "root" else node_id.split(".")
+    for index in path:
+        try:
+            node = node.get("children", [])[int(index)]
+        except (IndexError, ValueError):
+            return []
+
+    prefix = "" if node_id == "root" else f"{node_id}."
+    return [
+        {"id": f"{prefix}{i}", "label": child["label"], "leaf": not child.get("children")}
+        for i, child in enumerate(node.get("children", []))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor mock de ProactivaNet")
+    parser.add_argument("--port", type=int, default=MOCK_SERVER_PORT)
+    parser.add_argument("--latency-ms", type=int, default=0, help="latencia por request")
+    parser.add_argument("--item-latency-ms", type=int, default=0, help="latencia por incidencia creada")
+    parser.add_argument("--page-latency-ms", type=int, default=0, help="latencia de cada página del sitio mock")
+    parser.add_argument("--widget-latency-ms", type=int, default=0, help="latencia de cada dato que pide un popup")
+    parser.add_argument("--no-direct-date", action="store_true", help="sin setValue en #creationDate (fuerza los popups)")
+    parser.add_argument("--widget-api", choices=["model", "ignore", "none"], default="model", help="API getValue/setValue de los widgets")
+    parser.add_argument("--storage-state", type=Path, help="escribe un storage_state válido para este servidor")
+    args = parser.parse_args()
+
+    server = MockProactivaServer(
+        port=args.port,
+        latency_ms=args.latency_ms,
+        item_latency_ms=args.item_latency_ms,
+        page_latency_ms=args.page_latency_ms,
+        widget_latency_ms=args.widget_latency_ms,
+        direct_date=not args.no_direct_date,
+        widget_api=args.widget_api,
+    )
+    if args.storage_state:
+        server.write_storage_state(args.storage_state)
+        print(f"💾 storage_state mock: {args.storage_state}")
+
+    print(f"🧪 Mock ProactivaNet en {server.url} (sitio: {server.site_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
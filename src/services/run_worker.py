@@ -0,0 +1,89 @@
+import queue
+import threading
+
+
+class RunControl:
+    """
+    Pausa / reanudación / cancelación de una ejecución. La UI llama pause/resume/cancel y
+    MainController consulta checkpoint() entre jobs, así nunca se corta un ticket a medio crear.
+    """
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        # un worker pausado tiene que despertar para enterarse de la cancelación
+        self._running.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def checkpoint(self) -> bool:
+        """ Bloquea mientras esté en pausa; False si hay que dejar de tomar jobs """
+        self._running.wait()
+        return not self._cancelled.is_set()
+
+
+class RunWorker(threading.Thread):
+    """
+    Corre MainController en un hilo aparte y publica todo en una cola thread-safe:
+        ("status", mensaje) · ("done", None) · ("error", excepción)
+    La vista la vacía desde el loop de Tk con after(), nunca toca widgets desde este hilo.
+    """
+    def __init__(self, excel_paths, control: RunControl | None = None, **controller_kwargs):
+        super().__init__(name="run-worker", daemon=True)
+        # una planilla (Path) o varias / carpetas (lista) para el modo lote
+        self.excel_paths = excel_paths
+        self.control = control or RunControl()
+        self.controller_kwargs = controller_kwargs
+        self.messages: queue.Queue = queue.Queue()
+        # filas que terminaron en FAILED (para el código de salida de la CLI)
+        self.failed_rows = 0
+
+    def run(self):
+        # import acá: la carga del Excel y Playwright quedan fuera del hilo de la UI
+        from src.controllers.main_controller import MainController
+        from src.controllers.batch_controller import BatchController
+
+        try:
+            if isinstance(self.excel_paths, (list, tuple)):
+                controller = BatchController(self.excel_paths, on_status=self._post_status, control=self.control, **self.controller_kwargs)
+            else:
+                controller = MainController(self.excel_paths, on_status=self._post_status, control=self.control, **self.controller_kwargs)
+            controller.start()
+            self.failed_rows = sum(1 for job in controller.jobs if job.status == "FAILED")
+        except Exception as e:
+            self.messages.put(("error", e))
+        else:
+            self.messages.put(("done", None))
+
+    def _post_status(self, message: str):
+        self.messages.put(("status", message))
+
+    def drain(self, timeout: float = 0) -> list[tuple[str, object]]:
+        """ Mensajes pendientes; sin timeout no bloquea (lo llama el hilo de Tk) """
+        items = []
+        if timeout:
+            try:
+                items.append(self.messages.get(timeout=timeout))
+            except queue.Empty:
+                return items
+
+        while True:
+            try:
+                items.append(self.messages.get_nowait())
+            except queue.Empty:
+                return items
@@ -0,0 +1,412 @@
+import asyncio
+import http.client
+import json
+import queue
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from src.controllers.web_controller import WebController
+from src.controllers.async_web_controller import AsyncWebController
+from src.helpers import paw_form as form
+from src.helpers.datetime_helpers import format_web_creation_dt
+from src.helpers.session_helpers import check_session, load_cookie_header
+from src.models.ticket_job import TicketJob
+from src.utils.context_manager import timed, job_scope, add_wait_time, get_wait_time, reset_wait_time
+from src.config import (
+    WEB_STORAGE_DIR,
+    DEFAULT_REPORT_USER,
+    DEFAULT_JOB_GROUP,
+    SUBMISSION_BACKEND,
+    HTTP_BACKEND_URL,
+    HTTP_INCIDENTS_PATH,
+    HTTP_POOL_SIZE,
+    HTTP_BATCH_SIZE,
+    ASYNC_PAGES,
+)
+
+
+class SubmissionBackend:
+    """
+    Cómo se crea un ticket para un TicketJob.
+    submit() retorna {"success": True, "ticket_id": ...} o {"success": False, "error": ...}
+    (ticket_id es None si el backend no puede leer el número asignado) y deja job.creation_dt_text con la fecha de creación usada (para escribirla en el Excel).
+    """
+    name = "base"
+    batch_size = 1
+
+    def start(self):
+        pass
+
+    def submit(self, job: TicketJob) -> dict:
+        raise NotImplementedError
+
+    def submit_batch(self, jobs: list[TicketJob]) -> list[dict]:
+        return [self.submit(job) for job in jobs]
+
+    def spawn(self) -> "SubmissionBackend":
+        """ Backend para un worker extra del pool """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+# =========================
+# PLAYWRIGHT (formulario web)
+# =========================
+class PlaywrightBackend(SubmissionBackend):
+    name = "playwright"
+
+    def __init__(self, web_ctrl: WebController | None = None, headless: bool | None = None, url: str | None = None, state_path: Path | None = None):
+        self.web_ctrl = web_ctrl or WebController(headless=headless, url=url, state_path=state_path)
+
+    def start(self):
+        self.web_ctrl.start()
+
+    def submit(self, job: TicketJob) -> dict:
+        web_ctrl = self.web_ctrl
+        try:
+            with timed("web.open_new_incident"):
+                web_ctrl.open_new_incident()
+            with timed("web.ensure_creation_datetime"):
+                job.creation_dt_text = web_ctrl.ensure_creation_datetime(job)
+
+            # lo constante del lote de una vez, después lo propio de la fila
+            with timed("web.fill_constant_fields"):
+                web_ctrl.fill_constant_fields()
+            with timed("web.select_titulo_descripcion"):
+                web_ctrl.select_titulo_descripcion(job)
+            with timed("web.crear_ticket"):
+                web_ctrl.crear_ticket()
+
+            # TODO: completar formulario con PROBLEMA, SOLUCION, TECNICO, etc.
+            # ticket_id_real = self.web_ctrl.submit_incident(...)
+
+            with timed("web.go_home"):
+                web_ctrl._go_home()
+
+            # crear_ticket aún no lee el número asignado: sin ticket_id no se escribe la columna TICKET
+            return {
+                "success": True,
+                "ticket_id": None
+            }
+        except Exception as e:
+            web_ctrl._go_home()
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def spawn(self) -> "PlaywrightBackend":
+        return PlaywrightBackend(headless=self.web_ctrl.headless, url=self.web_ctrl.url, state_path=self.web_ctrl.state_path)
+
+    def close(self):
+        self.web_ctrl.close()
+
+
+# =========================
+# PLAYWRIGHT ASYNC (varias pestañas en un event loop)
+# =========================
+class AsyncPlaywrightBackend(SubmissionBackend):
+    """
+    Completa hasta `pages` formularios a la vez, cada uno en su pestaña, sobre un solo navegador y event loop.
+    Mientras una pestaña espera al servidor las otras avanzan. submit_batch recibe los lotes de MainController.
+    """
+    name = "async"
+
+    def __init__(self, headless: bool | None = None, pages: int = ASYNC_PAGES, url: str | None = None, state_path: Path | None = None):
+        self.headless = headless
+        self.pages = max(1, pages)
+        self.batch_size = self.pages
+
+        self.web_ctrl = AsyncWebController(headless=headless, url=url, state_path=state_path)
+        self._loop = asyncio.new_event_loop()
+        self._idle: asyncio.Queue | None = None
+        self._ctrls: list[AsyncWebController] = []
+
+    def start(self):
+        self._loop.run_until_complete(self._start())
+
+    async def _start(self):
+        await self.web_ctrl.start()
+
+        self._ctrls = [self.web_ctrl]
+        for _ in range(self.pages - 1):
+            self._ctrls.append(await self.web_ctrl.new_page())
+
+        self._idle = asyncio.Queue()
+        for ctrl in self._ctrls:
+            self._idle.put_nowait(ctrl)
+
+        print(f"🗂️ {len(self._ctrls)} pestañas listas")
+
+    def submit(self, job: TicketJob) -> dict:
+        return self.submit_batch([job])[0]
+
+    def submit_batch(self, jobs: list[TicketJob]) -> list[dict]:
+        results = self._loop.run_until_complete(self._submit_all(jobs))
+
+        # cada tarea corre sobre una copia del contexto: su espera de DOM vuelve sumada a la cuenta de quien llama
+        add_wait_time(sum(wait for _, wait in results))
+        return [result for result, _ in results]
+
+    async def _submit_all(self, jobs: list[TicketJob]) -> list[tuple[dict, float]]:
+        return await asyncio.gather(*(self._submit_one(job) for job in jobs))
+
+    async def _submit_one(self, job: TicketJob) -> tuple[dict, float]:
+        reset_wait_time()
+        with job_scope(job.row_id):
+            with timed("web.wait_page"):
+                web_ctrl = await self._idle.get()
+            try:
+                result = await self._fill_form(web_ctrl, job)
+            finally:
+                self._idle.put_nowait(web_ctrl)
+
+        return result, get_wait_time()
+
+    async def _fill_form(self, web_ctrl: AsyncWebController, job: TicketJob) -> dict:
+        try:
+            with timed("web.open_new_incident"):
+                await web_ctrl.open_new_incident()
+            with timed("web.ensure_creation_datetime"):
+                job.creation_dt_text = await web_ctrl.ensure_creation_datetime(job)
+
+            with timed("web.fill_constant_fields"):
+                await web_ctrl.fill_constant_fields()
+            with timed("web.select_titulo_descripcion"):
+                await web_ctrl.select_titulo_descripcion(job)
+            with timed("web.crear_ticket"):
+                await web_ctrl.crear_ticket()
+
+            with timed("web.go_home"):
+                await web_ctrl._go_home()
+
+            # ver PlaywrightBackend.submit: el número del ticket aún no se lee
+            return {
+                "success": True,
+                "ticket_id": None
+            }
+        except Exception as e:
+            try:
+                await web_ctrl._go_home()
+            except Exception:
+                pass
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def spawn(self) -> "AsyncPlaywrightBackend":
+        return AsyncPlaywrightBackend(headless=self.headless, pages=self.pages, url=self.web_ctrl.url, state_path=self.web_ctrl.state_path)
+
+    def close(self):
+        try:
+            self._loop.run_until_complete(self._close())
+        finally:
+            self._loop.close()
+
+    async def _close(self):
+        # primero las pestañas extra, al final el controlador dueño del navegador
+        for ctrl in reversed(self._ctrls[1:]):
+            await ctrl.close()
+        await self.web_ctrl.close()
+
+
+# =========================
+# HTTP (POST directo con la sesión guardada)
+# =========================
+class HttpConnectionPool:
+    """ Conexiones keep-alive reutilizables entre hilos """
+    def __init__(self, base_url: str, size: int = 4, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def request(self, method: str, path: str, body: bytes | None = None, headers: dict | None = None):
+        conn = self._acquire()
+        try:
+            try:
+                status, data = self._send(conn, method, path, body, headers)
+            except (http.client.HTTPException, ConnectionError):
+                # el servidor cerró la conexión keep-alive: se reintenta una vez con una nueva
+                conn.close()
+                conn = self._new_connection()
+                status, data = self._send(conn, method, path, body, headers)
+        except Exception:
+            conn.close()
+            raise
+
+        self._release(conn)
+        return status, data
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+    def _send(self, conn, method, path, body, headers):
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, response.read()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _new_connection(self):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+
+# hosts del servidor mock (HttpBackend no habla con otro)
+MOCK_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+class HttpBackend(SubmissionBackend):
+    """
+    Crea incidencias con un POST JSON a HTTP_INCIDENTS_PATH usando las cookies de proactiva_storage_state.json.
+    Contrato: POST {path} -> {"ticket_id", "creation_date"}; POST {path}/batch -> lista de lo mismo.
+    El contrato es el de `python -m src.services.mock_proactiva_server`: el formato REST real de ProactivaNet
+    no se conoce, así que solo se aceptan URLs locales (el mock) y nunca se postea al sitio de producción.
+    """
+    name = "http"
+
+    def __init__(self, base_url: str = HTTP_BACKEND_URL, state_path: Path | None = None, pool_size: int = HTTP_POOL_SIZE, batch_size: int = HTTP_BATCH_SIZE):
+        if urlsplit(base_url).hostname not in MOCK_HOSTS:
+            raise ValueError(f"El backend HTTP solo funciona contra el servidor mock local, no contra {base_url}")
+
+        self.base_url = base_url
+        self.state_path = state_path or WEB_STORAGE_DIR / "proactiva_storage_state.json"
+        self.batch_size = max(1, batch_size)
+
+        self.pool = HttpConnectionPool(base_url, size=pool_size)
+        self._headers = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        session = check_session(self.state_path, url=self.base_url)
+        # STALE se prueba igual: si el servidor rechaza las cookies, _post lo informa por job
+        cookie_header = load_cookie_header(self.state_path, self.pool.host) if session.usable else None
+        if not cookie_header:
+            raise RuntimeError(f"{session.reason}: el backend HTTP necesita una sesión válida. Inicia sesión primero con el navegador.")
+
+        self._headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Cookie": cookie_header,
+            "Connection": "keep-alive",
+        }
+        print(f"🌐 Backend HTTP listo: {self.base_url}")
+
+    def submit(self, job: TicketJob) -> dict:
+        try:
+            with timed("http.post_incident"):
+                data = self._post(HTTP_INCIDENTS_PATH, build_incident_payload(job))
+            return self._result(job, data)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def submit_batch(self, jobs: list[TicketJob]) -> list[dict]:
+        results: list[dict | None] = [None] * len(jobs)
+        payloads, sent = [], []
+
+        for i, job in enumerate(jobs):
+            try:
+                payloads.append(build_incident_payload(job))
+                sent.append(i)
+            except Exception as e:
+                results[i] = {"success": False, "error": str(e)}
+
+        if sent:
+            try:
+                with timed("http.post_batch"):
+                    data = self._post(f"{HTTP_INCIDENTS_PATH}/batch", payloads)
+                for i, item in zip(sent, data):
+                    results[i] = self._result(jobs[i], item)
+            except Exception as e:
+                for i in sent:
+                    results[i] = {"success": False, "error": str(e)}
+            else:
+                # el servidor respondió menos incidencias de las enviadas: las que faltan quedan con error
+                for i in sent[len(data):]:
+                    results[i] = {"success": False, "error": f"El servidor respondió {len(data)} de {len(sent)} incidencias del lote"}
+
+        return results
+
+    def spawn(self) -> "HttpBackend":
+        # el pool de conexiones es thread-safe: los workers comparten este backend
+        return self
+
+    def close(self):
+        with self._lock:
+            self.pool.close()
+
+    def _post(self, path: str, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        status, data = self.pool.request("POST", path, body=body, headers=self._headers)
+
+        if status in (401, 403):
+            raise RuntimeError("Sesión expirada: el servidor rechazó las cookies guardadas")
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status}: {data[:200].decode('utf-8', 'replace')}")
+
+        return json.loads(data)
+
+    def _result(self, job: TicketJob, data: dict) -> dict:
+        if data.get("error"):
+            return {"success": False, "error": data["error"]}
+
+        job.creation_dt_text = data.get("creation_date") or job.creation_dt_text
+        return {"success": True, "ticket_id": data["ticket_id"]}
+
+
+def build_incident_payload(job: TicketJob) -> dict:
+    problema = job.problema
+    if not problema:
+        raise RuntimeError("Problema Vacio en el JOB")
+
+    excel_date = job.fecha
+    excel_time = job.hora
+
+    return {
+        "row_id": job.row_id,
+        "title": problema[:256],
+        "description": problema,
+        "solution": job.solucion,
+        "creation_date": format_web_creation_dt(excel_date, excel_time) if excel_date and excel_time else None,
+        "notified_by": DEFAULT_REPORT_USER,
+        "type": form.TIPO_SOLICITUD,
+        "portfolio": list(form.CATEGORIA_TREE.path),
+        "category": form.SERVICIO_TREE.path[-1],
+        "group": DEFAULT_JOB_GROUP,
+    }
+
+
+# =========================
+# SELECCIÓN
+# =========================
+def make_backend(name: str | None = None, headless: bool | None = None) -> SubmissionBackend:
+    name = name or SUBMISSION_BACKEND
+
+    if name == "playwright":
+        return PlaywrightBackend(headless=headless)
+    if name == "async":
+        return AsyncPlaywrightBackend(headless=headless)
+    if name == "http":
+        return HttpBackend()
+
+    raise ValueError(f"Backend de envío no soportado: {name}")
@@ -0,0 +1,86 @@
+import queue
+import threading
+
+
+class WebWorkerPool:
+    """
+    Reparte los jobs entre N backends de envío (ver submission_backends) que consumen una cola compartida.
+    Con Playwright cada worker levanta su propio navegador con la sesión guardada (proactiva_storage_state.json),
+    porque Playwright sync no se puede compartir entre hilos.
+    """
+    def __init__(self, size: int, handle_job, on_status=None, checkpoint=None):
+        self.size = max(1, size)
+        self.handle_job = handle_job
+        self.on_status = on_status
+        # se llama antes de tomar cada job: bloquea en pausa, False para dejar de consumir
+        self.checkpoint = checkpoint
+
+        self._queue = queue.Queue()
+        # se activa si el hilo principal sale antes de tiempo: los workers no toman más jobs
+        self._stop = threading.Event()
+
+    def run(self, jobs, lead):
+        """ lead ya debe estar iniciado (login/MFA resuelto y sesión guardada) """
+        for job in jobs:
+            self._queue.put(job)
+
+        threads = [
+            threading.Thread(target=self._worker, args=(i, lead), name=f"web-worker-{i}", daemon=True)
+            for i in range(1, self.size)
+        ]
+
+        for t in threads:
+            t.start()
+
+        # el hilo principal también trabaja con el backend que hizo el login
+        try:
+            self._consume(lead)
+        finally:
+            # con error o cancelación en el hilo principal, los workers terminan su job actual y cierran su backend
+            self._stop.set()
+            for t in threads:
+                t.join()
+
+    # =========================
+    # WORKERS
+    # =========================
+    def _worker(self, worker_id: int, lead):
+        backend = lead.spawn()
+        # un backend compartido (p.ej. HTTP) lo inicia y cierra quien lo creó
+        owned = backend is not lead
+
+        if owned:
+            try:
+                backend.start()
+            except Exception as e:
+                self._emit(f"⚠️ Worker {worker_id} no pudo iniciar: {e}")
+                backend.close()
+                return
+
+        self._emit(f"🧵 Worker {worker_id} listo")
+        try:
+            self._consume(backend)
+        finally:
+            if owned:
+                backend.close()
+
+    def _consume(self, backend):
+        while not self._stop.is_set():
+            if self.checkpoint and not self.checkpoint():
+                return
+
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                self.handle_job(job, backend)
+            finally:
+                self._queue.task_done()
+
+    def _emit(self, message: str):
+        if self.on_status:
+            self.on_status(message)
+        else:
+            print(message)
@@ -1,11 +1,56 @@
 from contextlib import contextmanager
+from contextvars import ContextVar
 from time import perf_counter
 
+from src.utils.metrics import METRICS
+
+# Job al que se atribuyen los spans de timed() (fila del Excel)
+_current_job: ContextVar[int | None] = ContextVar("current_job", default=None)
+
 @contextmanager
-def timed(label: str):
+def job_scope(job_id: int | None):
+    token = _current_job.set(job_id)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+@contextmanager
+def timed(label: str, echo: bool = False):
+    """ Span con nombre: se registra en METRICS etiquetado con el job actual (ver job_scope) """
     t0 = perf_counter()
     try:
         yield
     finally:
         dt = perf_counter() - t0
-        print(f"⏱️ {label}: {dt:.3f}s")
+        METRICS.record(label, dt, job=_current_job.get())
+        if echo:
+            print(f"⏱️ {label}: {dt:.3f}s")
+
+
+# Tiempo esperando al DOM. ContextVar: cada hilo (worker) y cada tarea asyncio lleva su propia cuenta
+_wait_total: ContextVar[float] = ContextVar("wait_total", default=0.0)
+_wait_depth: ContextVar[int] = ContextVar("wait_depth", default=0)
+
+@contextmanager
+def waiting():
+    depth = _wait_depth.get()
+    _wait_depth.set(depth + 1)
+    t0 = perf_counter()
+    try:
+        yield
+    finally:
+        _wait_depth.set(depth)
+        # solo el bloque externo suma, los anidados ya están contenidos
+        if depth == 0:
+            _wait_total.set(_wait_total.get() + (perf_counter() - t0))
+
+def get_wait_time() -> float:
+    return _wait_total.get()
+
+def reset_wait_time():
+    _wait_total.set(0.0)
+
+def add_wait_time(seconds: float):
+    """ Suma esperas medidas en otro contexto (p.ej. tareas de asyncio.gather, que corren sobre una copia) """
+    _wait_total.set(_wait_total.get() + seconds)
@@ -0,0 +1,121 @@
+import csv
+import json
+import math
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+class MetricsCollector:
+    """
+    Spans (paso, duración, job) de una ejecución y su resumen p50/p95/max por paso.
+    Lo alimenta context_manager.timed; es thread-safe porque lo usan los workers del pool.
+    """
+    def __init__(self):
+        self.spans: list[dict] = []
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.spans = []
+
+    def record(self, step: str, seconds: float, job=None):
+        with self._lock:
+            self.spans.append({
+                "step": step,
+                "job": job,
+                "seconds": seconds,
+                "at": datetime.now().isoformat(timespec="milliseconds")
+            })
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            spans = list(self.spans)
+
+        by_step: dict[str, list[float]] = {}
+        for span in spans:
+            by_step.setdefault(span["step"], []).append(span["seconds"])
+
+        result = {}
+        for step, values in by_step.items():
+            values.sort()
+            result[step] = {
+                "count": len(values),
+                "sum": sum(values),
+                "p50": _percentile(values, 0.50),
+                "p95": _percentile(values, 0.95),
+                "max": values[-1],
+            }
+        return result
+
+    # =========================
+    # EXPORTACIÓN
+    # =========================
+    def export(self, out_dir: Path, run_name: str) -> dict[str, Path]:
+        """ Escribe <run>.json (spans + resumen), <run>.csv (spans) y <run>.prom (OpenMetrics) """
+        out_dir.mkdir(parents=True, exist_ok=True)
+        summary = self.summary()
+        with self._lock:
+            spans = list(self.spans)
+
+        paths = {
+            "json": out_dir / f"{run_name}.json",
+            "csv": out_dir / f"{run_name}.csv",
+            "openmetrics": out_dir / f"{run_name}.prom",
+        }
+
+        with open(paths["json"], "w", encoding="utf-8") as f:
+            json.dump({"run": run_name, "summary": summary, "spans": spans}, f, indent=2, ensure_ascii=False)
+
+        with open(paths["csv"], "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["step", "job", "seconds", "at"])
+            writer.writeheader()
+            writer.writerows(spans)
+
+        with open(paths["openmetrics"], "w", encoding="utf-8") as f:
+            f.write(to_openmetrics(summary))
+
+        return paths
+
+    def format_top(self, n: int = 5) -> list[str]:
+        """ Pasos que más tiempo sumaron, para mostrar al final de la ejecución """
+        top = sorted(self.summary().items(), key=lambda item: item[1]["sum"], reverse=True)[:n]
+        return [
+            f"{step}: total {s['sum']:.1f}s · p50 {s['p50']:.2f}s · p95 {s['p95']:.2f}s · max {s['max']:.2f}s (n={s['count']})"
+            for step, s in top
+        ]
+
+
+def to_openmetrics(summary: dict[str, dict], name: str = "ticket_step_seconds") -> str:
+    lines = [
+        f"# TYPE {name} summary",
+        f"# UNIT {name} seconds",
+        f"# HELP {name} Duración de cada paso de la carga de tickets.",
+    ]
+    for step, s in sorted(summary.items()):
+        label = step.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{name}{{step="{label}",quantile="0.5"}} {s["p50"]:.6f}')
+        lines.append(f'{name}{{step="{label}",quantile="0.95"}} {s["p95"]:.6f}')
+        lines.append(f'{name}_sum{{step="{label}"}} {s["sum"]:.6f}')
+        lines.append(f'{name}_count{{step="{label}"}} {s["count"]}')
+
+    max_name = name.replace("_seconds", "_max_seconds")
+    lines += [f"# TYPE {max_name} gauge", f"# UNIT {max_name} seconds"]
+    for step, s in sorted(summary.items()):
+        label = step.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{max_name}{{step="{label}"}} {s["max"]:.6f}')
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """ Nearest-rank sobre valores ya ordenados """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+# colector de la ejecución en curso (compartido por todos los hilos)
+METRICS = MetricsCollector()
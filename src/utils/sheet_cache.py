@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import polars as pl
+
+from src.config import SHEET_CACHE_DIR, SHEET_CACHE_MAX_MB, SHEET_CACHE_MAX_AGE_DAYS
+
+
+class SheetCache:
+    """
+    Tabla de jobs ya normalizada por planilla, direccionada por contenido:
+    clave = sha256 del .xlsx + versión del parser. Cada entrada es <clave>.parquet + <clave>.json
+    (formato, encabezados y columna de ticket, que el write-back necesita).
+    Si la planilla cambia (p.ej. al escribir los tickets) la clave cambia sola; las viejas se desalojan por edad/tamaño.
+    """
+    def __init__(self, cache_dir: Path | None = None, max_mb: float = SHEET_CACHE_MAX_MB, max_age_days: float = SHEET_CACHE_MAX_AGE_DAYS):
+        self.cache_dir = cache_dir or SHEET_CACHE_DIR
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age_s = max_age_days * 24 * 3600
+
+    @staticmethod
+    def key(excel_path: Path, parser_version: int) -> str:
+        digest = hashlib.sha256()
+        with open(excel_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return f"{digest.hexdigest()}-v{parser_version}"
+
+    def get(self, key: str) -> tuple[pl.DataFrame, dict] | None:
+        data_path, meta_path = self._paths(key)
+        if not data_path.exists() or not meta_path.exists():
+            return None
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            df = pl.read_parquet(data_path)
+        except (OSError, json.JSONDecodeError, pl.exceptions.PolarsError):
+            # entrada corrupta: se vuelve a parsear la planilla
+            self._remove(key)
+            return None
+
+        # marca de uso para el desalojo (las más viejas primero)
+        now = time.time()
+        for path in (data_path, meta_path):
+            os.utime(path, (now, now))
+
+        return df, meta
+
+    def put(self, key: str, df: pl.DataFrame, meta: dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data_path, meta_path = self._paths(key)
+
+        # primero los datos, el .json al final: sin .json la entrada no existe para get()
+        tmp = data_path.with_suffix(f".{os.getpid()}.tmp")
+        df.write_parquet(tmp)
+        os.replace(tmp, data_path)
+
+        tmp = meta_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp, meta_path)
+
+        self.evict()
+
+    def evict(self):
+        """ Borra entradas sin uso hace más de max_age y, si sigue pasado de tamaño, las menos usadas """
+        entries = []
+        for data_path in self.cache_dir.glob("*.parquet"):
+            try:
+                stat = data_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, data_path.stem))
+
+        now = time.time()
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+
+        for used_at, size, key in entries:
+            if now - used_at <= self.max_age_s and total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.parquet", self.cache_dir / f"{key}.json"
+
+    def _remove(self, key: str):
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
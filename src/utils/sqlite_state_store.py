@@ -0,0 +1,201 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.config import STATES_DIR, STATES_DB_PATH
+from src.utils.state_store import StateStore
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    file        TEXT    NOT NULL,
+    row_id      INTEGER NOT NULL,
+    status      TEXT    NOT NULL,
+    ticket_id   TEXT,
+    error       TEXT,
+    started_at  REAL,
+    updated_at  REAL    NOT NULL,
+    PRIMARY KEY (file, row_id)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_file_row_status ON jobs (file, row_id, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_updated ON jobs (status, updated_at);
+
+CREATE TABLE IF NOT EXISTS job_history (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    file        TEXT    NOT NULL,
+    row_id      INTEGER NOT NULL,
+    status      TEXT    NOT NULL,
+    ticket_id   TEXT,
+    error       TEXT,
+    at          REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_status_at ON job_history (status, at);
+"""
+
+UPSERT_SQL = """
+INSERT INTO jobs (file, row_id, status, ticket_id, error, started_at, updated_at)
+VALUES (:file, :row_id, :status, :ticket_id, :error, :started_at, :updated_at)
+ON CONFLICT (file, row_id) DO UPDATE SET
+    status = excluded.status,
+    ticket_id = excluded.ticket_id,
+    error = excluded.error,
+    started_at = COALESCE(excluded.started_at, jobs.started_at),
+    updated_at = excluded.updated_at
+"""
+
+HISTORY_SQL = """
+INSERT INTO job_history (file, row_id, status, ticket_id, error, at)
+VALUES (:file, :row_id, :status, :ticket_id, :error, :updated_at)
+"""
+
+
+class SqliteStateStore:
+    """
+    Misma interfaz que StateStore, pero todas las planillas viven en una sola base SQLite (WAL).
+    Permite consultar historial entre planillas sin abrir cada archivo de estado.
+    """
+    def __init__(self, excel_path: Path, db_path: Path | None = None, states_dir: Path | None = None):
+        # states_dir: carpeta de estados (la base y los .state.json a migrar); por defecto la de config
+        self.states_dir = states_dir or STATES_DIR
+        db_path = db_path or (self.states_dir / STATES_DB_PATH.name if states_dir else STATES_DB_PATH)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.excel_path = excel_path
+        self.file = excel_path.stem
+        self.db_path = db_path
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+
+        # WAL: los lectores no bloquean al escritor
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        self._index: dict[int, dict] = {}
+        self._load()
+
+    # =========================
+    # CARGA / GUARDADO
+    # =========================
+    def _load(self):
+        """ Hidrata todos los jobs de la planilla con una sola consulta """
+        rows = self.conn.execute(
+            "SELECT row_id, status, ticket_id, error FROM jobs WHERE file = ?",
+            (self.file,)
+        ).fetchall()
+
+        if not rows:
+            self._import_json_state()
+            return
+
+        self._index = {row["row_id"]: dict(row) for row in rows}
+
+    def _import_json_state(self):
+        """
+        Migra el estado JSON de la planilla (si hay) a la base. Se carga con StateStore para
+        re-aplicar también el .state.journal que no alcanzó a compactarse (ej. tras un cierre inesperado);
+        después se renombran los archivos para no volver a importarlos.
+        """
+        json_path = self.states_dir / f"{self.file}.state.json"
+        journal_path = self.states_dir / f"{self.file}.state.journal"
+        if not json_path.exists() and not journal_path.exists():
+            return
+
+        legacy = StateStore(self.excel_path, states_dir=self.states_dir)
+        jobs = legacy.get_jobs()
+        legacy.close()
+
+        if jobs:
+            self.set_jobs(jobs)
+
+        # StateStore ya consolidó el journal en el snapshot; se deja como respaldo con otro nombre
+        journal_path.unlink(missing_ok=True)
+        if json_path.exists():
+            json_path.replace(json_path.with_name(json_path.name + ".migrated"))
+        print(f"📦 Migrados {len(jobs)} jobs desde {json_path.name} a {self.db_path.name}")
+
+    def save(self):
+        with self._lock:
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+    # =========================
+    # OPERACIONES DE JOBS
+    # =========================
+    def get_job(self, row_id: int):
+        return self._index.get(row_id)
+
+    def get_jobs(self) -> list[dict]:
+        return list(self._index.values())
+
+    def set_job(self, row_id: int, status: str, ticket_id=None, error=None):
+        self.set_jobs([{
+            "row_id": row_id,
+            "status": status,
+            "ticket_id": ticket_id,
+            "error": error
+        }])
+
+    def set_jobs(self, jobs: list[dict]):
+        """ Upsert masivo: una transacción para todas las filas """
+        now = time.time()
+        params = [
+            {
+                "file": self.file,
+                "row_id": job["row_id"],
+                "status": job["status"],
+                "ticket_id": job.get("ticket_id"),
+                "error": job.get("error"),
+                "started_at": now if job["status"] == "IN_PROGRESS" else None,
+                "updated_at": now,
+            }
+            for job in jobs
+        ]
+
+        with self._lock, self.conn:
+            self.conn.executemany(UPSERT_SQL, params)
+            self.conn.executemany(HISTORY_SQL, params)
+
+        for p in params:
+            self._index[p["row_id"]] = {
+                "row_id": p["row_id"],
+                "status": p["status"],
+                "ticket_id": p["ticket_id"],
+                "error": p["error"]
+            }
+
+    def get_pending_jobs(self):
+        return [
+            job for job in self._index.values()
+            if job["status"] == "PENDING"
+        ]
+
+    # =========================
+    # HISTORIAL (todas las planillas)
+    # =========================
+    # la conexión se comparte con los workers que escriben: las consultas también toman el lock
+    def failed_since(self, since: datetime) -> list[dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT file, row_id, error, updated_at FROM jobs WHERE status = 'FAILED' AND updated_at >= ? ORDER BY updated_at",
+                (since.timestamp(),)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def avg_creation_seconds(self, file: str | None = None) -> float | None:
+        sql = "SELECT AVG(updated_at - started_at) FROM jobs WHERE status = 'CREATED' AND started_at IS NOT NULL"
+        params = ()
+        if file:
+            sql += " AND file = ?"
+            params = (file,)
+
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()[0]
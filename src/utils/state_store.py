@@ -1,15 +1,30 @@
 import json
+import os
 from pathlib import Path
-from src.config import STATES_DIR
+from src.config import STATES_DIR, STATE_COMPACT_EVERY
 
 
 class StateStore:
-    def __init__(self, excel_path: Path):
-        self.path = STATES_DIR / f"{excel_path.stem}.state.json"
+    """
+    Estado de los jobs de una planilla.
+    - `.state.json`: snapshot completo (se reescribe solo al compactar)
+    - `.state.journal`: una línea JSON por transición (append-only), se re-aplica al cargar
+    """
+    def __init__(self, excel_path: Path, compact_every: int = STATE_COMPACT_EVERY, states_dir: Path | None = None):
+        states_dir = states_dir or STATES_DIR
+        states_dir.mkdir(parents=True, exist_ok=True)
+
+        self.path = states_dir / f"{excel_path.stem}.state.json"
+        self.journal_path = states_dir / f"{excel_path.stem}.state.journal"
+        self.compact_every = max(1, compact_every)
+
         self.state = {
             "version": 1,
             "jobs": []
         }
+        self._index: dict[int, dict] = {}
+        self._journal = None
+        self._pending_entries = 0
 
         self._load()
 
@@ -21,21 +36,86 @@ class StateStore:
             with open(self.path, "r", encoding="utf-8") as f:
                 self.state = json.load(f)
 
+        self._index = {job["row_id"]: job for job in self.state["jobs"]}
+
+        replayed = self._replay_journal()
+        if replayed:
+            # recuperación tras un cierre inesperado: se consolida de inmediato
+            print(f"♻️ Recuperadas {replayed} transiciones desde {self.journal_path.name}")
+            self.save()
+
+    def _replay_journal(self) -> int:
+        if not self.journal_path.exists():
+            return 0
+
+        replayed = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # última línea a medio escribir
+                    break
+
+                self._apply(entry["row_id"], entry["status"], entry.get("ticket_id"), entry.get("error"))
+                replayed += 1
+
+        return replayed
+
     def save(self):
-        with open(self.path, "w", encoding="utf-8") as f:
+        """ Compacta: escribe el snapshot completo (atómico) y vacía el journal """
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(self.state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+        self.journal_path.unlink(missing_ok=True)
+        self._pending_entries = 0
+
+    def close(self):
+        if self._pending_entries:
+            self.save()
+        elif self._journal:
+            self._journal.close()
+            self._journal = None
+
+    def _append_journal(self, entry: dict):
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal.flush()
+
+        self._pending_entries += 1
+        if self._pending_entries >= self.compact_every:
+            self.save()
 
     # =========================
     # OPERACIONES DE JOBS
     # =========================
     def get_job(self, row_id: int):
-        for job in self.state["jobs"]:
-            if job["row_id"] == row_id:
-                return job
-        return None
+        return self._index.get(row_id)
+
+    def get_jobs(self) -> list[dict]:
+        return list(self.state["jobs"])
 
     def set_job(self, row_id: int, status: str, ticket_id=None, error=None):
-        job = self.get_job(row_id)
+        self._apply(row_id, status, ticket_id, error)
+        self._append_journal({
+            "row_id": row_id,
+            "status": status,
+            "ticket_id": ticket_id,
+            "error": error
+        })
+
+    def _apply(self, row_id: int, status: str, ticket_id=None, error=None):
+        job = self._index.get(row_id)
 
         if not job:
             job = {
@@ -45,13 +125,12 @@ class StateStore:
                 "error": error
             }
             self.state["jobs"].append(job)
+            self._index[row_id] = job
         else:
             job["status"] = status
             job["ticket_id"] = ticket_id
             job["error"] = error
 
-        self.save()
-
     def get_pending_jobs(self):
         return [
             job for job in self.state["jobs"]
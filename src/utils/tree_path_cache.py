@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from src.config import WEB_STORAGE_DIR
+
+
+# v2: la ruta completa (ancestros + hoja); la v1 solo tenía la hoja, que no está en el DOM hasta expandir
+CACHE_VERSION = 2
+
+
+class TreePathCache:
+    """
+    Nodos de los árboles de ProactivaNet (categoría, servicio) por ruta de labels.
+    Guarda el id y los atributos de cada nodo de la ruta (ancestros y hoja): los hijos se cargan al expandir,
+    así que se baja expandiendo solo esos ids, sin buscar por texto (ver web_helpers.tree_select_path).
+    Se persiste en storages/web/tree_paths.json; se comparte entre workers (lock).
+    """
+    def __init__(self, path: Path | None = None):
+        self.path = path or WEB_STORAGE_DIR / "tree_paths.json"
+        self.state = {
+            "version": CACHE_VERSION,
+            "paths": {}
+        }
+        # rutas resueltas desde el cache / recorridas por label en este proceso
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._load()
+
+    @staticmethod
+    def key(tree: str, labels: list[str]) -> str:
+        return "/".join([tree, *labels])
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # cache corrupto: se reconstruye recorriendo el árbol
+            return
+
+        if state.get("version") == CACHE_VERSION:
+            self.state = state
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            return self.state["paths"].get(key)
+
+    def set(self, key: str, node: dict):
+        with self._lock:
+            self.state["paths"][key] = {**node, "updated_at": time.time()}
+            self.save()
+
+    def count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+_default_cache: TreePathCache | None = None
+_default_lock = threading.Lock()
+
+def get_tree_path_cache() -> TreePathCache:
+    """ Instancia compartida por todos los controladores del proceso """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = TreePathCache()
+        return _default_cache
+
+def use_tree_path_cache(path: Path) -> TreePathCache:
+    """ Reemplaza la instancia compartida por una en `path` (benchmarks: fuera de storages/) """
+    global _default_cache
+    with _default_lock:
+        _default_cache = TreePathCache(path)
+        return _default_cache
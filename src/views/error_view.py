@@ -1,7 +1,6 @@
 import tkinter as tk
-from PIL import Image, ImageTk
-
 from src import config
+from src.helpers.main_helpers import load_photo
 
 class ErrorView(tk.Toplevel):
     def __init__(self, master, title, message, level="error"):
@@ -44,11 +43,7 @@ class ErrorView(tk.Toplevel):
         container.pack(fill="both", expand=True, padx=20, pady=20)
 
         img_path = self._load_img(level, icon=False)
-        img = Image.open(img_path)
-        img = img.resize((48, 48), Image.LANCZOS)
-
-
-        self.img = ImageTk.PhotoImage(img)
+        self.img = load_photo(img_path, size=(48, 48), master=self)
         tk.Label(container, image=self.img, bg="#1e1e1e").grid(row=0, column=0, padx=(0, 15), sticky="n")
             
         tk.Label(container, text=message, bg="#1e1e1e", fg="white", wraplength=360, font=("Segoe UI", 11)).grid(row=0, column=1)
@@ -3,21 +3,26 @@ import tkinter as tk
 import shutil
 from pathlib import Path
 from tkinter import messagebox, filedialog
-from PIL import Image, ImageTk
 
 from src import config
 
 from .error_view import ErrorView
 
-from src.controllers.main_controller import MainController
+from src.services.run_worker import RunWorker
+from src.helpers.main_helpers import load_photo
 from src.utils.tooltip import Tooltip
 
 
+# cada cuánto el loop de Tk vacía la cola de mensajes del worker
+POLL_MS = 100
+
+
 class MainView(tk.Frame):
     def __init__(self, master):
         super().__init__(master, bg="#E91A1D")
 
-        self.select_file = None
+        self.select_files: list[Path] = []
+        self.worker: RunWorker | None = None
 
         self._load_assets()
         self._build_header()
@@ -25,17 +30,15 @@ class MainView(tk.Frame):
         self._build_footer()
 
     def _load_assets(self):
-        self.logo_img = tk.PhotoImage(file = config.ASSETS_DIR / "main_frame/logo.png")
-        
-        excel_image = Image.open(config.ASSETS_DIR / "main_frame/excel.png")
-        excel_image = excel_image.resize((40, 40), Image.LANCZOS)
-        self.excel_img = ImageTk.PhotoImage(excel_image)
-        
-        self.input_img = tk.PhotoImage(file = config.ASSETS_DIR / "main_frame/input_file.png")
-        self.help_img = tk.PhotoImage(file = config.ASSETS_DIR / "main_frame/helper.png")
-        self.config_img = tk.PhotoImage(file = config.ASSETS_DIR / "main_frame/configuracion.png")
-        self.send_img = tk.PhotoImage(file = config.ASSETS_DIR / "main_frame/enviar.png")
-        self.clear_img = tk.PhotoImage(file = config.ASSETS_DIR / "main_frame/close.png")
+        assets = config.ASSETS_DIR / "main_frame"
+
+        self.logo_img = load_photo(assets / "logo.png")
+        self.excel_img = load_photo(assets / "excel.png", size=(40, 40))
+        self.input_img = load_photo(assets / "input_file.png")
+        self.help_img = load_photo(assets / "helper.png")
+        self.config_img = load_photo(assets / "configuracion.png")
+        self.send_img = load_photo(assets / "enviar.png")
+        self.clear_img = load_photo(assets / "close.png")
 
     def _build_header(self):
         header = tk.Frame(self, bg="#E91A1D")
@@ -76,8 +79,18 @@ class MainView(tk.Frame):
         config_btn = tk.Button(footer, image=self.config_img, bg="#E91A1D", activebackground="#E91A1D", borderwidth=0, command=self._open_config, cursor="hand2")
         config_btn.pack(side="left", padx=15)
 
-        send_btn = tk.Button(footer, image=self.send_img, bg="#E91A1D", activebackground="#E91A1D", borderwidth=0, command=self._send, cursor="hand2")
-        send_btn.pack(side="left", padx=15)
+        self.send_btn = tk.Button(footer, image=self.send_img, bg="#E91A1D", activebackground="#E91A1D", borderwidth=0, command=self._send, cursor="hand2")
+        self.send_btn.pack(side="left", padx=15)
+
+        # controles de la ejecución en curso (solo visibles mientras corre)
+        self.run_controls = tk.Frame(self, bg="#E91A1D")
+        self.pause_btn = tk.Button(self.run_controls, text="Pausar", font=("Segoe UI", 10, "bold"), width=10, command=self._toggle_pause, cursor="hand2")
+        self.pause_btn.pack(side="left", padx=5)
+        self.cancel_btn = tk.Button(self.run_controls, text="Cancelar", font=("Segoe UI", 10, "bold"), width=10, command=self._cancel, cursor="hand2")
+        self.cancel_btn.pack(side="left", padx=5)
+
+        self.status_label = tk.Label(self, text="", font=("Segoe UI", 10), fg="white", bg="#E91A1D", anchor="w")
+        self.status_label.place(x=40, y=215, width=560)
 
     def _downlaod_excel(self):
         template_path = config.DOWNLOAD_DIR / "Planilla de Actividades - Nombre Tecnico.xlsx"
@@ -113,19 +126,21 @@ class MainView(tk.Frame):
             )
 
     def _select_file(self):
-        file_path = filedialog.askopenfilename(
-            title="Seleccionar planilla de Excel",
+        # se pueden elegir varias planillas: se cargan en lote con un solo login
+        file_paths = filedialog.askopenfilenames(
+            title="Seleccionar planillas de Excel",
             filetypes=[
                 ("Archivos Excel", "*.xlsx *.xls"),
                 ("Todos los archivos", "*.*")
             ]
         )
 
-        if not file_path:
+        if not file_paths:
             return
         
-        self.select_file = Path(file_path)
-        self.file_label.config(text=self.select_file.name)
+        self.select_files = [Path(p) for p in file_paths]
+        label = self.select_files[0].name if len(self.select_files) == 1 else f"{len(self.select_files)} planillas seleccionadas"
+        self.file_label.config(text=label)
         
         if not self.file_container.winfo_ismapped():
             self.file_label.pack(side="left", fill="x", expand=True, padx=(5, 0))
@@ -133,26 +148,85 @@ class MainView(tk.Frame):
             self.file_container.place(x=55, y=180, width=480, height=24)
         
     def _clear_file(self):
-        self.select_file = None
+        self.select_files = []
         self.file_container.place_forget()
 
     def _open_config(self):
         print("hola 3")
 
     def _send(self):
-        if not self.select_file:
+        if not self.select_files:
             ErrorView(self, title="Error al enviar", message="Debe seleccionar un archivo antes de enviar")
             return
         
-        try:
-            controller = MainController(self.select_file, self._update_status)
-            controller.start()
+        if self.is_running:
+            return
 
-        except Exception as e:
-            ErrorView(self, title="Error con el excel", message=e)
+        # la carga corre en otro hilo; la UI solo lee la cola de mensajes
+        files = self.select_files[0] if len(self.select_files) == 1 else list(self.select_files)
+        self.worker = RunWorker(files)
+        self.worker.start()
+
+        self.send_btn.config(state="disabled")
+        self.pause_btn.config(text="Pausar", state="normal")
+        self.cancel_btn.config(state="normal")
+        self.run_controls.place(relx=0.5, y=250, anchor="center")
+        self._update_status("🧭 Iniciando...")
+
+        self.after(POLL_MS, self._poll_worker)
+
+    @property
+    def is_running(self) -> bool:
+        return self.worker is not None and self.worker.is_alive()
+
+    def _poll_worker(self):
+        for kind, payload in self.worker.drain():
+            if kind == "status":
+                self._update_status(payload)
+            elif kind == "error":
+                self._finish_run()
+                ErrorView(self, title="Error con el excel", message=payload)
+                return
+            elif kind == "done":
+                self._finish_run()
+                return
+
+        self.after(POLL_MS, self._poll_worker)
+
+    def _finish_run(self):
+        self.worker = None
+        self.run_controls.place_forget()
+        self.send_btn.config(state="normal")
+
+    def _toggle_pause(self):
+        control = self.worker.control
+        if control.paused:
+            control.resume()
+            self.pause_btn.config(text="Pausar")
+            self._update_status("▶️ Reanudando...")
+        else:
+            control.pause()
+            self.pause_btn.config(text="Reanudar")
+            self._update_status("⏸️ Se pausa al terminar el ticket en curso")
+
+    def _cancel(self):
+        if not self.is_running:
+            return
+
+        self.worker.control.cancel()
+        self.pause_btn.config(state="disabled")
+        self.cancel_btn.config(state="disabled")
+        self._update_status("⏹️ Cancelando al terminar el ticket en curso...")
+
+    def cancel_run(self):
+        """ Al cerrar la ventana: corta entre jobs y espera a que se guarde el Excel """
+        if self.is_running:
+            self.worker.control.cancel()
+            self.worker.join(timeout=60)
 
     def _update_status(self, message: str):
-        print(message)  # por ahora consola
+        print(message)
+        self.status_label.config(text=message)
 
 
 